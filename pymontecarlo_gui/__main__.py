@@ -8,9 +8,14 @@ import platform
 import asyncio
 import logging
 import ctypes
+import time
 
 logger = logging.getLogger(__name__)
 
+# NOTE: Recorded before any third party module is imported, see --profile-startup
+_IMPORT_START_s = time.perf_counter()
+_IMPORT_START_CPU_s = time.process_time()
+
 # Third party modules.
 from qtpy import QtCore, QtWidgets
 
@@ -20,10 +25,6 @@ if _qtapi is None or _qtapi == "pyside6":
 
 from qasync import QEventLoop
 
-import matplotlib
-
-matplotlib.use("qt5agg")
-
 # Local modules.
 import pymontecarlo
 from pymontecarlo.entity import EntityBase
@@ -32,12 +33,15 @@ from pymontecarlo.util.process import kill_process
 
 import pymontecarlo_gui
 import pymontecarlo_gui.widgets.messagebox as messagebox
-from pymontecarlo_gui.main import MainWindow
 from pymontecarlo_gui.widgets.icon import load_pixmap
 from pymontecarlo_gui.options.program.base import ProgramFieldBase
+from pymontecarlo_gui.util.profile import StartupProfiler
 
 # Globals and constants variables.
 
+_IMPORT_END_s = time.perf_counter()
+_IMPORT_END_CPU_s = time.process_time()
+
 
 def _create_parser():
     usage = "pymontecarlo"
@@ -48,10 +52,19 @@ def _create_parser():
         "-v", "--verbose", action="store_true", help="Run in debug mode"
     )
 
+    parser.add_argument(
+        "--profile-startup",
+        nargs="?",
+        const=os.path.join(get_config_dir(), "startup-profile.json"),
+        metavar="FILEPATH",
+        help="Record the duration of each start-up phase in a Chrome trace file "
+        + "(default: startup-profile.json in the configuration directory)",
+    )
+
     return parser
 
 
-def _setup(ns):
+def _setup(ns, profiler):
     # Configuration directory
     configdir = get_config_dir()
     frozen = getattr(sys, "frozen", False)
@@ -90,19 +103,21 @@ def _setup(ns):
     logger.info("qt = %s", QtCore.__version__)
 
     # Log plugins
-    for name in sorted(pymontecarlo.pymontecarlo_plugins):
-        logger.info("Found plug-in: {}".format(name))
+    with profiler.phase("_setup: plug-ins"):
+        for name in sorted(pymontecarlo.pymontecarlo_plugins):
+            logger.info("Found plug-in: {}".format(name))
 
     # Log entities
-    entities = []
-    for clasz in EntityBase._subclasses:
-        entities.append("{}.{}".format(clasz.__module__, clasz.__name__))
+    with profiler.phase("_setup: entities"):
+        entities = []
+        for clasz in EntityBase._subclasses:
+            entities.append("{}.{}".format(clasz.__module__, clasz.__name__))
 
-    for clasz in ProgramFieldBase._subclasses:
-        entities.append("{}.{}".format(clasz.__module__, clasz.__name__))
+        for clasz in ProgramFieldBase._subclasses:
+            entities.append("{}.{}".format(clasz.__module__, clasz.__name__))
 
-    for entity in sorted(entities):
-        logger.info("Registered entity: {}".format(entity))
+        for entity in sorted(entities):
+            logger.info("Registered entity: {}".format(entity))
 
     # Catch all exceptions
     def _excepthook(exc_type, exc_obj, exc_tb):
@@ -128,9 +143,27 @@ def _find_programs():
     return tuple(ProgramFieldBase._subclasses)
 
 
-def run_app():
-    app = QtWidgets.QApplication(sys.argv)
-    app.setStyle("fusion")
+class _FirstPaintFilter(QtCore.QObject):
+    def __init__(self, callback, parent=None):
+        super().__init__(parent)
+        self._callback = callback
+
+    def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.Paint:
+            obj.removeEventFilter(self)
+            # Called once the paint event was processed
+            QtCore.QTimer.singleShot(0, self._callback)
+        return False
+
+
+def run_app(profiler, profile_filepath=None):
+    # NOTE: Required since QtWebEngineWidgets is only imported once the first
+    # options or result widget is opened, after QApplication is created
+    QtCore.QCoreApplication.setAttribute(QtCore.Qt.AA_ShareOpenGLContexts)
+
+    with profiler.phase("QApplication"):
+        app = QtWidgets.QApplication(sys.argv)
+        app.setStyle("fusion")
 
     loop = QEventLoop(app)
     asyncio.set_event_loop(loop)
@@ -138,14 +171,29 @@ def run_app():
     # if sys.platform == 'win32':
     #     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
 
-    pixmap = load_pixmap("splash.svg")
-    message = "Version: {}".format(pymontecarlo_gui.__version__)
-    splash_screen = QtWidgets.QSplashScreen(pixmap)
-    splash_screen.showMessage(message, QtCore.Qt.AlignRight)
-    splash_screen.show()
-    app.processEvents()
-
-    window = MainWindow()
+    with profiler.phase("splash screen"):
+        pixmap = load_pixmap("splash.svg")
+        message = "Version: {}".format(pymontecarlo_gui.__version__)
+        splash_screen = QtWidgets.QSplashScreen(pixmap)
+        splash_screen.showMessage(message, QtCore.Qt.AlignRight)
+        splash_screen.show()
+        app.processEvents()
+
+    # NOTE: Imported after the splash screen is shown to reduce start-up time
+    with profiler.phase("import MainWindow"):
+        from pymontecarlo_gui.main import MainWindow
+
+    with profiler.phase("MainWindow.__init__"):
+        window = MainWindow(profiler=profiler)
+
+    def _on_first_paint():
+        profiler.end("first paint")
+        if profile_filepath:
+            profiler.write(profile_filepath)
+            logger.info("Start-up profile written in %s", profile_filepath)
+
+    profiler.begin("first paint")
+    window.installEventFilter(_FirstPaintFilter(_on_first_paint, window))
     window.show()
 
     splash_screen.finish(window)
@@ -158,9 +206,19 @@ def main():
     parser = _create_parser()
 
     ns = parser.parse_args()
-    _setup(ns)
 
-    run_app()
+    profiler = StartupProfiler(_IMPORT_START_s)
+    profiler.record(
+        "import",
+        _IMPORT_START_s,
+        _IMPORT_END_s,
+        _IMPORT_END_CPU_s - _IMPORT_START_CPU_s,
+    )
+
+    with profiler.phase("_setup"):
+        _setup(ns, profiler)
+
+    run_app(profiler, ns.profile_startup)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,388 @@
+"""
+Submits the simulations of a sweep file without the graphical user interface.
+
+The sweep file is a JSON file describing the materials, samples, beams,
+analyses and programs of the :class:`OptionsBuilder`, as in the new simulation
+wizard. Each sample, beam and analysis is defined by its ``type`` and
+the parameters of its builder (e.g. ``energy_keV`` for
+:meth:`PencilBeamBuilder.add_energy_keV`). A parameter can either be a single
+value or a list of values::
+
+    {
+        "materials": {"Al2O3": {"formula": "Al2O3", "density_g_per_cm3": 3.95}},
+        "samples": [{"type": "substrate", "material": ["Cu", "Al2O3"]}],
+        "beams": [{"type": "pencil", "energy_keV": [10.0, 15.0]}],
+        "analyses": [
+            {"type": "photon_intensity", "photon_detector": {"elevation_deg": 40.0}}
+        ],
+        "programs": [{"type": "Casino2Program", "number_trajectories": 1000}]
+    }
+
+Materials not defined in ``materials`` are created from their chemical formula.
+Beam positions are given as ``[x0_m, y0_m]`` and default to ``[0.0, 0.0]``.
+Programs are created from the name of their class and keyword arguments.
+"""
+
+# Standard library modules.
+import os
+import sys
+import json
+import argparse
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.entity import EntityBase
+from pymontecarlo.settings import Settings
+from pymontecarlo.project import Project
+from pymontecarlo.util.token import Token, TokenState
+from pymontecarlo.options.material import Material
+from pymontecarlo.options.program.base import ProgramBase
+from pymontecarlo.options.sample import (
+    SubstrateSampleBuilder,
+    InclusionSampleBuilder,
+    HorizontalLayerSampleBuilder,
+    VerticalLayerSampleBuilder,
+    SphereSampleBuilder,
+)
+from pymontecarlo.options.sample.base import LayerBuilder
+from pymontecarlo.options.beam import (
+    PencilBeamBuilder,
+    CylindricalBeamBuilder,
+    GaussianBeamBuilder,
+)
+from pymontecarlo.options.analysis import (
+    PhotonIntensityAnalysisBuilder,
+    KRatioAnalysisBuilder,
+)
+from pymontecarlo.options.detector import PhotonDetectorBuilder
+
+from pymontecarlo_gui.options.options import OptionsModel
+from pymontecarlo_gui.options.validation import validate_options_list
+from pymontecarlo_gui.util.runner import StreamingSimulationRunner
+
+# Globals and constants variables.
+
+SAMPLE_BUILDERS = {
+    "substrate": SubstrateSampleBuilder,
+    "inclusion": InclusionSampleBuilder,
+    "horizontal_layers": HorizontalLayerSampleBuilder,
+    "vertical_layers": VerticalLayerSampleBuilder,
+    "sphere": SphereSampleBuilder,
+}
+
+BEAM_BUILDERS = {
+    "pencil": PencilBeamBuilder,
+    "cylindrical": CylindricalBeamBuilder,
+    "gaussian": GaussianBeamBuilder,
+}
+
+ANALYSIS_BUILDERS = {
+    "photon_intensity": PhotonIntensityAnalysisBuilder,
+    "kratio": KRatioAnalysisBuilder,
+}
+
+PROGRESS_INTERVAL_s = 1.0
+
+
+def _as_list(value):
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+def _parse_material(spec):
+    if isinstance(spec, str):
+        return Material.from_formula(spec)
+
+    spec = dict(spec)
+    formula = spec.pop("formula")
+
+    density_kg_per_m3 = spec.pop("density_kg_per_m3", None)
+    if "density_g_per_cm3" in spec:
+        density_kg_per_m3 = spec.pop("density_g_per_cm3") * 1e3
+
+    material = Material.from_formula(formula, density_kg_per_m3)
+
+    if "name" in spec:
+        material.name = spec.pop("name")
+
+    if spec:
+        raise ValueError("Unknown material parameter(s): {}".format(", ".join(spec)))
+
+    return material
+
+
+def _parse_materials(spec):
+    materials = {}
+
+    for name, material_spec in spec.items():
+        material = _parse_material(material_spec)
+        if isinstance(material_spec, dict) and "name" not in material_spec:
+            material.name = name
+        materials[name] = material
+
+    return materials
+
+
+def _parse_arguments(key, value, materials):
+    if key.endswith("material"):
+        if value not in materials:
+            materials[value] = _parse_material(value)
+        return [(materials[value],)]
+
+    if key == "photon_detector":
+        builder = _populate_builder(PhotonDetectorBuilder(), value, materials)
+        return [(detector,) for detector in builder.build()]
+
+    if key == "position":
+        return [tuple(value)]
+
+    return [(value,)]
+
+
+def _populate_builder(builder, spec, materials):
+    for key, value in spec.items():
+        if key == "type":
+            continue
+
+        if key == "layers":
+            for layer_spec in value:
+                layer_builder = _populate_builder(LayerBuilder(), layer_spec, materials)
+                builder.add_layer_builder(layer_builder)
+            continue
+
+        method = getattr(builder, "add_" + key, None)
+        if method is None:
+            raise ValueError(
+                "Unknown parameter {!r} for {}".format(key, builder.__class__.__name__)
+            )
+
+        # NOTE: A single position is a list of two coordinates
+        if key == "position" and not isinstance(value[0], list):
+            value = [value]
+
+        for item in _as_list(value):
+            for args in _parse_arguments(key, item, materials):
+                method(*args)
+
+    return builder
+
+
+def _build(spec, builder_classes, materials):
+    typename = spec.get("type")
+    if typename not in builder_classes:
+        raise ValueError(
+            "Unknown type {!r}, expected one of {}".format(
+                typename, ", ".join(builder_classes)
+            )
+        )
+
+    builder = _populate_builder(builder_classes[typename](), spec, materials)
+
+    # Beam centered on the sample by default, as in the beam fields
+    if isinstance(builder, PencilBeamBuilder) and not builder.positions:
+        builder.add_position(0.0, 0.0)
+
+    return builder.build()
+
+
+def _find_program_class(typename):
+    for clasz in EntityBase._subclasses:
+        if issubclass(clasz, ProgramBase) and clasz.__name__ == typename:
+            return clasz
+
+    raise ValueError("Unknown program {!r}, is the plug-in installed?".format(typename))
+
+
+def _build_programs(spec):
+    kwargs = dict(spec)
+    clasz = _find_program_class(kwargs.pop("type", None))
+    return [clasz(**kwargs)]
+
+
+def load_sweep(sweep, settings):
+    """
+    Returns a :class:`OptionsModel` from a sweep, either the path to a JSON
+    file or its already parsed content.
+    """
+    if not isinstance(sweep, dict):
+        with open(sweep, "r") as fp:
+            sweep = json.load(fp)
+
+    materials = _parse_materials(sweep.get("materials", {}))
+
+    samples = []
+    for spec in sweep.get("samples", []):
+        samples.extend(_build(spec, SAMPLE_BUILDERS, materials))
+
+    beams = []
+    for spec in sweep.get("beams", []):
+        beams.extend(_build(spec, BEAM_BUILDERS, materials))
+
+    analyses = []
+    for spec in sweep.get("analyses", []):
+        analyses.extend(_build(spec, ANALYSIS_BUILDERS, materials))
+
+    programs = []
+    for spec in sweep.get("programs", []):
+        programs.extend(_build_programs(spec))
+
+    model = OptionsModel(settings)
+    model.setSamples(samples)
+    model.setBeams(beams)
+    model.setAnalyses(analyses)
+    model.setPrograms(programs)
+
+    return model
+
+
+def _print(*args, stream=None):
+    print(*args, file=stream or sys.stdout, flush=True)
+
+
+def _print_errors(erraccs, stream=None):
+    has_errors = False
+
+    for program_name, erracc in erraccs.items():
+        for warning in sorted(set(str(warning) for warning in erracc.warnings)):
+            _print("{}: warning: {}".format(program_name, warning), stream=stream)
+
+        for exception in sorted(set(str(exception) for exception in erracc.exceptions)):
+            _print("{}: error: {}".format(program_name, exception), stream=stream)
+            has_errors = True
+
+    return has_errors
+
+
+async def _print_progress(token, stream=None):
+    last_line = None
+
+    while True:
+        subtokens = token.get_subtokens(category="simulation")
+        done_count = sum(subtoken.state == TokenState.DONE for subtoken in subtokens)
+        line = "[{}/{}] {:.0%} {}".format(
+            done_count, len(subtokens), token.progress, token.status
+        )
+
+        if line != last_line:
+            _print(line, stream=stream)
+            last_line = line
+
+        await asyncio.sleep(PROGRESS_INTERVAL_s)
+
+
+async def run_batch(
+    model, filepath, max_workers=1, dry_run=False, max_errors=None, stream=None
+):
+    """
+    Validates the options of the *model* and, unless *dry_run*, runs
+    the simulations and saves the project in *filepath*.
+    The validation stops after *max_errors* errors, if specified.
+    Returns the exit code.
+    """
+    options_count = model.optionsCount()
+    _print("Validating {} simulation(s)".format(options_count), stream=stream)
+
+    erraccs = await validate_options_list(model.iterOptions(), max_errors=max_errors)
+
+    if _print_errors(erraccs, stream):
+        return 1
+
+    if dry_run:
+        return 0
+
+    if os.path.exists(filepath):
+        project = Project.read(filepath)
+    else:
+        project = Project()
+    project.filepath = filepath
+
+    token = Token("batch")
+    runner = StreamingSimulationRunner(project, token, max_workers)
+
+    async with runner:
+        task = asyncio.ensure_future(_print_progress(token, stream))
+
+        count = await runner.submit_iter(model.iterOptions(), model.sweepOptions())
+        _print("Submitted {} simulation(s)".format(count), stream=stream)
+
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    project.write(filepath)
+    _print("Project saved in {}".format(filepath), stream=stream)
+
+    subtokens = token.get_subtokens(category="simulation")
+    error_count = sum(subtoken.state == TokenState.ERROR for subtoken in subtokens)
+    if error_count:
+        _print("{} simulation(s) failed".format(error_count), stream=stream)
+        return 1
+
+    return 0
+
+
+def _create_parser():
+    usage = "pymontecarlo-batch [options] SWEEPFILE PROJECTFILE"
+    description = "Run simulations defined in a sweep file without graphical interface."
+    parser = argparse.ArgumentParser(usage=usage, description=description)
+
+    parser.add_argument("sweepfile", help="Path to JSON sweep file")
+
+    parser.add_argument(
+        "projectfile",
+        help="Path to project file where the simulations are saved "
+        + "(appended if the project already exists)",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--max-workers",
+        type=int,
+        default=1,
+        help="Number of simulations running in parallel",
+    )
+
+    parser.add_argument(
+        "-n",
+        "--dry-run",
+        action="store_true",
+        help="Only validate the simulations",
+    )
+
+    parser.add_argument(
+        "--max-errors",
+        type=int,
+        help="Stop the validation after this number of errors",
+    )
+
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="Run in debug mode"
+    )
+
+    return parser
+
+
+def main(argv=None):
+    parser = _create_parser()
+
+    ns = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if ns.verbose else logging.WARNING)
+
+    try:
+        model = load_sweep(ns.sweepfile, Settings.read())
+    except (OSError, ValueError, TypeError) as ex:
+        parser.error("Invalid sweep file: {}".format(ex))
+
+    return asyncio.run(
+        run_batch(model, ns.projectfile, ns.max_workers, ns.dry_run, ns.max_errors)
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
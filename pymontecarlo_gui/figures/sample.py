@@ -1,23 +1,132 @@
 """"""
 
 # Standard library modules.
+import functools
+import collections
 
 # Third party modules.
-from qtpy import QtCore, QtWidgets
+from qtpy import QtCore, QtGui, QtWidgets
 
 import matplotlib
 
 matplotlib.use("qt5agg")
 from matplotlib.figure import Figure
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 
 from matplotlib_scalebar.scalebar import ScaleBar
 
 # Local modules.
 from pymontecarlo.figures.sample import SampleFigure, Perspective
 
+from pymontecarlo_gui.widgets.dialog import ExecutionThread
+from pymontecarlo_gui.util.fingerprint import fingerprint
+
 # Globals and constants variables.
 
+DRAW_DELAY_ms = 150
+DPI = 100
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def render_sample_figure(sample_figure, width_px, height_px, dpi=DPI):
+    """
+    Draws the sample figure in an offscreen buffer and returns it as
+    a :class:`QImage`.
+    Since neither Qt widgets nor pyplot are used, it can be called from
+    any thread.
+    """
+    figure = Figure((width_px / dpi, height_px / dpi), dpi=dpi)
+    canvas = FigureCanvasAgg(figure)
+
+    ax = figure.add_axes([0.0, 0.0, 1.0, 1.0])
+    ax.xaxis.set_visible(False)
+    ax.yaxis.set_visible(False)
+
+    sample_figure.draw(ax)
+
+    scalebar = ScaleBar(1.0, location="lower left")
+    ax.add_artist(scalebar)
+
+    canvas.draw()
+
+    width, height = canvas.get_width_height()
+    buffer = bytes(canvas.buffer_rgba())
+    image = QtGui.QImage(buffer, width, height, QtGui.QImage.Format_RGBA8888)
+    return image.copy()  # Detach from the buffer
+
+
+class SampleFigureCache:
+    """
+    Least recently used cache of drawn sample figures, by their sample, beams,
+    trajectories, perspective and size in pixels.
+    The least recently used figures are removed once the pixmaps take more
+    than *max_bytes*.
+
+    Options cannot be hashed, so figures are looked up by a fingerprint of
+    their attributes, and only the figure found is compared by equality.
+    """
+
+    def __init__(self, max_bytes=MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = collections.OrderedDict()
+        self._size_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _key(self, sample_figure, width_px, height_px):
+        return (
+            fingerprint(sample_figure.sample),
+            fingerprint(sample_figure.beams),
+            fingerprint(sample_figure.trajectories),
+            sample_figure.perspective,
+            width_px,
+            height_px,
+        )
+
+    def get(self, sample_figure, width_px, height_px):
+        """
+        Returns the pixmap of the figure or ``None`` if not cached.
+        """
+        key = self._key(sample_figure, width_px, height_px)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        other, pixmap = entry
+        if (
+            other.sample != sample_figure.sample
+            or other.beams != sample_figure.beams
+            or other.trajectories != sample_figure.trajectories
+        ):
+            return None
+
+        self._entries.move_to_end(key)
+        return pixmap
+
+    def add(self, sample_figure, width_px, height_px, pixmap):
+        """
+        Adds the pixmap of a figure. The *sample_figure* must not be modified
+        afterwards.
+        """
+        key = self._key(sample_figure, width_px, height_px)
+        if key in self._entries:
+            self._size_bytes -= self._pixmap_bytes(self._entries.pop(key)[1])
+
+        self._entries[key] = (sample_figure, pixmap)
+        self._size_bytes += self._pixmap_bytes(pixmap)
+
+        while self._size_bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, removed) = self._entries.popitem(last=False)
+            self._size_bytes -= self._pixmap_bytes(removed)
+
+    def _pixmap_bytes(self, pixmap):
+        return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+    def clear(self):
+        self._entries.clear()
+        self._size_bytes = 0
+
 
 class PerspectiveToolbar(QtWidgets.QToolBar):
 
@@ -51,32 +160,59 @@ class PerspectiveToolbar(QtWidgets.QToolBar):
 
 
 class SampleFigureWidget(QtWidgets.QWidget):
+    """
+    Shows a sample figure.
+
+    Drawing is delayed by :data:`DRAW_DELAY_ms`, so that successive changes
+    are drawn once, and done in a thread. The previous figure remains shown
+    until the new one is drawn. A hidden widget is only drawn when shown.
+    Drawn figures are kept in a cache shared by all widgets, so that
+    a figure shown before is shown again without drawing. The cache is
+    looked up once the changes are done, not at each change.
+    """
+
+    drawn = QtCore.Signal()
+
+    cache = SampleFigureCache()
+
+    # NOTE: Threads are kept until they finish, even if the widget is deleted
+    _threads = set()
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
         # Variables
-        figure = Figure((6, 6))
-
-        self.ax = figure.add_axes([0.0, 0.0, 1.0, 1.0])
-        self.ax.xaxis.set_visible(False)
-        self.ax.yaxis.set_visible(False)
-
         self.sample_figure = SampleFigure()
+        self._thread = None
+        self._dirty = False
+        self._generation = 0  # Incremented at each change of the figure
+
+        # Timers
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(DRAW_DELAY_ms)
 
         # Widgets
-        self.canvas = FigureCanvas(figure)
+        self.lbl_figure = QtWidgets.QLabel()
+        self.lbl_figure.setAlignment(QtCore.Qt.AlignCenter)
+        self.lbl_figure.setMinimumSize(100, 100)
+        self.lbl_figure.setSizePolicy(
+            QtWidgets.QSizePolicy.Ignored, QtWidgets.QSizePolicy.Ignored
+        )
+        self.lbl_figure.setStyleSheet("background-color: white")
 
         self.toolbar = PerspectiveToolbar()
 
         # Layouts
         layout = QtWidgets.QVBoxLayout()
         layout.setContentsMargins(0, 0, 0, 0)
-        layout.addWidget(self.canvas)
+        layout.addWidget(self.lbl_figure, 1)
         layout.addWidget(self.toolbar, 0, QtCore.Qt.AlignRight)
         self.setLayout(layout)
 
         # Signals
         self.toolbar.perspectiveChanged.connect(self._on_perspective_changed)
+        self.timer.timeout.connect(self._on_timer_timeout)
 
         # Defaults
         self.setPerspective(Perspective.XZ)
@@ -85,15 +221,105 @@ class SampleFigureWidget(QtWidgets.QWidget):
         self.sample_figure.perspective = self.toolbar.perspective()
         self.draw()
 
-    def draw(self):
-        self.ax.clear()
+    def _snapshot(self):
+        # NOTE: Copy, since the figure may change while drawing
+        sample_figure = SampleFigure(
+            self.sample_figure.sample,
+            list(self.sample_figure.beams),
+            list(self.sample_figure.trajectories),
+        )
+        sample_figure.perspective = self.sample_figure.perspective
+
+        ratio = self.devicePixelRatioF()
+        width_px = max(int(self.lbl_figure.width() * ratio), 1)
+        height_px = max(int(self.lbl_figure.height() * ratio), 1)
+
+        return sample_figure, width_px, height_px
+
+    def _show_pixmap(self, pixmap):
+        self.lbl_figure.setPixmap(pixmap)
+        self.drawn.emit()
+
+    def _show_cached(self):
+        pixmap = self.cache.get(*self._snapshot())
+        if pixmap is None:
+            return False
+
+        self.timer.stop()
+        self._dirty = False
+        self._show_pixmap(pixmap)
+        return True
+
+    def _on_timer_timeout(self):
+        # Only one drawing at a time, the latest changes are drawn afterwards
+        if self._thread is not None or not self._dirty:
+            return
+        self._dirty = False
+
+        if self._show_cached():
+            return
+
+        sample_figure, width_px, height_px = self._snapshot()
+        ratio = self.devicePixelRatioF()
+
+        function = functools.partial(
+            render_sample_figure, sample_figure, width_px, height_px, DPI * ratio
+        )
+        thread = ExecutionThread(function)
+        thread.snapshot = (sample_figure, width_px, height_px)
+        thread.generation = self._generation
+        thread.finished.connect(self._on_thread_finished)
+        thread.finished.connect(functools.partial(self._threads.discard, thread))
+        thread.finished.connect(thread.deleteLater)
+        self._threads.add(thread)
+
+        self._thread = thread
+        thread.start()
+
+    def _on_thread_finished(self):
+        thread = self._thread
+        self._thread = None
+
+        if thread.result is not None:
+            pixmap = QtGui.QPixmap.fromImage(thread.result)
+            pixmap.setDevicePixelRatio(self.devicePixelRatioF())
+            self.cache.add(*thread.snapshot, pixmap)
+
+            # Not shown if the figure changed while drawing
+            if thread.generation == self._generation:
+                if self.isVisible():
+                    self._show_pixmap(pixmap)
+                else:
+                    self._dirty = True  # Shown from the cache once visible
+
+        if self._dirty and self.isVisible():
+            self._on_timer_timeout()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._dirty and not self._show_cached():
+            self.timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.timer.stop()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.draw()
 
-        self.sample_figure.draw(self.ax)
+    def draw(self):
+        """
+        Draws the figure after a delay. Successive calls are drawn once.
+        """
+        self._generation += 1
+        self._dirty = True
 
-        scalebar = ScaleBar(1.0, location="lower left")
-        self.ax.add_artist(scalebar)
+        if self.isVisible():
+            self.timer.start()
 
-        self.canvas.draw()
+    def isDrawing(self):
+        return self.timer.isActive() or self._thread is not None
 
     def clear(self):
         self.sample_figure.sample = None
@@ -114,6 +340,7 @@ class SampleFigureWidget(QtWidgets.QWidget):
 
     def setPerspective(self, perspective):
         self.toolbar.setPerspective(perspective)
+        self.sample_figure.perspective = perspective
         self.draw()
 
 
@@ -2,6 +2,7 @@
 
 # Standard library modules.
 import sys
+import threading
 import math
 
 # Third party modules.
@@ -15,6 +16,7 @@ from matplotlib.backends.backend_qt5agg import (
 )
 
 from qtpy.QtCore import Qt
+from qtpy.QtGui import QPixmap
 from qtpy.QtWidgets import (
     QDialog,
     QApplication,
@@ -43,6 +45,13 @@ from pymontecarlo.options.sample import (
 from pymontecarlo.options.sample.base import Layer
 from pymontecarlo.figures.sample import SampleFigure, Perspective
 
+import pymontecarlo_gui.figures.sample as sample_module
+from pymontecarlo_gui.figures.sample import (
+    SampleFigureWidget,
+    SampleFigureCache,
+    render_sample_figure,
+)
+
 # Globals and constants variables.
 DS = Material("Ds", {110: 1.0}, 1.0)
 RG = Material("Rg", {111: 1.0}, 1.0)
@@ -199,6 +208,127 @@ class QtPlt(QDialog):
         self._canvas.draw_idle()
 
 
+def test_render_sample_figure(qtbot):
+    sample = HorizontalLayerSample(DS, [Layer(RE, 10e-9)])
+    sample_figure = SampleFigure(sample, [GaussianBeam(15e3, 5e-9)])
+
+    image = render_sample_figure(sample_figure, 300, 200)
+
+    assert image.width() == 300
+    assert image.height() == 200
+
+
+def test_sample_figure_widget(qtbot):
+    widget = SampleFigureWidget()
+    qtbot.addWidget(widget)
+    widget.show()
+    qtbot.waitUntil(lambda: not widget.isDrawing())
+
+    drawn = []
+    widget.drawn.connect(lambda: drawn.append(True))
+
+    with qtbot.waitSignal(widget.drawn):
+        widget.setSample(SubstrateSample(DS))
+        widget.addBeam(GaussianBeam(15e3, 5e-9))
+        widget.addBeam(GaussianBeam(20e3, 5e-9))
+
+    qtbot.waitUntil(lambda: not widget.isDrawing())
+    assert len(drawn) == 1
+    assert not widget.lbl_figure.pixmap().isNull()
+
+
+def test_sample_figure_cache(qtbot):
+    cache = SampleFigureCache(max_bytes=2 * 10 * 10 * 4)
+    pixmap = QPixmap(10, 10)
+
+    sample_figure1 = SampleFigure(SubstrateSample(DS))
+    sample_figure2 = SampleFigure(SubstrateSample(AU))
+    sample_figure3 = SampleFigure(SubstrateSample(DS), [GaussianBeam(15e3, 5e-9)])
+
+    cache.add(sample_figure1, 10, 10, pixmap)
+    cache.add(sample_figure2, 10, 10, pixmap)
+    assert cache.get(SampleFigure(SubstrateSample(DS)), 10, 10) is pixmap
+    assert cache.get(sample_figure1, 20, 10) is None
+
+    # Least recently used removed
+    cache.add(sample_figure3, 10, 10, pixmap)
+    assert len(cache) == 2
+    assert cache.get(sample_figure1, 10, 10) is pixmap
+    assert cache.get(sample_figure2, 10, 10) is None
+
+
+def test_sample_figure_widget_cached(qtbot, monkeypatch):
+    widget = SampleFigureWidget()
+    qtbot.addWidget(widget)
+    widget.show()
+    widget.setSample(SubstrateSample(RG))
+    qtbot.waitUntil(lambda: not widget.isDrawing())
+
+    widget.setPerspective(Perspective.XY)
+    qtbot.waitUntil(lambda: not widget.isDrawing())
+
+    def render_sample_figure(*args):
+        raise AssertionError
+
+    monkeypatch.setattr(sample_module, "render_sample_figure", render_sample_figure)
+
+    # Previous figure kept while changing, then shown from the cache
+    with qtbot.assertNotEmitted(widget.drawn, wait=0):
+        widget.clear()
+        widget.setSample(SubstrateSample(RG))
+        widget.setPerspective(Perspective.XZ)
+
+    with qtbot.waitSignal(widget.drawn):
+        pass
+    assert widget._thread is None
+    assert not widget.isDrawing()
+
+
+def test_sample_figure_widget_hidden(qtbot, monkeypatch):
+    widget = SampleFigureWidget()
+    qtbot.addWidget(widget)
+    widget.show()
+    qtbot.waitUntil(lambda: not widget.isDrawing())
+
+    release = threading.Event()
+    render = sample_module.render_sample_figure
+
+    def render_sample_figure(*args):
+        release.wait(10)
+        return render(*args)
+
+    monkeypatch.setattr(sample_module, "render_sample_figure", render_sample_figure)
+
+    widget.setSample(HorizontalLayerSample(AU, [Layer(DS, 7e-9)]))
+    qtbot.waitUntil(lambda: widget._thread is not None)
+
+    # Hidden without waiting for the drawing, which is then not shown
+    with qtbot.assertNotEmitted(widget.drawn):
+        widget.hide()
+        assert widget.isDrawing()
+        release.set()
+        qtbot.waitUntil(lambda: not widget.isDrawing())
+
+    with qtbot.waitSignal(widget.drawn):
+        widget.show()
+    assert not widget.isDrawing()
+
+
+def test_sample_figure_cache_fingerprint(qtbot):
+    cache = SampleFigureCache()
+    pixmap = QPixmap(10, 10)
+
+    sample = HorizontalLayerSample(DS, [Layer(RE, 10e-9)])
+    cache.add(SampleFigure(sample, [GaussianBeam(15e3, 5e-9)]), 10, 10, pixmap)
+
+    sample = HorizontalLayerSample(DS, [Layer(RE, 10e-9)])
+    sample_figure = SampleFigure(sample, [GaussianBeam(15e3, 5e-9)])
+    assert cache.get(sample_figure, 10, 10) is pixmap
+
+    sample.layers[0].thickness_m = 20e-9
+    assert cache.get(sample_figure, 10, 10) is None
+
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
 
@@ -5,7 +5,9 @@ import os
 import functools
 import multiprocessing
 import asyncio
+import collections
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -15,8 +17,8 @@ from qasync import asyncClose, asyncSlot
 
 # Local modules.
 from pymontecarlo.settings import Settings
+from pymontecarlo.util.path import get_config_dir
 from pymontecarlo.project import Project
-from pymontecarlo.runner.local import LocalSimulationRunner
 from pymontecarlo.util.token import TokenState
 from pymontecarlo.results.photonintensity import PhotonIntensityResultBase
 from pymontecarlo.results.kratio import KRatioResult
@@ -33,31 +35,76 @@ from pymontecarlo_gui.results.base import ResultFieldBase
 from pymontecarlo_gui.results.photonintensity import PhotonIntensityResultField
 from pymontecarlo_gui.results.kratio import KRatioResultField
 from pymontecarlo_gui.widgets.field import FieldTree, FieldMdiArea, ExceptionField
-from pymontecarlo_gui.widgets.token import TokenTableWidget
+from pymontecarlo_gui.widgets.token import (
+    TokenTableWidget,
+    TokenNotifier,
+    NotifyingToken,
+)
 from pymontecarlo_gui.widgets.icon import load_icon, load_pixmap
-from pymontecarlo_gui.widgets.dialog import ExecutionProgressDialog
-from pymontecarlo_gui.newsimulation import NewSimulationWizard
+from pymontecarlo_gui.widgets.dialog import (
+    ExecutionProgressDialog,
+    StepProgressDialog,
+)
+import pymontecarlo_gui.widgets.messagebox as messagebox
 from pymontecarlo_gui.settings import SettingsDialog
+from pymontecarlo_gui.util.profile import StartupProfiler
+from pymontecarlo_gui.util.reader import ProjectReader
+from pymontecarlo_gui.util.writer import write_project
+from pymontecarlo_gui.util.checkpoint import (
+    Checkpointer,
+    find_checkpoint,
+    remove_checkpoint,
+)
+from pymontecarlo_gui.util.runner import StreamingSimulationRunner
+from pymontecarlo_gui.util.runtime import RuntimeHistory, HISTORY_FILENAME
 
 # Globals and constants variables.
 
+READ_BUDGET_s = 0.05
+
 
 class MainWindow(QtWidgets.QMainWindow):
 
-    newSimulations = QtCore.Signal(list)
+    newSimulations = QtCore.Signal(object, object)
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, profiler=None):
         super().__init__(parent)
         self.setWindowTitle("pyMonteCarlo")
         self.setWindowIcon(load_pixmap("logo_32x32.png"))
 
+        if profiler is None:
+            profiler = StartupProfiler()
+
         # Variables
         self._should_save = False
+        self._pending_simulations = []
+        self._simulation_fields = {}  # Simulation identifier to field
+        self._project_reader = None
+        self._dirty_simulations = set()  # Identifiers of simulations to save
+        self._pending_results = collections.deque()
+
+        with profiler.phase("Settings.read"):
+            self._settings = Settings.read()
+
+        self.token_notifier = TokenNotifier(self)
+
+        # NOTE: Unsaved simulations are regularly written in a checkpoint file,
+        # restored at the next start if pyMonteCarlo was not closed properly
+        self.checkpointer = Checkpointer(get_config_dir(), parent=self)
+        checkpoint = find_checkpoint(get_config_dir())
+
+        # NOTE: Durations of the simulations, to estimate the runtime of
+        # new simulations
+        self.runtime_history = RuntimeHistory.read(
+            os.path.join(get_config_dir(), HISTORY_FILENAME)
+        )
 
-        self._settings = Settings.read()
-
-        max_workers = multiprocessing.cpu_count() - 1
-        self._runner = LocalSimulationRunner(max_workers=max_workers)
+        with profiler.phase("StreamingSimulationRunner"):
+            self._max_workers = multiprocessing.cpu_count() - 1
+            token = NotifyingToken("simulation runner", self.token_notifier)
+            self._runner = StreamingSimulationRunner(
+                token=token, max_workers=self._max_workers
+            )
 
         # Actions
         self.action_new_project = QtWidgets.QAction("New project")
@@ -101,11 +148,6 @@ class MainWindow(QtWidgets.QMainWindow):
         self.action_stop_simulations.triggered.connect(self._on_stop)
         self.action_stop_simulations.setEnabled(False)
 
-        # Timers
-        self.timer_runner = QtCore.QTimer()
-        self.timer_runner.setInterval(1000)
-        self.timer_runner.setSingleShot(False)
-
         # Menus
         menu = self.menuBar()
         menu_file = menu.addMenu("File")
@@ -185,24 +227,44 @@ class MainWindow(QtWidgets.QMainWindow):
         self.setCentralWidget(self.mdiarea)
 
         # Dialogs
-        self.wizard_simulation = NewSimulationWizard(self._settings)
+        self.wizard_simulation = None  # Created on first use, see wizardSimulation()
 
         self.dialog_settings = SettingsDialog()
 
+        # Timers
+        # NOTE: Simulations added within one event loop iteration are
+        # inserted together in the tree, see addSimulations()
+        self.timer_simulations = QtCore.QTimer(self)
+        self.timer_simulations.setSingleShot(True)
+        self.timer_simulations.setInterval(0)
+
+        # NOTE: Results of an opened project are read in the background,
+        # see _read_pending_results()
+        self.timer_results = QtCore.QTimer(self)
+        self.timer_results.setInterval(0)
+
         # Signals
+        self.timer_simulations.timeout.connect(self._on_timer_simulations)
+        self.timer_results.timeout.connect(self._on_timer_results)
+
         self.tree.doubleClicked.connect(self._on_tree_double_clicked)
 
         self.mdiarea.windowOpened.connect(self._on_mdiarea_window_opened)
         self.mdiarea.windowClosed.connect(self._on_mdiarea_window_closed)
 
-        self.timer_runner.timeout.connect(self._on_timer_runner_timeout)
+        self.token_notifier.changed.connect(self._on_runner_changed)
+        self.token_notifier.simulationDone.connect(self._on_simulation_done)
 
         self.newSimulations.connect(self._on_new_simulations)
 
         # Start
         logger.debug("Before new project action")
         self.action_new_project.trigger()  # Required to setup project
-        self.timer_runner.start()
+
+        if checkpoint is not None:
+            QtCore.QTimer.singleShot(
+                0, functools.partial(self._on_checkpoint_found, *checkpoint)
+            )
 
     def _on_tree_double_clicked(self, field):
         if field.widget().children():
@@ -222,18 +284,16 @@ class MainWindow(QtWidgets.QMainWindow):
         font.setUnderline(False)
         self.tree.setFieldFont(field, font)
 
-    def _on_timer_runner_timeout(self):
-        token = self._runner.token
-        subtokens = token.get_subtokens(category="simulation")
+    def _on_runner_changed(self):
+        notifier = self._runner.token.notifier
 
-        progress = int(token.progress * 100)
+        progress = int(notifier.progress() * 100)
         self.statusbar_progressbar.setValue(progress)
 
-        status = token.status
-        timeout = self.timer_runner.interval()
-        self.statusBar().showMessage(status, timeout)
+        status = notifier.latestStatus()
+        self.statusBar().showMessage(status)
 
-        submitted_count = len(subtokens)
+        submitted_count = notifier.submittedCount()
         if submitted_count == 0:
             text = "No simulation submitted"
         elif submitted_count == 1:
@@ -242,7 +302,7 @@ class MainWindow(QtWidgets.QMainWindow):
             text = "{} simulations submitted".format(submitted_count)
         self.statusbar_submitted.setText(text)
 
-        done_count = sum(subtoken.state == TokenState.DONE for subtoken in subtokens)
+        done_count = notifier.doneCount()
         if done_count == 0:
             text = "No simulation done"
         elif done_count == 1:
@@ -251,7 +311,7 @@ class MainWindow(QtWidgets.QMainWindow):
             text = "{} simulations done".format(done_count)
         self.statusbar_done.setText(text)
 
-        is_running = token.state == TokenState.RUNNING
+        is_running = notifier.isRunning()
         self.action_new_project.setEnabled(not is_running)
         self.action_open_project.setEnabled(not is_running)
         self.action_stop_simulations.setEnabled(is_running)
@@ -266,17 +326,18 @@ class MainWindow(QtWidgets.QMainWindow):
             QtWidgets.QMessageBox.critical(self, title, message)
             return
 
-        self.wizard_simulation.restart()
-        if not self.wizard_simulation.exec_():
+        wizard = self.wizardSimulation()
+        wizard.restart()
+        if not wizard.exec_():
             return
 
-        list_options = self.wizard_simulation.optionsList()
-        logger.debug("Wizard defined {} simulation(s)".format(len(list_options)))
+        logger.debug("Wizard defined {} simulation(s)".format(wizard.optionsCount()))
 
-        self.newSimulations.emit(list_options)
+        # NOTE: Options are built as they are submitted
+        self.newSimulations.emit(wizard.iterOptions(), wizard.sweepOptions())
 
     @asyncSlot()
-    async def _on_new_simulations(self, list_options):
+    async def _on_new_simulations(self, iterable_options, sweep_options):
         # # Check save project
         # if self.project().filepath is None:
         #     caption = 'Save project'
@@ -291,11 +352,13 @@ class MainWindow(QtWidgets.QMainWindow):
         await self._runner.start()
 
         # Submit simulation(s)
-        await self._runner.submit(*list_options)
-        logger.debug("Submitted simulation(s)")
-
+        # NOTE: Results are required to skip simulations already in the project
+        self._read_pending_results()
         self.dock_runner.raise_()
 
+        count = await self._runner.submit_iter(iterable_options, sweep_options)
+        logger.debug("Submitted {} simulation(s)".format(count))
+
     @asyncSlot()
     async def _on_stop(self):
         await self._runner.cancel()
@@ -338,9 +401,16 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.settings().write()
 
+        try:
+            self.runtime_history.write()
+        except OSError:
+            logger.exception("Could not write runtime history")
+
         await self._runner.cancel()
         await self._runner.shutdown()
 
+        self.checkpointer.wait()
+
         event.accept()
 
     def project(self):
@@ -348,27 +418,33 @@ class MainWindow(QtWidgets.QMainWindow):
 
     async def setProject(self, project):
         if self._runner.project is not None:
-            self._runner.project.simulation_added.disconnect(self.addSimulation)
+            self._runner.project.simulation_added.disconnect(self._on_simulation_added)
             self._runner.project.simulation_recalculated.disconnect(
                 self._on_simulation_recalculated
             )
 
         await self._runner.set_project(project)
 
-        project.simulation_added.connect(self.addSimulation)
+        project.simulation_added.connect(self._on_simulation_added)
         project.simulation_recalculated.connect(self._on_simulation_recalculated)
 
         if project.filepath:
             self.settings().opendir = os.path.dirname(project.filepath)
 
+        self.timer_simulations.stop()
+        self._pending_simulations.clear()
+        self._close_project_reader()
+        self._dirty_simulations.clear()
+        self.checkpointer.setProject(project)
+
         self.mdiarea.clear()
         self.tree.clear()
+        self._simulation_fields.clear()
 
         field_project = ProjectField(self.settings(), project)
         self.tree.addField(field_project)
 
-        for index, simulation in enumerate(project.simulations, 1):
-            self.addSimulation(simulation, index)
+        self.addSimulations(project.simulations)
 
         self.tree.expandField(field_project)
 
@@ -405,25 +481,108 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.settings().opendir = os.path.dirname(filepath)
 
-        function = functools.partial(Project.read, filepath)
-        dialog = ExecutionProgressDialog(
-            "Open project", "Opening project...", "Opening project...", function
-        )
-        dialog.exec_()
-
-        if dialog.result() != QtWidgets.QDialog.Accepted:
-            return False
-
-        project = dialog.functionResult()
-        if project is None:
+        try:
+            reader = ProjectReader(filepath)
+        except Exception as ex:
+            messagebox.exception(self, ex)
             return False
 
-        asyncio.ensure_future(self.setProject(project))
+        asyncio.ensure_future(self._read_project(reader))
 
         self.dock_project.raise_()
         return True
 
+    async def _read_project(self, reader):
+        project = reader.project
+        await self.setProject(project)
+
+        dialog = StepProgressDialog(
+            "Open project", "Opening project...", len(reader), self
+        )
+        dialog.open()
+
+        # Simulations are shown as soon as their options are read
+        try:
+            start_s = time.perf_counter()
+            for index, simulation in enumerate(reader.iter_simulations()):
+                with project.lock:
+                    project.simulations.append(simulation)
+                self._queue_simulation(simulation)
+
+                if time.perf_counter() - start_s > READ_BUDGET_s:
+                    dialog.setValue(index)
+                    await asyncio.sleep(0)
+                    start_s = time.perf_counter()
+
+                if dialog.wasCanceled():
+                    reader.close()
+                    await self.setProject(Project())
+                    return
+
+        except Exception as ex:
+            reader.close()
+            messagebox.exception(self, ex)
+            await self.setProject(Project())
+            return
+
+        finally:
+            dialog.deleteLater()
+
+        self.timer_simulations.stop()
+        self._on_timer_simulations()
+        self._dirty_simulations.clear()
+        self.setShouldSave(False)
+
+        # Results are read afterwards
+        self._project_reader = reader
+        self._pending_results.extend(project.simulations)
+        self.timer_results.start()
+
+    def _on_timer_results(self):
+        self._read_pending_results(READ_BUDGET_s)
+
+    def _read_pending_results(self, budget_s=None):
+        if self._project_reader is None:
+            return
+
+        start_s = time.perf_counter()
+        simulations = []
+        while self._pending_results:
+            if budget_s is not None and time.perf_counter() - start_s > budget_s:
+                break
+
+            simulation = self._pending_results.popleft()
+            simulation.results.extend(self._project_reader.read_results(simulation))
+            simulations.append(simulation)
+
+        for simulation in simulations:
+            self._reset_result_fields(simulation)
+
+        if simulations:
+            self._update_summary_fields()
+
+        if self._pending_results:
+            count = len(self.project().simulations)
+            done_count = count - len(self._pending_results)
+            self.statusBar().showMessage(
+                "Reading results ({}/{})".format(done_count, count)
+            )
+        else:
+            self._close_project_reader()
+            self.statusBar().clearMessage()
+
+    def _close_project_reader(self):
+        self.timer_results.stop()
+        self._pending_results.clear()
+
+        if self._project_reader is not None:
+            self._project_reader.close()
+            self._project_reader = None
+
     def saveProject(self, filepath=None):
+        # NOTE: All results must be read before the file can be overwritten
+        self._read_pending_results()
+
         if filepath is None:
             filepath = self._runner.project.filepath
 
@@ -444,20 +603,119 @@ class MainWindow(QtWidgets.QMainWindow):
         if not filepath.endswith(".mcsim"):
             filepath += ".mcsim"
 
-        function = functools.partial(self._runner.project.write, filepath)
+        # Only the modified simulations are written in the project's own file
+        project = self._runner.project
+        identifiers = None
+        if filepath == project.filepath:
+            identifiers = set(self._dirty_simulations)
+
+        function = functools.partial(write_project, project, filepath, identifiers)
         dialog = ExecutionProgressDialog(
-            "Save project", "Saving project...", "Project saved", function
+            "Save project",
+            "Saving project...",
+            "Project saved",
+            function,
+            report_progress=True,
         )
         dialog.exec_()
 
-        self._runner.project.filepath = filepath
+        # NOTE: On failure, the simulations remain to be saved and checkpointed
+        ex = dialog.functionException()
+        if ex is not None:
+            messagebox.exception(self, ex)
+            return False
+
+        project.filepath = filepath
         self.settings().savedir = os.path.dirname(filepath)
 
         for field in self.tree.topLevelFields():
             self.tree.resetField(field)
 
-        self.setShouldSave(False)
+        # Simulations added while saving remain to be saved
+        if identifiers is None:
+            self._dirty_simulations.clear()
+        else:
+            self._dirty_simulations -= identifiers
+
+        self.checkpointer.discard()
+        for identifier in self._dirty_simulations:
+            simulation = self._simulation_fields[identifier].simulation()
+            self.checkpointer.addSimulation(simulation)
+
+        self.setShouldSave(bool(self._dirty_simulations))
+
+        return True
+
+    def _on_checkpoint_found(self, checkpoint_filepath, project_filepath):
+        caption = "Restore simulations"
+        message = (
+            "pyMonteCarlo was not closed properly and some simulations were not saved. "
+            "Would you like to restore them?"
+        )
+        buttons = QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No
+        answer = QtWidgets.QMessageBox.question(None, caption, message, buttons)
+
+        # NOTE: The checkpoint is kept if it cannot be restored, to be
+        # proposed again at the next start
+        if answer == QtWidgets.QMessageBox.Yes:
+            asyncio.ensure_future(
+                self.restoreCheckpoint(checkpoint_filepath, project_filepath)
+            )
+        else:
+            remove_checkpoint(get_config_dir(), checkpoint_filepath)
+
+    async def restoreCheckpoint(self, checkpoint_filepath, project_filepath=None):
+        """
+        Restores the simulations of a checkpoint file in the project they
+        belong to, or in a new project if it was never saved.
+        """
+        try:
+            checkpoint = Project.read(checkpoint_filepath)
+        except Exception as ex:
+            messagebox.exception(self, ex)
+            return False
+
+        if project_filepath and os.path.exists(project_filepath):
+            try:
+                reader = ProjectReader(project_filepath)
+            except Exception as ex:
+                messagebox.exception(self, ex)
+                return False
+
+            await self._read_project(reader)
+            self._read_pending_results()
+        else:
+            await self.setProject(Project())
+
+        # Removed once the simulations are in the new checkpoint
+        self.checkpointer.setRestoredCheckpoint(checkpoint_filepath)
+
+        # New simulations are appended, recalculated ones replace their results
+        project = self.project()
+        new_simulations = []
+        for simulation in checkpoint.simulations:
+            field_simulation = self._simulation_fields.get(simulation.identifier)
+
+            if field_simulation is None:
+                with project.lock:
+                    project.simulations.append(simulation)
+                new_simulations.append(simulation)
+            else:
+                existing = field_simulation.simulation()
+                existing.results[:] = simulation.results
+                self._reset_result_fields(existing)
+                simulation = existing
+
+            self._dirty_simulations.add(simulation.identifier)
+            self.checkpointer.addSimulation(simulation)
+
+        self.addSimulations(new_simulations)
+        self._update_summary_fields()
+        self.setShouldSave(True)
 
+        self.checkpointer.checkpoint()
+
+        self.dock_project.raise_()
         return True
 
     def _add_results_to_tree(self, field_simulation, simulation):
@@ -470,16 +728,30 @@ class MainWindow(QtWidgets.QMainWindow):
                 field_result = KRatioResultField(result, self.settings())
                 self.tree.addField(field_result, field_simulation)
 
-    def addSimulation(self, simulation, index=None):
-        def _find_field(field_project, clasz):
-            children = self.tree.childrenField(field_project)
+    def _on_simulation_added(self, simulation):
+        self._queue_simulation(simulation)
+        self.checkpointer.addSimulation(simulation)
+
+    def _queue_simulation(self, simulation):
+        self._pending_simulations.append(simulation)
+        self.timer_simulations.start()
 
-            for field in children:
-                if isinstance(field, clasz):
-                    return field
+    def _on_timer_simulations(self):
+        simulations = list(self._pending_simulations)
+        self._pending_simulations.clear()
+        self.addSimulations(simulations)
 
-            return None
+    def addSimulation(self, simulation):
+        self.addSimulations([simulation])
 
+    def _find_field(self, parent_field, clasz):
+        for field in self.tree.childrenField(parent_field):
+            if isinstance(field, clasz):
+                return field
+
+        return None
+
+    def _update_summary_fields(self):
         toplevelfields = self.tree.topLevelFields()
         assert len(toplevelfields) == 1
 
@@ -487,7 +759,7 @@ class MainWindow(QtWidgets.QMainWindow):
         project = field_project.project()
 
         # Summary table
-        field_summary_table = _find_field(field_project, ProjectSummaryTableField)
+        field_summary_table = self._find_field(field_project, ProjectSummaryTableField)
         if not field_summary_table:
             field_summary_table = ProjectSummaryTableField(self.settings(), project)
             self.tree.addField(field_summary_table, field_project)
@@ -495,40 +767,58 @@ class MainWindow(QtWidgets.QMainWindow):
         field_summary_table.setProject(project)
 
         # Summary figure
-        field_summary_figure = _find_field(field_project, ProjectSummaryFigureField)
+        field_summary_figure = self._find_field(
+            field_project, ProjectSummaryFigureField
+        )
         if not field_summary_figure:
             field_summary_figure = ProjectSummaryFigureField(self.settings(), project)
             self.tree.addField(field_summary_figure, field_project)
 
         field_summary_figure.setProject(project)
 
-        # Simulation
-        if index is None:
-            index = field_project.project().simulations.index(simulation) + 1
-        field_simulation = SimulationField(index, simulation)
-        self.tree.addField(field_simulation, field_project)
-
-        field_options = OptionsField(simulation.options, self.settings())
-        self.tree.addField(field_options, field_simulation)
-        self._add_results_to_tree(field_simulation, simulation)
-
-        self.tree.reset()
-        self.tree.expand()
-
-        self.setShouldSave(True)
+    def addSimulations(self, simulations):
+        if not simulations:
+            return
 
-    def _on_simulation_recalculated(self, simulation):
-        # Find field
         toplevelfields = self.tree.topLevelFields()
         assert len(toplevelfields) == 1
+
         field_project = toplevelfields[0]
+        project = field_project.project()
 
-        field_simulation = None
-        for field in self.tree.childrenField(field_project):
-            if isinstance(field, SimulationField) and field.simulation() == simulation:
-                field_simulation = field
-                break
+        self._update_summary_fields()
+
+        # Simulations
+        indexes = {
+            id(simulation): index
+            for index, simulation in enumerate(project.simulations, 1)
+        }
+
+        self.tree.setUpdatesEnabled(False)
+        try:
+            for simulation in simulations:
+                index = indexes[id(simulation)]
+                field_simulation = SimulationField(index, simulation)
+                self.tree.addField(field_simulation, field_project)
+                self._simulation_fields[simulation.identifier] = field_simulation
+                self._dirty_simulations.add(simulation.identifier)
 
+                field_options = OptionsField(simulation.options, self.settings())
+                self.tree.addField(field_options, field_simulation)
+                self._add_results_to_tree(field_simulation, simulation)
+
+                self.tree.expandField(field_simulation)
+
+            self.tree.resetField(field_project)
+            self.tree.expandField(field_project)
+        finally:
+            self.tree.setUpdatesEnabled(True)
+
+        self.setShouldSave(True)
+
+    def _reset_result_fields(self, simulation):
+        # Find field
+        field_simulation = self._simulation_fields.get(simulation.identifier)
         if field_simulation is None:
             return
 
@@ -540,14 +830,33 @@ class MainWindow(QtWidgets.QMainWindow):
         # Re-create result fields
         self._add_results_to_tree(field_simulation, simulation)
 
-        self.tree.reset()
-        self.tree.expand()
+        self.tree.resetField(field_simulation, recursive=True)
+        self.tree.expandField(field_simulation)
 
+    def _on_simulation_done(self, identifier, duration_s):
+        options = self._runner.find_options(identifier)
+        if options is not None:
+            self.runtime_history.add(options, duration_s)
+
+    def _on_simulation_recalculated(self, simulation):
+        self._reset_result_fields(simulation)
+        self._dirty_simulations.add(simulation.identifier)
+        self.checkpointer.addSimulation(simulation)
         self.setShouldSave(True)
 
     def settings(self):
         return self._settings
 
+    def wizardSimulation(self):
+        if self.wizard_simulation is None:
+            # NOTE: Imported here since the wizard pulls in matplotlib
+            from pymontecarlo_gui.newsimulation import NewSimulationWizard
+
+            self.wizard_simulation = NewSimulationWizard(
+                self.settings(), self.runtime_history, self._max_workers
+            )
+        return self.wizard_simulation
+
     def shouldSave(self):
         return self._should_save
 
@@ -561,3 +870,6 @@ class MainWindow(QtWidgets.QMainWindow):
         self.tree.setFieldFont(field_project, font)
 
         self._should_save = should_save
+
+        if not should_save:
+            self.checkpointer.discard()
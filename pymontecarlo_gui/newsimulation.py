@@ -1,21 +1,24 @@
 """"""
 
 # Standard library modules.
-import tempfile
+import threading
 
 # Third party modules.
 from qtpy import QtCore, QtWidgets
 from unsync import unsync
 
 # Local modules.
-from pymontecarlo.util.error import ErrorAccumulator
-
 from pymontecarlo_gui.widgets.icon import load_pixmap
 from pymontecarlo_gui.widgets.groupbox import create_group_box
 from pymontecarlo_gui.widgets.field import FieldChooser, FieldToolBox
 from pymontecarlo_gui.figures.sample import SampleFigureWidget
 from pymontecarlo_gui.options.material import MaterialsWidget
 from pymontecarlo_gui.options.options import OptionsModel
+from pymontecarlo_gui.options.table import OptionsTableWidget
+from pymontecarlo_gui.options.validation import (
+    validate_options_list,
+    ValidationCache,
+)
 from pymontecarlo_gui.options.sample.substrate import SubstrateSampleField
 from pymontecarlo_gui.options.sample.inclusion import InclusionSampleField
 from pymontecarlo_gui.options.sample.horizontallayers import HorizontalLayerSampleField
@@ -29,9 +32,22 @@ from pymontecarlo_gui.options.analysis.photonintensity import (
 )
 from pymontecarlo_gui.options.analysis.kratio import KRatioAnalysisField
 from pymontecarlo_gui.options.program.base import ProgramsField, ProgramFieldBase
+from pymontecarlo_gui.util.runtime import estimate_runtime, estimate_wall_time
 
 # Globals and constants variables.
 
+MAX_VALIDATION_ERRORS = 20
+
+
+def _format_duration(duration_s):
+    if duration_s < 60:
+        return "< 1 min"
+    elif duration_s < 3600:
+        return "{:.0f} min".format(duration_s / 60)
+    else:
+        return "{:.1f} h".format(duration_s / 3600)
+
+
 # region Widgets
 
 
@@ -46,10 +62,16 @@ class SimulationCountMockButton(QtWidgets.QAbstractButton):
         self.label = QtWidgets.QLabel("No simulation defined")
         self.label.setAlignment(QtCore.Qt.AlignCenter)
 
+        self.lbl_runtime = QtWidgets.QLabel()
+        self.lbl_runtime.setAlignment(QtCore.Qt.AlignCenter)
+        self.lbl_runtime.setVisible(False)
+
         # Layouts
         layout = QtWidgets.QVBoxLayout()
         layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
         layout.addWidget(self.label)
+        layout.addWidget(self.lbl_runtime)
         self.setLayout(layout)
 
     def paintEvent(self, event):
@@ -72,6 +94,27 @@ class SimulationCountMockButton(QtWidgets.QAbstractButton):
     def count(self):
         return self._count
 
+    def setRuntime(self, estimate, max_workers=1):
+        """
+        Shows the total CPU time and the wall-clock time on *max_workers*
+        workers of a :class:`RuntimeEstimate`, or hides them if
+        *estimate* is ``None`` or no simulation has an estimate.
+        """
+        if estimate is None or estimate.known_count <= 0:
+            self.lbl_runtime.setVisible(False)
+            return
+
+        text = "~{} CPU time, ~{} with {:d} worker(s)".format(
+            _format_duration(estimate.cpu_s),
+            _format_duration(estimate_wall_time(estimate, max_workers)),
+            max_workers,
+        )
+        if estimate.unknown_count > 0:
+            text += ", {:d} simulation(s) never run".format(estimate.unknown_count)
+
+        self.lbl_runtime.setText(text)
+        self.lbl_runtime.setVisible(True)
+
 
 class PreviewWidget(QtWidgets.QWidget):
     def __init__(self, model, parent=None):
@@ -330,13 +373,39 @@ class ProgramWizardPage(NewSimulationWizardPage):
 
 
 class ValidationThread(QtCore.QThread):
+    """
+    Validates the options of the model.
+    The validation is stopped after *max_errors* errors, if specified,
+    or when :meth:`cancel` is called.
+    """
 
     update = QtCore.Signal(int, int)
+    errorsChanged = QtCore.Signal(object)
 
-    def __init__(self, model, parent=None):
+    def __init__(self, model, max_errors=None, parent=None):
         super().__init__(parent)
         self.model = model
+        self.max_errors = max_errors
         self.erraccs = {}
+        self.cache = ValidationCache()  # Kept between visits of the page
+        self.stop_event = threading.Event()
+        self._error_count = 0
+
+    def exceptions(self):
+        """
+        Returns the exceptions found so far by program name.
+        """
+        return {name: erracc.exceptions for name, erracc in self.erraccs.items()}
+
+    def _on_validated(self, index, options_count):
+        self.update.emit(index, options_count)
+
+        # Errors are reported as soon as they are found
+        exceptions = self.exceptions()
+        error_count = sum(map(len, exceptions.values()))
+        if error_count != self._error_count:
+            self._error_count = error_count
+            self.errorsChanged.emit(exceptions)
 
     @unsync
     async def runasync(self):
@@ -344,18 +413,32 @@ class ValidationThread(QtCore.QThread):
         self.update.emit(0, options_count)
 
         self.erraccs.clear()
-        for i, options in enumerate(self.model.iterOptions(), 1):
-            erracc = self.erraccs.setdefault(options.program.name, ErrorAccumulator())
-
-            with tempfile.TemporaryDirectory() as dirpath:
-                exporter = options.program.exporter
-                await exporter._export(options, dirpath, erracc, dry_run=True)
+        self._error_count = 0
+        await validate_options_list(
+            self.model.iterOptions(),
+            self.erraccs,
+            lambda i: self._on_validated(i, options_count),
+            cache=self.cache,
+            stop_event=self.stop_event,
+            max_errors=self.max_errors,
+        )
 
-            self.update.emit(i, options_count)
+    def start(self, *args):
+        self.stop_event.clear()
+        super().start(*args)
 
     def run(self):
         self.runasync().result()
 
+    def cancel(self):
+        """
+        Stops the validation as soon as the options being validated are done.
+        """
+        self.stop_event.set()
+
+    def isCancelled(self):
+        return self.stop_event.is_set()
+
 
 class ValidationWizardPage(NewSimulationWizardPage):
 
@@ -366,34 +449,46 @@ class ValidationWizardPage(NewSimulationWizardPage):
         self.setTitle("Check simulation(s)")
 
         # Variables
-        self._thread = ValidationThread(model)
+        self._thread = ValidationThread(model, MAX_VALIDATION_ERRORS)
+        self._restart = False
 
         # Widgets
         self._widget_errors = QtWidgets.QLabel()
         self._widget_errors.setWordWrap(True)
 
+        self.spinbox_max_errors = QtWidgets.QSpinBox()
+        self.spinbox_max_errors.setRange(0, 10000)
+        self.spinbox_max_errors.setSpecialValueText("No limit")
+        self.spinbox_max_errors.setValue(MAX_VALIDATION_ERRORS)
+
         self._progressbar = QtWidgets.QProgressBar()
 
         # Layouts
+        layout_max_errors = QtWidgets.QFormLayout()
+        layout_max_errors.addRow("Stop after errors", self.spinbox_max_errors)
+
         layout = QtWidgets.QVBoxLayout()
         layout.addWidget(self._widget_errors)
         layout.addStretch()
+        layout.addLayout(layout_max_errors)
         layout.addWidget(self._progressbar)
         self.setLayout(layout)
 
         # Signals
+        self.spinbox_max_errors.valueChanged.connect(self._on_max_errors_changed)
         self._thread.update.connect(self._on_thread_update)
+        self._thread.errorsChanged.connect(self._on_thread_errors_changed)
         self._thread.finished.connect(self._on_thread_finished)
 
-    def _errors_to_html(self, erraccs):
+    def _errors_to_html(self, exceptions_by_program):
         html = ""
 
-        for program_name, erracc in erraccs.items():
+        for program_name, exceptions in exceptions_by_program.items():
             html += "<h2>{}</h2>".format(program_name)
 
             html += "<ul>"
 
-            exceptions = set(str(exception) for exception in erracc.exceptions)
+            exceptions = set(str(exception) for exception in exceptions)
             if exceptions:
                 for exception in sorted(exceptions):
                     html += "<li>{}</li>".format(exception)
@@ -412,8 +507,30 @@ class ValidationWizardPage(NewSimulationWizardPage):
 
         self.completeChanged.emit()
 
+    def _on_thread_errors_changed(self, exceptions_by_program):
+        self._widget_errors.setText(self._errors_to_html(exceptions_by_program))
+
+    def _on_max_errors_changed(self, value):
+        self._thread.max_errors = value or None
+
+        # NOTE: Validated again from the cache, once the current validation
+        # is stopped
+        if self._thread.isRunning():
+            self._restart = True
+            self._thread.cancel()
+        elif self._thread.isFinished():
+            self._on_page_loaded()
+
     def _on_thread_finished(self):
-        self._widget_errors.setText(self._errors_to_html(self._thread.erraccs))
+        if self._restart:
+            self._restart = False
+            self._on_page_loaded()
+            return
+
+        if self._thread.isCancelled():
+            return
+
+        self._widget_errors.setText(self._errors_to_html(self._thread.exceptions()))
         self.completeChanged.emit()
 
     def _on_page_loaded(self):
@@ -427,14 +544,26 @@ class ValidationWizardPage(NewSimulationWizardPage):
 
     def cleanupPage(self):
         super().cleanupPage()
-        self._thread.terminate()
+        self._restart = False
+        self._thread.cancel()
+        self._thread.wait()
+
+    def clearCache(self):
+        """
+        Stops the validation and discards the validated options.
+        """
+        self._restart = False
+        self._thread.cancel()
         self._thread.wait()
+        self._thread.cache.clear()
 
     def isComplete(self):
         if self._thread.isRunning():
             return False
         if not self._thread.isFinished():
             return False
+        if self._thread.isCancelled():
+            return False
 
         for erracc in self._thread.erraccs.values():
             if erracc.exceptions:
@@ -449,7 +578,7 @@ class ValidationWizardPage(NewSimulationWizardPage):
 
 
 class NewSimulationWizard(QtWidgets.QWizard):
-    def __init__(self, settings, parent=None):
+    def __init__(self, settings, runtime_history=None, max_workers=1, parent=None):
         super().__init__(parent)
         self.setWindowTitle("New simulation(s)")
         self.setWindowIcon(load_pixmap("logo_32x32.png"))
@@ -462,6 +591,8 @@ class NewSimulationWizard(QtWidgets.QWizard):
 
         # Variables
         self.model = OptionsModel(settings)
+        self.runtime_history = runtime_history
+        self.max_workers = max_workers
 
         # Buttons
         self.setOption(QtWidgets.QWizard.HaveCustomButton1)
@@ -477,6 +608,8 @@ class NewSimulationWizard(QtWidgets.QWizard):
         )
 
         self.btn_count = SimulationCountMockButton()
+        self.btn_count.setToolTip("Show simulations")
+        self.btn_count.setCursor(QtCore.Qt.PointingHandCursor)
         self.setButton(QtWidgets.QWizard.CustomButton1, self.btn_count)
 
         # Sample
@@ -501,8 +634,14 @@ class NewSimulationWizard(QtWidgets.QWizard):
 
         # Signals
         self.currentIdChanged.connect(self._on_options_changed)
+        self.btn_count.clicked.connect(self._on_count_clicked)
         self.model.optionsChanged.connect(self._on_options_changed)
 
+    def done(self, result):
+        # NOTE: Validated options are only reused while the wizard is open
+        self.page_validation.clearCache()
+        super().done(result)
+
     def _create_sample_page(self):
         page = SampleWizardPage(self.model)
 
@@ -543,8 +682,39 @@ class NewSimulationWizard(QtWidgets.QWizard):
         count = self.model.optionsCount()
         self.btn_count.setCount(count, estimate=True)
 
+        if self.runtime_history is not None:
+            estimate = estimate_runtime(self.model, self.runtime_history)
+            self.btn_count.setRuntime(estimate, self.max_workers)
+
+    def _on_count_clicked(self):
+        dialog = QtWidgets.QDialog(self)
+        dialog.setWindowTitle("Simulations")
+        dialog.resize(900, 600)
+
+        widget = OptionsTableWidget(self.model)
+
+        buttons = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Close)
+        buttons.rejected.connect(dialog.reject)
+
+        layout = QtWidgets.QVBoxLayout()
+        layout.addWidget(widget)
+        layout.addWidget(buttons)
+        dialog.setLayout(layout)
+
+        dialog.exec_()
+        dialog.deleteLater()
+
     def optionsList(self):
         return self.model.optionsList()
 
+    def iterOptions(self):
+        return self.model.iterOptions()
+
+    def sweepOptions(self):
+        return self.model.sweepOptions()
+
+    def optionsCount(self):
+        return self.model.optionsCount()
+
 
 # endregion
@@ -4,6 +4,7 @@
 import abc
 from collections import namedtuple
 import itertools
+import math
 
 # Third party modules.
 from qtpy import QtCore, QtGui, QtWidgets
@@ -89,6 +90,33 @@ class ParticleField(FieldBase):
 
 Position = namedtuple("Position", ("x_m", "y_m"))
 
+MAX_REMOVED_RUNS = 100
+
+POSITION_DTYPE = np.dtype([("x_m", np.float64), ("y_m", np.float64)])
+
+
+def create_positions(xs_m, ys_m):
+    """
+    Returns a record array of positions (with fields ``x_m`` and ``y_m``)
+    from arrays of coordinates, broadcasted against each other.
+    """
+    xs_m, ys_m = np.broadcast_arrays(
+        np.asarray(xs_m, dtype=np.float64), np.asarray(ys_m, dtype=np.float64)
+    )
+
+    positions = np.empty(xs_m.size, dtype=POSITION_DTYPE)
+    positions["x_m"] = xs_m.ravel()
+    positions["y_m"] = ys_m.ravel()
+    return positions.view(np.recarray)
+
+
+def _as_positions(positions):
+    if isinstance(positions, np.ndarray) and positions.dtype == POSITION_DTYPE:
+        return positions.view(np.recarray)
+
+    positions = [tuple(position) for position in positions]
+    return np.array(positions, dtype=POSITION_DTYPE).view(np.recarray)
+
 
 class CoordinateField(FieldBase, ToleranceMixin):
     def __init__(self, title):
@@ -140,7 +168,7 @@ class StepField(FieldBase):
         return self._widget
 
     def step(self):
-        return self._widget.value()
+        return int(self._widget.value())
 
     def setStep(self, step):
         self._widget.setValue(step)
@@ -157,7 +185,10 @@ class PositionField(WidgetFieldBase, ToleranceMixin):
 
     @abc.abstractmethod
     def positions(self):
-        return []
+        """
+        Returns a record array of positions, see :func:`create_positions`.
+        """
+        return create_positions([], [])
 
 
 class SinglePositionField(PositionField):
@@ -176,7 +207,7 @@ class SinglePositionField(PositionField):
     def positions(self):
         x_m = self.field_x.coordinateMeter()
         y_m = self.field_y.coordinateMeter()
-        return [Position(x_m, y_m)]
+        return create_positions([x_m], [y_m])
 
 
 class LineScanPositionField(PositionField):
@@ -203,10 +234,7 @@ class LineScanXPositionField(LineScanPositionField):
         start_m = self.field_start.coordinateMeter()
         stop_m = self.field_stop.coordinateMeter()
         num = self.field_step.step()
-        return [
-            Position(x_m, 0.0)
-            for x_m in np.linspace(start_m, stop_m, num, endpoint=True)
-        ]
+        return create_positions(np.linspace(start_m, stop_m, num, endpoint=True), 0.0)
 
 
 class LineScanYPositionField(LineScanPositionField):
@@ -217,10 +245,7 @@ class LineScanYPositionField(LineScanPositionField):
         start_m = self.field_start.coordinateMeter()
         stop_m = self.field_stop.coordinateMeter()
         num = self.field_step.step()
-        return [
-            Position(0.0, y_m)
-            for y_m in np.linspace(start_m, stop_m, num, endpoint=True)
-        ]
+        return create_positions(0.0, np.linspace(start_m, stop_m, num, endpoint=True))
 
 
 class GridPositionField(PositionField):
@@ -263,17 +288,111 @@ class GridPositionField(PositionField):
         y_num = self.field_y_step.step()
         ys_m = np.linspace(y_start_m, y_stop_m, y_num, endpoint=True)
 
-        return [Position(x_m, y_m) for x_m, y_m in itertools.product(xs_m, ys_m)]
+        # NOTE: Same order as itertools.product(xs_m, ys_m)
+        return create_positions(*np.meshgrid(xs_m, ys_m, indexing="ij"))
 
 
 class PositionsModel(QtCore.QAbstractTableModel, ToleranceMixin):
+    """
+    Model of distinct positions. Two positions are equal if their coordinates
+    differ by at most the tolerance.
+    Positions are indexed by their coordinates quantized to the tolerance,
+    so a position is only compared with the positions of the neighbouring
+    cells to find a duplicate.
+    Positions are stored in a growable structured array, along with their
+    display text, formatted when they are added or the tolerance changes.
+    """
+
     def __init__(self):
         super().__init__()
 
-        self._positions = []
+        self._positions = np.empty(0, dtype=POSITION_DTYPE)
+        self._count = 0
+        self._texts = []  # Display texts of the coordinates of each row
+        self._index = {}  # Coordinates by quantized coordinates
+
+    def _key(self, x_m, y_m):
+        tolerance_m = self.toleranceMeter()
+        if not tolerance_m or not (math.isfinite(x_m) and math.isfinite(y_m)):
+            return (x_m, y_m)
+        return (math.floor(x_m / tolerance_m), math.floor(y_m / tolerance_m))
+
+    def _find(self, x_m, y_m):
+        """
+        Returns the coordinates of the position of the model equal to
+        (*x_m*, *y_m*), or ``None``.
+        """
+        tolerance_m = self.toleranceMeter()
+        key = self._key(x_m, y_m)
+
+        if not isinstance(key[0], int):
+            for other in self._index.get(key, ()):
+                return other
+            return None
+
+        i, j = key
+        for key in itertools.product((i - 1, i, i + 1), (j - 1, j, j + 1)):
+            for other in self._index.get(key, ()):
+                if (
+                    abs(other[0] - x_m) <= tolerance_m
+                    and abs(other[1] - y_m) <= tolerance_m
+                ):
+                    return other
+
+        return None
+
+    def _rebuild_index(self):
+        self._index.clear()
+        positions = self._positions[: self._count]
+        for x_m, y_m in zip(positions["x_m"].tolist(), positions["y_m"].tolist()):
+            self._index.setdefault(self._key(x_m, y_m), []).append((x_m, y_m))
+
+    def _format(self, positions):
+        tolerance_m = self.toleranceMeter()
+        if tolerance_m is not None:
+            precision = max(tolerance_to_decimals(tolerance_m) - 9, 0)
+            fmt = "%.{:d}f".format(precision)
+        else:
+            fmt = "%g"
+
+        xs = np.char.mod(fmt, positions["x_m"] * 1e9).tolist()
+        ys = np.char.mod(fmt, positions["y_m"] * 1e9).tolist()
+        return list(zip(xs, ys))
+
+    def _insert(self, positions):
+        """
+        Indexes the positions not already in the model and returns them.
+        """
+        positions = _as_positions(positions)
+        inserted = np.zeros(len(positions), dtype=bool)
+
+        for row, (x_m, y_m) in enumerate(
+            zip(positions["x_m"].tolist(), positions["y_m"].tolist())
+        ):
+            if self._find(x_m, y_m) is not None:
+                continue
+
+            self._index.setdefault(self._key(x_m, y_m), []).append((x_m, y_m))
+            inserted[row] = True
+
+        return positions[inserted]
+
+    def _append(self, positions):
+        count = self._count + len(positions)
+
+        # NOTE: Capacity doubled, so that adding positions is amortized
+        if count > len(self._positions):
+            capacity = max(count, 2 * len(self._positions))
+            storage = np.empty(capacity, dtype=POSITION_DTYPE)
+            storage[: self._count] = self._positions[: self._count]
+            self._positions = storage
+
+        self._positions[self._count : count] = positions
+        self._count = count
+        self._texts.extend(self._format(positions))
 
     def rowCount(self, parent=None):
-        return len(self._positions)
+        return self._count
 
     def columnCount(self, parent=None):
         return 2
@@ -284,22 +403,13 @@ class PositionsModel(QtCore.QAbstractTableModel, ToleranceMixin):
 
         row = index.row()
         column = index.column()
-        position = self._positions[row]
 
         if role == QtCore.Qt.DisplayRole:
-            if self.toleranceMeter() is not None:
-                precision = tolerance_to_decimals(self.toleranceMeter()) - 9
-                fmt = "{0:.{precision}f}"
-            else:
-                fmt = "{0:g}"
-
-            if column == 0:
-                return fmt.format(position.x_m * 1e9, precision=precision)
-            elif column == 1:
-                return fmt.format(position.y_m * 1e9, precision=precision)
+            if column in (0, 1):
+                return self._texts[row][column]
 
         elif role == QtCore.Qt.UserRole:
-            return position
+            return self.position(row)
 
         elif role == QtCore.Qt.TextAlignmentRole:
             return QtCore.Qt.AlignCenter
@@ -318,60 +428,120 @@ class PositionsModel(QtCore.QAbstractTableModel, ToleranceMixin):
     def flags(self, index):
         return super().flags(index)
 
-    def _add_position(self, position):
-        if position in self._positions:
-            return False
-        self._positions.append(position)
-        return True
-
     def addPosition(self, position):
-        added = self._add_position(position)
-        if added:
-            self.modelReset.emit()
-        return added
+        return self.addPositions([position])
 
     def addPositions(self, positions):
-        if not positions:
+        """
+        Adds the positions (a record array or an iterable of ``(x_m, y_m)``)
+        not already in the model, in a single insertion.
+        Returns whether at least one position was added.
+        """
+        positions = self._insert(positions)
+        if not len(positions):
             return False
 
-        added = False
-        for position in positions:
-            added |= self._add_position(position)
-
-        if added:
-            self.modelReset.emit()
+        first = self._count
+        last = first + len(positions) - 1
+        self.beginInsertRows(QtCore.QModelIndex(), first, last)
+        self._append(positions)
+        self.endInsertRows()
 
-        return added
+        return True
 
     def removePosition(self, position):
-        if position not in self._positions:
+        return self.removePositions([position])
+
+    def removePositions(self, positions):
+        """
+        Removes the positions of the model equal to *positions*.
+        Consecutive rows are removed together.
+        Returns whether at least one position was removed.
+        """
+        removed = set()
+
+        for x_m, y_m in _as_positions(positions).tolist():
+            other = self._find(x_m, y_m)
+            if other is None or other in removed:
+                continue
+
+            key = self._key(*other)
+            bucket = self._index[key]
+            bucket.remove(other)
+            if not bucket:
+                del self._index[key]
+
+            removed.add(other)
+
+        if not removed:
             return False
-        self._positions.remove(position)
-        self.modelReset.emit()
+
+        # NOTE: Coordinates compared as complex numbers to find all rows at once
+        positions = self._positions[: self._count]
+        coordinates = positions["x_m"] + 1j * positions["y_m"]
+        removed = [complex(x_m, y_m) for x_m, y_m in removed]
+        rows = np.flatnonzero(np.isin(coordinates, removed))
+
+        # NOTE: Many scattered rows are removed at once, in a reset
+        breaks = np.flatnonzero(np.diff(rows) != 1)
+        if len(breaks) >= MAX_REMOVED_RUNS:
+            self.beginResetModel()
+            kept = np.delete(np.arange(self._count), rows)
+            self._positions[: len(kept)] = positions[kept]
+            self._count = len(kept)
+            self._texts = [self._texts[row] for row in kept.tolist()]
+            self.endResetModel()
+            return True
+
+        # NOTE: Runs of consecutive rows, removed from the last one
+        firsts = rows[np.concatenate(([0], breaks + 1))].tolist()
+        lasts = rows[np.concatenate((breaks, [len(rows) - 1]))].tolist()
+
+        for first, last in reversed(list(zip(firsts, lasts))):
+            size = last - first + 1
+            self.beginRemoveRows(QtCore.QModelIndex(), first, last)
+            self._positions[first : self._count - size] = self._positions[
+                last + 1 : self._count
+            ]
+            self._count -= size
+            del self._texts[first : last + 1]
+            self.endRemoveRows()
+
         return True
 
     def clearPositions(self):
-        self._positions.clear()
-        self.modelReset.emit()
+        self.beginResetModel()
+        self._count = 0
+        self._texts.clear()
+        self._index.clear()
+        self.endResetModel()
 
     def hasPositions(self):
-        return bool(self._positions)
+        return self._count > 0
 
     def position(self, row):
-        return self._positions[row]
+        return Position(*self._positions[row].tolist())
 
     def positions(self):
-        return tuple(self._positions)
+        """
+        Returns a copy of the positions as a record array.
+        """
+        return self._positions[: self._count].copy().view(np.recarray)
 
     def setPositions(self, positions):
-        self.clearPositions()
-        for x, y in positions:
-            self._add_position(x, y)
-        self.modelReset.emit()
+        self.beginResetModel()
+        self._count = 0
+        self._texts.clear()
+        self._index.clear()
+        self._append(self._insert(positions))
+        self.endResetModel()
 
     def setToleranceMeter(self, tolerance_m):
+        self.beginResetModel()
         super().setToleranceMeter(tolerance_m)
-        self.modelReset.emit()
+        self._rebuild_index()
+        self._texts = self._format(self._positions[: self._count])
+        self.endResetModel()
 
 
 class PositionsWidget(QtWidgets.QWidget, ToleranceMixin):
@@ -434,6 +604,10 @@ class PositionsWidget(QtWidgets.QWidget, ToleranceMixin):
         model.dataChanged.connect(self.positionsChanged)
         model.modelReset.connect(self._on_positions_changed)
         model.modelReset.connect(self.positionsChanged)
+        model.rowsInserted.connect(self._on_positions_changed)
+        model.rowsInserted.connect(self.positionsChanged)
+        model.rowsRemoved.connect(self._on_positions_changed)
+        model.rowsRemoved.connect(self.positionsChanged)
         self.table_positions.selectionModel().selectionChanged.connect(
             self._on_positions_changed
         )
@@ -445,8 +619,8 @@ class PositionsWidget(QtWidgets.QWidget, ToleranceMixin):
 
         indexes = selection_model.selectedIndexes()
         model = self.table_positions.model()
-        for row in reversed(sorted(set(index.row() for index in indexes))):
-            model.removePosition(model.position(row))
+        rows = set(index.row() for index in indexes)
+        model.removePositions([model.position(row) for row in rows])
 
     def _on_clear_triggered(self):
         model = self.table_positions.model()
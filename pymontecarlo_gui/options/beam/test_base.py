@@ -0,0 +1,111 @@
+""""""
+
+# Standard library modules.
+
+# Third party modules.
+import pytest
+
+import numpy as np
+
+# Local modules.
+from qtpy import QtCore
+
+from pymontecarlo_gui.options.beam.base import (
+    PositionsModel,
+    Position,
+    GridPositionField,
+    LineScanXPositionField,
+    POSITION_DTYPE,
+)
+
+# Globals and constants variables.
+
+
+@pytest.fixture
+def model(qtbot):
+    model = PositionsModel()
+    model.setToleranceMeter(1e-9)
+    return model
+
+
+def test_add_positions(qtbot, model):
+    positions = [Position(x * 1e-8, y * 1e-8) for x in range(200) for y in range(200)]
+
+    with qtbot.waitSignal(model.rowsInserted) as blocker:
+        assert model.addPositions(positions)
+
+    assert blocker.args[1:] == [0, len(positions) - 1]
+    assert model.rowCount() == len(positions)
+
+    # Equal within tolerance
+    assert not model.addPosition(Position(1e-8 + 5e-10, 2e-8 - 5e-10))
+    assert model.addPosition(Position(1e-8 + 2e-9, 2e-8))
+    assert model.rowCount() == len(positions) + 1
+
+
+def test_add_positions_duplicates(qtbot, model):
+    assert model.addPositions([Position(0.0, 0.0), Position(0.0, 1e-10)])
+    assert model.positions().tolist() == [(0.0, 0.0)]
+
+
+def test_remove_positions(qtbot, model):
+    model.addPositions([Position(x * 1e-8, 0.0) for x in range(10)])
+
+    assert model.removePositions([Position(2e-8, 0.0), Position(3e-8, 1e-10)])
+    assert model.removePosition(Position(7e-8, 0.0))
+    assert not model.removePosition(Position(7e-8, 0.0))
+
+    xs = [position.x_m for position in model.positions()]
+    assert xs == pytest.approx([x * 1e-8 for x in [0, 1, 4, 5, 6, 8, 9]])
+
+    assert model.addPosition(Position(2e-8, 0.0))
+
+
+def test_set_positions(qtbot, model):
+    with qtbot.waitSignal(model.modelReset):
+        model.setPositions([(0.0, 0.0), (1e-8, 0.0), (1e-8, 0.0)])
+
+    assert model.positions().tolist() == [(0.0, 0.0), (1e-8, 0.0)]
+
+
+def test_add_positions_array(qtbot, model):
+    field = GridPositionField()
+    field.field_x_step.setStep(3)
+    field.field_y_step.setStep(2)
+
+    positions = field.positions()
+    assert positions.dtype == POSITION_DTYPE
+    assert positions.x_m == pytest.approx([-1e-6, -1e-6, 0.0, 0.0, 1e-6, 1e-6])
+    assert positions.y_m == pytest.approx([-1e-6, 1e-6] * 3)
+
+    assert model.addPositions(positions)
+    assert not model.addPositions(positions)
+    assert model.rowCount() == 6
+    assert model.position(2) == Position(0.0, -1e-6)
+
+
+def test_data(qtbot, model):
+    field = LineScanXPositionField()
+    field.field_step.setStep(3)
+    model.addPositions(field.positions())
+
+    assert model.data(model.index(0, 0)) == "-5000"
+    assert model.data(model.index(2, 1)) == "0"
+
+    model.setToleranceMeter(1e-11)
+    assert model.data(model.index(0, 0)) == "-5000.00"
+
+    model.setToleranceMeter(None)
+    assert model.data(model.index(0, 0)) == "-5000"
+    assert model.data(model.index(0, 0), QtCore.Qt.UserRole) == Position(-5e-6, 0.0)
+
+
+def test_remove_positions_scattered(qtbot, model):
+    model.addPositions([Position(x * 1e-8, 0.0) for x in range(1000)])
+
+    with qtbot.waitSignal(model.modelReset):
+        assert model.removePositions(model.positions()[::2])
+
+    assert model.rowCount() == 500
+    assert model.positions().x_m == pytest.approx(np.arange(1, 1000, 2) * 1e-8)
+    assert model.data(model.index(1, 0)) == "30"
@@ -29,6 +29,64 @@ from pymontecarlo_gui.util.validate import (
 
 # Globals and constants variables.
 
+COMPOSITION_CACHE_SIZE = 256
+
+# --- Composition cache
+
+
+def _normalize_composition(composition):
+    return tuple(
+        sorted((int(z), float(fraction)) for z, fraction in composition.items())
+    )
+
+
+@functools.lru_cache(maxsize=COMPOSITION_CACHE_SIZE)
+def _parse_formula(formula):
+    try:
+        return _normalize_composition(from_formula(formula))
+    except:
+        return None  # Invalid formulas are also cached
+
+
+@functools.lru_cache(maxsize=COMPOSITION_CACHE_SIZE)
+def _calculate_density_kg_per_m3(items):
+    return calculate_density_kg_per_m3(dict(items))
+
+
+@functools.lru_cache(maxsize=COMPOSITION_CACHE_SIZE)
+def _generate_name(items):
+    return generate_name(dict(items))
+
+
+def parse_formula(formula):
+    """
+    Returns the composition (weight fractions by atomic number) of a formula.
+    Raises :exc:`ValueError` if the formula is invalid.
+
+    Like :func:`composition_density_kg_per_m3` and :func:`composition_name`,
+    results are cached, so that the fields of the material widgets
+    do not parse or calculate again the same formula or composition.
+    """
+    items = _parse_formula(formula)
+    if items is None:
+        raise ValueError("Invalid formula: {}".format(formula))
+    return dict(items)
+
+
+def composition_density_kg_per_m3(composition):
+    return _calculate_density_kg_per_m3(_normalize_composition(composition))
+
+
+def composition_name(composition):
+    return _generate_name(_normalize_composition(composition))
+
+
+def clear_composition_cache():
+    _parse_formula.cache_clear()
+    _calculate_density_kg_per_m3.cache_clear()
+    _generate_name.cache_clear()
+
+
 # --- Mix-ins
 
 
@@ -90,8 +148,8 @@ class FormulaValidator(QtGui.QRegularExpressionValidator):
             return state, input, pos
 
         try:
-            from_formula(input)
-        except:
+            parse_formula(input)
+        except ValueError:
             return QtGui.QValidator.Intermediate, input, pos
 
         return QtGui.QValidator.Acceptable, input, pos
@@ -130,7 +188,7 @@ class MaterialNameField(FieldBase):
             return
 
         try:
-            name = generate_name(self._composition)
+            name = composition_name(self._composition)
         except:
             name = ""
 
@@ -216,7 +274,7 @@ class MaterialDensityField(FieldBase):
             return
 
         try:
-            density_kg_per_m3 = calculate_density_kg_per_m3(self._composition)
+            density_kg_per_m3 = composition_density_kg_per_m3(self._composition)
         except:
             density_kg_per_m3 = 0.0
 
@@ -350,8 +408,8 @@ class MaterialFormulaWidget(MaterialWidget):
 
     def _on_formula_changed(self):
         try:
-            composition = from_formula(self.field_formula.formula())
-        except:
+            composition = parse_formula(self.field_formula.formula())
+        except ValueError:
             composition = {}
         self.field_density.setComposition(composition)
 
@@ -368,7 +426,8 @@ class MaterialFormulaWidget(MaterialWidget):
             formula = self.field_formula.formula()
             density_kg_per_m3 = self.field_density.density_kg_per_m3()
             color = self.field_color.color()
-            return (Material.from_formula(formula, density_kg_per_m3, color),)
+            composition = parse_formula(formula)
+            return (Material(formula, composition, density_kg_per_m3, color),)
         except:
             return ()
 
@@ -1,59 +1,29 @@
 """"""
 
 # Standard library modules.
-import contextlib
+import itertools
 
 # Third party modules.
-from qtpy import QtCore, QtGui, QtWebEngineWidgets
+from qtpy import QtCore, QtGui
 
 # Local modules.
 from pymontecarlo.formats.document import publish_html, DocumentBuilder
 from pymontecarlo.options.options import Options, OptionsBuilder
-from pymontecarlo.options.beam import PencilBeam
-from pymontecarlo.options.sample import SubstrateSample
-from pymontecarlo.options.material import Material
 from pymontecarlo.mock import ProgramMock
 
 from pymontecarlo_gui.project import SettingsBasedField
+from pymontecarlo_gui.util.fingerprint import OptionsDigester
 
 # Globals and constants variables.
 
 
-@contextlib.contextmanager
-def estimated_builder(builder):
-    program_mock_added = False
-    if not builder.programs:
-        builder.add_program(ProgramMock())
-        program_mock_added = True
-
-    beam_mock_added = False
-    if not builder.beams:
-        builder.add_beam(PencilBeam(10e3))
-        beam_mock_added = True
-
-    sample_mock_added = False
-    if not builder.samples:
-        builder.add_sample(SubstrateSample(Material.pure(26)))
-        sample_mock_added = True
-
-    try:
-        yield builder
-
-    finally:
-        if program_mock_added:
-            builder.programs.clear()
-        if beam_mock_added:
-            builder.beams.clear()
-        if sample_mock_added:
-            builder.samples.clear()
-
-
 class OptionsModel(QtCore.QObject):
 
     beamsChanged = QtCore.Signal()
     samplesChanged = QtCore.Signal()
     analysesChanged = QtCore.Signal()
     programsChanged = QtCore.Signal()
+    excludedChanged = QtCore.Signal()
     optionsChanged = QtCore.Signal()
 
     def __init__(self, settings):
@@ -65,12 +35,22 @@ class OptionsModel(QtCore.QObject):
         self._list_options = []
         self._estimated = False
 
+        # NOTE: Analysis combinations of each program, only updated
+        # when the analyses or programs change
+        self._analysis_combinations = []
+        self._mock_analysis_combination_count = 1
+
+        # Options excluded by the user, by their keys
+        self._digester = OptionsDigester()
+        self._excluded = {}
+
     def setSamples(self, samples):
         if self.builder.samples == samples:
             return
 
         self.builder.samples.clear()
         self.builder.samples.extend(samples)
+        self._prune_excluded()
         # self._calculate()
         self.samplesChanged.emit()
         self.optionsChanged.emit()
@@ -81,6 +61,7 @@ class OptionsModel(QtCore.QObject):
 
         self.builder.beams.clear()
         self.builder.beams.extend(beams)
+        self._prune_excluded()
         # self._calculate()
         self.beamsChanged.emit()
         self.optionsChanged.emit()
@@ -91,6 +72,8 @@ class OptionsModel(QtCore.QObject):
 
         self.builder.analyses.clear()
         self.builder.analyses.extend(analyses)
+        self._update_analysis_combinations()
+        self._prune_excluded()
         # self._calculate()
         self.analysesChanged.emit()
         self.optionsChanged.emit()
@@ -101,19 +84,190 @@ class OptionsModel(QtCore.QObject):
 
         self.builder.programs.clear()
         self.builder.programs.extend(programs)
+        self._update_analysis_combinations()
+        self._prune_excluded()
         # self._calculate()
         self.programsChanged.emit()
         self.optionsChanged.emit()
 
+    def _expand_analyses(self, program):
+        return program.expander.expand_analyses(self.builder.analyses) or [None]
+
+    def _update_analysis_combinations(self):
+        self._analysis_combinations = [
+            self._expand_analyses(program) for program in self.builder.programs
+        ]
+
+        if not self.builder.programs:
+            self._mock_analysis_combination_count = len(
+                self._expand_analyses(ProgramMock())
+            )
+
+    def analysisCombinations(self):
+        """
+        Returns a :class:`list` of the analysis combinations of each program,
+        in the order of the programs.
+        """
+        return self._analysis_combinations
+
+    def _prune_excluded(self):
+        if not self._excluded:
+            return
+
+        digest = self._digester.digest
+        beam_digests = set(map(digest, self.builder.beams))
+        sample_digests = set(map(digest, self.builder.samples))
+        analyses_digests = set(
+            (digest(program), tuple(sorted(map(digest, analyses or ()))))
+            for program, combinations in zip(
+                self.builder.programs, self._analysis_combinations
+            )
+            for analyses in combinations
+        )
+
+        for key in list(self._excluded):
+            program_digest, beam_digest, sample_digest, analysis_digests = key[:4]
+            if (
+                beam_digest not in beam_digests
+                or sample_digest not in sample_digests
+                or (program_digest, analysis_digests) not in analyses_digests
+            ):
+                del self._excluded[key]
+
+    def createOptions(self, program, beam, sample, analyses):
+        return Options(program, beam, sample, analyses, self.builder.tags)
+
+    def isOptionsExcluded(self, options):
+        return self._digester.key(options) in self._excluded
+
+    def setOptionsExcluded(self, options, excluded=True):
+        """
+        Excludes, or includes back, options built from the components of
+        the builder, before their analyses are applied.
+        Excluded options are not returned by :meth:`iterOptions`.
+        """
+        key = self._digester.key(options)
+        if (key in self._excluded) == excluded:
+            return
+
+        if excluded:
+            self._excluded[key] = options
+        else:
+            del self._excluded[key]
+
+        self.excludedChanged.emit()
+        self.optionsChanged.emit()
+
+    def excludedCount(self):
+        return len(self._excluded)
+
+    def excludedOptions(self):
+        return list(self._excluded.values())
+
     def optionsList(self):
-        return self.builder.build()
+        return list(self.iterOptions())
+
+    def _snapshot_builder(self):
+        builder = OptionsBuilder(self.builder.tags)
+        builder.programs.extend(self.builder.programs)
+        builder.beams.extend(self.builder.beams)
+        builder.samples.extend(self.builder.samples)
+        builder.analyses.extend(self.builder.analyses)
+        return builder
 
     def iterOptions(self):
-        yield from self.builder.iterbuild()
+        """
+        Returns an iterator over the options, built one at a time.
+        The iterator is not affected by later changes of the model.
+        """
+        return self._iter_options(self._snapshot_builder(), set(self._excluded))
+
+    def _iter_options(self, builder, excluded):
+        # NOTE: Same options as OptionsBuilder.iterbuild(), but duplicates are
+        # found from the keys of the options, instead of comparing each
+        # options with all the options built so far
+        digester = OptionsDigester()
+        keys = set()
+
+        for program in builder.programs:
+            analysis_combinations = program.expander.expand_analyses(
+                builder.analyses
+            ) or [None]
+
+            product = itertools.product(
+                builder.beams, builder.samples, analysis_combinations
+            )
+            for beam, sample, analyses in product:
+                options = Options(program, beam, sample, analyses, builder.tags)
+                if excluded and digester.key(options) in excluded:
+                    continue
+
+                list_options = [options]
+                for analysis in list(options.analyses):
+                    list_options.extend(analysis.apply(options))
+
+                for options in list_options:
+                    key = digester.key(options)
+                    if key in keys:
+                        continue
+                    keys.add(key)
+                    yield options
+
+    def sweepOptions(self):
+        """
+        Returns a :class:`list` of options varying one component of the
+        builder at a time, along with the options required by their analyses.
+        The parameters varied across all the options of :meth:`iterOptions`
+        are the ones varied across these options.
+        """
+        builder = self._snapshot_builder()
+        if not builder.programs or not builder.beams or not builder.samples:
+            return []
+
+        program = builder.programs[0]
+        beam = builder.beams[0]
+        sample = builder.samples[0]
+        analyses = program.expander.expand_analyses(builder.analyses) or [None]
+
+        list_options = []
+        for other_program in builder.programs:
+            for other_analyses in other_program.expander.expand_analyses(
+                builder.analyses
+            ) or [None]:
+                list_options.append(
+                    Options(other_program, beam, sample, other_analyses, builder.tags)
+                )
+        for other_beam in builder.beams[1:]:
+            list_options.append(
+                Options(program, other_beam, sample, analyses[0], builder.tags)
+            )
+        for other_sample in builder.samples[1:]:
+            list_options.append(
+                Options(program, beam, other_sample, analyses[0], builder.tags)
+            )
+
+        for options in list(list_options):
+            for analysis in list(options.analyses):
+                list_options.extend(analysis.apply(options))
+
+        return list_options
 
     def optionsCount(self):
-        with estimated_builder(self.builder):
-            return len(self.builder)
+        """
+        Returns the estimated number of options: for each program,
+        the number of beams times the number of samples times the number of
+        analysis combinations, minus the excluded options.
+        A missing beam, sample or program counts as one.
+        """
+        analysis_combination_counts = [
+            len(combinations) for combinations in self._analysis_combinations
+        ] or [self._mock_analysis_combination_count]
+
+        beam_count = len(self.builder.beams) or 1
+        sample_count = len(self.builder.samples) or 1
+
+        count = beam_count * sample_count * sum(analysis_combination_counts)
+        return count - len(self._excluded)
 
 
 class OptionsField(SettingsBasedField):
@@ -137,6 +291,9 @@ class OptionsField(SettingsBasedField):
         return publish_html(builder).decode("utf8")
 
     def _create_widget(self):
+        # NOTE: Imported here since the web engine is slow to load
+        from qtpy import QtWebEngineWidgets
+
         widget = QtWebEngineWidgets.QWebEngineView()
         widget.setHtml(self._render_html())
         return widget
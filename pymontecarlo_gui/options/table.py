@@ -0,0 +1,316 @@
+""""""
+
+# Standard library modules.
+
+# Third party modules.
+from qtpy import QtCore, QtWidgets
+
+# Local modules.
+
+# Globals and constants variables.
+
+COLUMN_PROGRAM = 0
+COLUMN_BEAM = 1
+COLUMN_SAMPLE = 2
+COLUMN_ANALYSES = 3
+
+HEADERS = ["Program", "Beam", "Sample", "Analyses"]
+
+# NOTE: Options are the product of three factors: the analysis combinations of
+# each program, the beams and the samples
+FACTOR_ANALYSES = 0
+FACTOR_BEAM = 1
+FACTOR_SAMPLE = 2
+
+COLUMN_FACTORS = {
+    COLUMN_PROGRAM: FACTOR_ANALYSES,
+    COLUMN_BEAM: FACTOR_BEAM,
+    COLUMN_SAMPLE: FACTOR_SAMPLE,
+    COLUMN_ANALYSES: FACTOR_ANALYSES,
+}
+
+
+def _describe(obj):
+    if obj is None:
+        return ""
+    return repr(obj).strip("<>")
+
+
+class OptionsTableModel(QtCore.QAbstractTableModel):
+    """
+    Model of the options generated by an :class:`OptionsModel`.
+
+    Options are never all built. Each row is the combination of one value of
+    each factor (analysis combination of a program, beam and sample), found
+    from the row index, and its options are only built when needed.
+    Sorting and filtering are applied to the values of each factor, so they
+    do not depend on the number of options.
+    """
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+        # Variables
+        self._factors = [[], [], []]
+        self._texts = [[], [], []]  # Text of each value by column
+        self._indexes = [[], [], []]  # Filtered and sorted values of each factor
+        self._order = [FACTOR_ANALYSES, FACTOR_BEAM, FACTOR_SAMPLE]
+        self._sort_column = None
+        self._sort_order = QtCore.Qt.AscendingOrder
+        self._filters = {}
+
+        # Signals
+        model.beamsChanged.connect(self.refresh)
+        model.samplesChanged.connect(self.refresh)
+        model.analysesChanged.connect(self.refresh)
+        model.programsChanged.connect(self.refresh)
+        model.excludedChanged.connect(self._on_excluded_changed)
+
+        # Defaults
+        self.refresh()
+
+    def _on_excluded_changed(self):
+        if self.rowCount() == 0:
+            return
+
+        self.dataChanged.emit(
+            self.index(0, COLUMN_PROGRAM), self.index(self.rowCount() - 1, 0)
+        )
+
+    def _update_indexes(self):
+        for factor, texts in enumerate(self._texts):
+            indexes = range(len(texts))
+
+            for column, text in self._filters.items():
+                if COLUMN_FACTORS[column] != factor:
+                    continue
+                indexes = [
+                    index for index in indexes if text in texts[index][column].lower()
+                ]
+
+            indexes = list(indexes)
+
+            if (
+                self._sort_column is not None
+                and COLUMN_FACTORS[self._sort_column] == factor
+            ):
+                column = self._sort_column
+                indexes.sort(
+                    key=lambda index: texts[index][column],
+                    reverse=self._sort_order == QtCore.Qt.DescendingOrder,
+                )
+
+            self._indexes[factor] = indexes
+
+    def refresh(self):
+        self.beginResetModel()
+
+        builder = self.model.builder
+
+        pairs = [
+            (program, analyses)
+            for program, combinations in zip(
+                builder.programs, self.model.analysisCombinations()
+            )
+            for analyses in combinations
+        ]
+        self._factors = [pairs, list(builder.beams), list(builder.samples)]
+
+        self._texts = [
+            [
+                {
+                    COLUMN_PROGRAM: _describe(program),
+                    COLUMN_ANALYSES: ", ".join(map(_describe, analyses or ())),
+                }
+                for program, analyses in pairs
+            ],
+            [{COLUMN_BEAM: _describe(beam)} for beam in builder.beams],
+            [{COLUMN_SAMPLE: _describe(sample)} for sample in builder.samples],
+        ]
+
+        self._update_indexes()
+
+        self.endResetModel()
+
+    def _values(self, row):
+        values = [None] * len(self._factors)
+
+        for factor in reversed(self._order):
+            indexes = self._indexes[factor]
+            row, digit = divmod(row, len(indexes))
+            values[factor] = indexes[digit]
+
+        return values
+
+    def options(self, row):
+        """
+        Returns the options of a row.
+        """
+        index_analyses, index_beam, index_sample = self._values(row)
+        program, analyses = self._factors[FACTOR_ANALYSES][index_analyses]
+        beam = self._factors[FACTOR_BEAM][index_beam]
+        sample = self._factors[FACTOR_SAMPLE][index_sample]
+        return self.model.createOptions(program, beam, sample, analyses)
+
+    def rowCount(self, parent=None):
+        if parent is not None and parent.isValid():
+            return 0
+
+        count = 1
+        for indexes in self._indexes:
+            count *= len(indexes)
+        return count
+
+    def columnCount(self, parent=None):
+        return len(HEADERS)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = index.row()
+        column = index.column()
+        if row < 0 or row >= self.rowCount():
+            return None
+
+        if role == QtCore.Qt.DisplayRole:
+            factor = COLUMN_FACTORS[column]
+            value = self._values(row)[factor]
+            return self._texts[factor][value][column]
+
+        elif role == QtCore.Qt.CheckStateRole and column == COLUMN_PROGRAM:
+            if self.model.isOptionsExcluded(self.options(row)):
+                return QtCore.Qt.Unchecked
+            return QtCore.Qt.Checked
+
+        elif role == QtCore.Qt.UserRole:
+            return self.options(row)
+
+        return None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if not index.isValid() or role != QtCore.Qt.CheckStateRole:
+            return False
+
+        excluded = QtCore.Qt.CheckState(value) == QtCore.Qt.Unchecked
+        self.model.setOptionsExcluded(self.options(index.row()), excluded)
+        return True
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.column() == COLUMN_PROGRAM:
+            flags |= QtCore.Qt.ItemIsUserCheckable
+        return flags
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role != QtCore.Qt.DisplayRole:
+            return None
+
+        if orientation == QtCore.Qt.Horizontal:
+            return HEADERS[section]
+        else:
+            return str(section + 1)
+
+    def sort(self, column, order=QtCore.Qt.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+
+        # The factor of the sorted column varies the slowest
+        if column in COLUMN_FACTORS:
+            factor = COLUMN_FACTORS[column]
+            self._order.remove(factor)
+            self._order.insert(0, factor)
+        else:
+            column = None
+            self._order = [FACTOR_ANALYSES, FACTOR_BEAM, FACTOR_SAMPLE]
+
+        self._sort_column = column
+        self._sort_order = order
+        self._update_indexes()
+
+        self.layoutChanged.emit()
+
+    def setFilter(self, column, text):
+        """
+        Only shows the rows where the text of the *column* contains *text*,
+        ignoring case.
+        """
+        self.beginResetModel()
+
+        text = text.strip().lower()
+        if text:
+            self._filters[column] = text
+        else:
+            self._filters.pop(column, None)
+
+        self._update_indexes()
+
+        self.endResetModel()
+
+
+class OptionsTableWidget(QtWidgets.QWidget):
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+
+        # Widgets
+        self.cb_column = QtWidgets.QComboBox()
+        self.cb_column.addItems(HEADERS)
+
+        self.txt_filter = QtWidgets.QLineEdit()
+        self.txt_filter.setPlaceholderText("Filter")
+        self.txt_filter.setClearButtonEnabled(True)
+
+        self.lbl_count = QtWidgets.QLabel()
+
+        self.table_model = OptionsTableModel(model)
+
+        self.table = QtWidgets.QTableView()
+        self.table.setModel(self.table_model)
+        self.table.setSortingEnabled(True)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.horizontalHeader().setSectionResizeMode(
+            QtWidgets.QHeaderView.Interactive
+        )
+        self.table.horizontalHeader().setDefaultSectionSize(250)
+
+        # NOTE: Fixed row heights, so that the view does not measure every row
+        header = self.table.verticalHeader()
+        header.setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        header.setDefaultSectionSize(self.fontMetrics().height() + 8)
+
+        # Layouts
+        layout_filter = QtWidgets.QHBoxLayout()
+        layout_filter.addWidget(self.cb_column)
+        layout_filter.addWidget(self.txt_filter, 1)
+        layout_filter.addWidget(self.lbl_count)
+
+        layout = QtWidgets.QVBoxLayout()
+        layout.addLayout(layout_filter)
+        layout.addWidget(self.table)
+        self.setLayout(layout)
+
+        # Signals
+        self.cb_column.currentIndexChanged.connect(self._on_filter_changed)
+        self.txt_filter.textChanged.connect(self._on_filter_changed)
+        self.table_model.modelReset.connect(self._on_count_changed)
+        model.excludedChanged.connect(self._on_count_changed)
+
+        # Defaults
+        self._on_count_changed()
+
+    def _on_filter_changed(self):
+        column = self.cb_column.currentIndex()
+
+        for other_column in range(len(HEADERS)):
+            if other_column != column:
+                self.table_model.setFilter(other_column, "")
+
+        self.table_model.setFilter(column, self.txt_filter.text())
+
+    def _on_count_changed(self):
+        count = self.table_model.rowCount()
+        excluded_count = self.table_model.model.excludedCount()
+        text = "{:d} simulation(s)".format(count)
+        if excluded_count:
+            text += ", {:d} excluded".format(excluded_count)
+        self.lbl_count.setText(text)
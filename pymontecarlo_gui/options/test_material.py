@@ -8,16 +8,25 @@ import pytest
 from qtpy import QtCore, QtGui
 
 # Local modules.
+import pymontecarlo_gui.options.material as material_module
 from pymontecarlo_gui.options.material import (
     FormulaValidator,
     MaterialPureWidget,
     MaterialFormulaWidget,
     MaterialAdvancedWidget,
     MaterialListWidget,
+    parse_formula,
+    composition_density_kg_per_m3,
+    composition_name,
+    clear_composition_cache,
 )
 from pymontecarlo_gui.util.testutil import checkbox_click
 from pymontecarlo.options.material import Material
-from pymontecarlo.options.composition import generate_name, calculate_density_kg_per_m3
+from pymontecarlo.options.composition import (
+    generate_name,
+    calculate_density_kg_per_m3,
+    from_formula,
+)
 
 # Globals and constants variables.
 
@@ -48,6 +57,42 @@ def test_formula_validate_invalid(qtbot, formula_validator):
     assert pos == 1
 
 
+def test_parse_formula_cache(monkeypatch):
+    clear_composition_cache()
+
+    calls = []
+
+    def mock_from_formula(formula):
+        calls.append(formula)
+        return from_formula(formula)
+
+    monkeypatch.setattr(material_module, "from_formula", mock_from_formula)
+
+    composition = parse_formula("Al2O3")
+    assert composition == pytest.approx(from_formula("Al2O3"))
+    assert parse_formula("Al2O3") == composition
+    assert calls == ["Al2O3"]
+
+    with pytest.raises(ValueError):
+        parse_formula("A")
+    with pytest.raises(ValueError):
+        parse_formula("A")
+    assert calls == ["Al2O3", "A"]
+
+    clear_composition_cache()
+
+
+def test_composition_density_and_name():
+    composition = {8: 0.5, 13: 0.5}
+    assert composition_density_kg_per_m3(composition) == pytest.approx(
+        calculate_density_kg_per_m3(composition)
+    )
+    assert composition_name(composition) == generate_name(composition)
+
+    # Same normalized composition
+    assert composition_name({13: 0.5, 8: 0.5}) == generate_name(composition)
+
+
 @pytest.fixture
 def material_pure_widget(qtbot):
     return MaterialPureWidget()
@@ -0,0 +1,85 @@
+""""""
+
+# Standard library modules.
+
+# Third party modules.
+import pytest
+
+# Local modules.
+from pymontecarlo.settings import Settings
+from pymontecarlo.options import Material
+from pymontecarlo.options.beam import PencilBeam
+from pymontecarlo.options.sample import SubstrateSample
+from pymontecarlo.options.analysis import PhotonIntensityAnalysis, KRatioAnalysis
+from pymontecarlo.options.detector import PhotonDetector
+from pymontecarlo.mock import ProgramMock
+
+from pymontecarlo_gui.options.options import OptionsModel
+
+# Globals and constants variables.
+
+
+@pytest.fixture
+def model():
+    return OptionsModel(Settings())
+
+
+def test_options_count_empty(model):
+    assert model.optionsCount() == 1
+
+
+def test_options_count(model):
+    model.setBeams([PencilBeam(10e3), PencilBeam(15e3), PencilBeam(20e3)])
+    model.setSamples([SubstrateSample(Material.pure(z)) for z in [13, 29]])
+    model.setAnalyses(
+        [
+            PhotonIntensityAnalysis(PhotonDetector("det1", 0.61)),
+            PhotonIntensityAnalysis(PhotonDetector("det2", 0.71)),
+        ]
+    )
+    assert model.optionsCount() == 3 * 2 * 2
+
+    model.setPrograms([ProgramMock(), ProgramMock(number_trajectories=50)])
+    assert model.optionsCount() == 3 * 2 * 2 * 2
+    assert model.optionsCount() == len(model.optionsList())
+
+
+def test_excluded_kept(model):
+    model.setBeams([PencilBeam(10e3), PencilBeam(15e3), PencilBeam(20e3)])
+    model.setSamples([SubstrateSample(Material.pure(29))])
+    model.setPrograms([ProgramMock()])
+    model.setOptionsExcluded(model.optionsList()[2])
+
+    # Equal components built again
+    model.setBeams([PencilBeam(10e3), PencilBeam(20e3)])
+    assert model.excludedCount() == 1
+    assert [options.beam for options in model.iterOptions()] == [PencilBeam(10e3)]
+
+    model.setBeams([PencilBeam(10e3)])
+    assert model.excludedCount() == 0
+
+
+def test_iter_options_kratio(model):
+    model.setBeams([PencilBeam(10e3), PencilBeam(15e3)])
+    model.setSamples(
+        [SubstrateSample(Material.from_formula(formula)) for formula in ["CuZn", "Cu"]]
+    )
+    model.setAnalyses([KRatioAnalysis(PhotonDetector("det", 0.71))])
+    model.setPrograms([ProgramMock()])
+
+    list_options = list(model.iterOptions())
+    assert list_options == model.builder.build()
+
+
+def test_sweep_options(model):
+    model.setBeams([PencilBeam(10e3), PencilBeam(15e3), PencilBeam(20e3)])
+    model.setSamples([SubstrateSample(Material.pure(z)) for z in [13, 29]])
+    model.setPrograms([ProgramMock(), ProgramMock(number_trajectories=50)])
+
+    sweep_options = model.sweepOptions()
+    assert len(sweep_options) == 2 + 2 + 1
+
+    beams = [options.beam for options in sweep_options]
+    assert all(beam in beams for beam in model.builder.beams)
+    samples = [options.sample for options in sweep_options]
+    assert all(sample in samples for sample in model.builder.samples)
@@ -0,0 +1,99 @@
+""""""
+
+# Standard library modules.
+
+# Third party modules.
+import pytest
+from qtpy import QtCore
+
+# Local modules.
+from pymontecarlo.settings import Settings
+from pymontecarlo.options import Material
+from pymontecarlo.options.beam import PencilBeam
+from pymontecarlo.options.sample import SubstrateSample
+from pymontecarlo.mock import ProgramMock
+
+from pymontecarlo_gui.options.options import OptionsModel
+from pymontecarlo_gui.options.table import (
+    OptionsTableModel,
+    OptionsTableWidget,
+    COLUMN_PROGRAM,
+    COLUMN_BEAM,
+    COLUMN_SAMPLE,
+)
+
+# Globals and constants variables.
+
+
+@pytest.fixture
+def model():
+    model = OptionsModel(Settings())
+    model.setBeams([PencilBeam(energy_eV) for energy_eV in [10e3, 20e3, 15e3]])
+    model.setSamples([SubstrateSample(Material.pure(z)) for z in [29, 13]])
+    model.setPrograms([ProgramMock()])
+    return model
+
+
+@pytest.fixture
+def table_model(qtbot, model):
+    return OptionsTableModel(model)
+
+
+def _energies(table_model):
+    return [
+        table_model.options(row).beam.energy_eV for row in range(table_model.rowCount())
+    ]
+
+
+def test_options_table_model(table_model, model):
+    assert table_model.rowCount() == 6
+
+    list_options = [table_model.options(row) for row in range(6)]
+    for options in model.optionsList():
+        assert options in list_options
+
+    index = table_model.index(0, COLUMN_BEAM)
+    assert "10000 eV" in table_model.data(index)
+
+
+def test_options_table_model_sort(table_model):
+    table_model.sort(COLUMN_BEAM, QtCore.Qt.DescendingOrder)
+    assert _energies(table_model) == [20e3, 20e3, 15e3, 15e3, 10e3, 10e3]
+
+
+def test_options_table_model_filter(table_model):
+    table_model.setFilter(COLUMN_SAMPLE, "copper")
+    assert table_model.rowCount() == 3
+
+    table_model.setFilter(COLUMN_BEAM, "20000")
+    assert table_model.rowCount() == 1
+
+    table_model.setFilter(COLUMN_SAMPLE, "")
+    assert table_model.rowCount() == 2
+
+
+def test_options_table_model_exclude(table_model, model):
+    index = table_model.index(1, COLUMN_PROGRAM)
+    options = table_model.options(1)
+    assert table_model.data(index, QtCore.Qt.CheckStateRole) == QtCore.Qt.Checked
+
+    table_model.setData(index, QtCore.Qt.Unchecked, QtCore.Qt.CheckStateRole)
+    assert table_model.data(index, QtCore.Qt.CheckStateRole) == QtCore.Qt.Unchecked
+    assert model.optionsCount() == 5
+    assert options not in model.optionsList()
+
+    # Exclusion is kept if the components remain
+    model.setBeams([PencilBeam(energy_eV) for energy_eV in [10e3, 20e3, 15e3, 5e3]])
+    assert model.optionsCount() == 7
+
+    model.setSamples([SubstrateSample(Material.pure(79))])
+    assert model.optionsCount() == 4
+
+
+def test_options_table_widget(qtbot, model):
+    widget = OptionsTableWidget(model)
+    qtbot.addWidget(widget)
+
+    widget.cb_column.setCurrentIndex(COLUMN_SAMPLE)
+    widget.txt_filter.setText("alumin")
+    assert widget.table_model.rowCount() == 3
@@ -0,0 +1,209 @@
+""""""
+
+# Standard library modules.
+import os
+import asyncio
+import threading
+
+# Third party modules.
+import pytest
+
+# Local modules.
+from pymontecarlo.options import Options, Material
+from pymontecarlo.options.beam import PencilBeam
+from pymontecarlo.options.sample import SubstrateSample
+from pymontecarlo.mock import ProgramMock, ExporterMock
+from pymontecarlo.util.error import ErrorAccumulator
+
+from pymontecarlo_gui.options import validation
+from pymontecarlo_gui.options.validation import (
+    validate_options,
+    validate_options_list,
+    ValidationCache,
+    DryRunDirectory,
+)
+
+# Globals and constants variables.
+
+
+def _iter_options(energies_eV):
+    for energy_eV in energies_eV:
+        yield Options(
+            ProgramMock(), PencilBeam(energy_eV), SubstrateSample(Material.pure(29)), []
+        )
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 3, 16])
+def test_validate_options_list(max_concurrency):
+    energies_eV = [10e3, -1.0, 15e3, -2.0, 20e3]
+    counts = []
+
+    erraccs = asyncio.run(
+        validate_options_list(
+            _iter_options(energies_eV),
+            callback=counts.append,
+            max_concurrency=max_concurrency,
+        )
+    )
+
+    assert counts == [1, 2, 3, 4, 5]
+    assert list(erraccs) == ["mock"]
+    assert len(erraccs["mock"].exceptions) == 4  # Two errors per options
+
+
+def test_validate_options_list_cache(monkeypatch):
+    list_options = list(_iter_options([10e3, -1.0, 15e3]))
+    cache = ValidationCache()
+
+    erraccs = asyncio.run(validate_options_list(list_options, cache=cache))
+    assert len(cache) == 3
+    assert len(erraccs["mock"].exceptions) == 2
+
+    # Cached options are not exported again
+    async def validate_options(options, erracc, directory=None):
+        raise AssertionError
+
+    monkeypatch.setattr(validation, "validate_options", validate_options)
+
+    counts = []
+    erraccs = asyncio.run(
+        validate_options_list(list_options, callback=counts.append, cache=cache)
+    )
+    assert counts == [1, 2, 3]
+    assert len(erraccs["mock"].exceptions) == 2
+
+
+def test_validation_cache_max_size():
+    list_options = list(_iter_options([10e3, 15e3, 20e3]))
+    cache = ValidationCache(max_size=2)
+
+    erracc = ErrorAccumulator()
+    cache.add(list_options[0], erracc)
+    cache.add(list_options[1], erracc)
+    assert cache.get(list_options[0]) is not None
+
+    # Least recently used options discarded
+    cache.add(list_options[2], erracc)
+    assert len(cache) == 2
+    assert cache.get(list_options[0]) is not None
+    assert cache.get(list_options[1]) is None
+
+
+def test_validation_cache_equal_options():
+    cache = ValidationCache()
+    erracc = ErrorAccumulator()
+    erracc.add_exception(ValueError("Invalid"))
+
+    # Removed components do not affect the other options
+    list_options = list(_iter_options([10e3, 15e3, 20e3, 25e3]))
+    for options in list_options:
+        cache.add(options, erracc)
+
+    for options in _iter_options([10e3, 25e3]):
+        exceptions, _warnings = cache.get(options)
+        assert len(exceptions) == 1
+
+    assert cache.get(next(_iter_options([30e3]))) is None
+
+
+def test_validate_options_list_max_errors():
+    energies_eV = [-1.0, -2.0, -3.0, 10e3, 15e3]
+    counts = []
+
+    erraccs = asyncio.run(
+        validate_options_list(
+            _iter_options(energies_eV),
+            callback=counts.append,
+            max_concurrency=1,
+            max_errors=4,
+        )
+    )
+
+    assert counts == [1, 2]
+    assert len(erraccs["mock"].exceptions) == 4
+
+
+def test_validate_options_list_stop_event():
+    stop_event = threading.Event()
+    counts = []
+
+    def callback(count):
+        counts.append(count)
+        stop_event.set()
+
+    asyncio.run(
+        validate_options_list(
+            _iter_options([10e3, 15e3, 20e3]),
+            callback=callback,
+            max_concurrency=1,
+            stop_event=stop_event,
+        )
+    )
+
+    assert counts == [1]
+
+
+class ExporterListingMock(ExporterMock):
+    async def _export(self, options, dirpath, erracc, dry_run=False):
+        os.listdir(dirpath)
+        await super()._export(options, dirpath, erracc, dry_run)
+
+
+class ProgramListingMock(ProgramMock):
+    @property
+    def exporter(self):
+        return ExporterListingMock()
+
+
+class ExporterMakedirsMock(ExporterMock):
+    async def _export(self, options, dirpath, erracc, dry_run=False):
+        os.makedirs(dirpath, exist_ok=True)
+        await super()._export(options, dirpath, erracc, dry_run)
+
+
+class ProgramMakedirsMock(ProgramMock):
+    @property
+    def exporter(self):
+        return ExporterMakedirsMock()
+
+
+def test_validate_options_virtual_directory():
+    options = next(_iter_options([-1.0]))
+    erracc = ErrorAccumulator()
+
+    with DryRunDirectory() as directory:
+        asyncio.run(validate_options(options, erracc, directory))
+
+        assert directory.virtual
+        assert not os.path.exists(directory.dirpath)
+        assert len(erracc.exceptions) == 2
+
+
+def test_validate_options_fallback_directory():
+    options = next(_iter_options([-1.0]))
+    options.program = ProgramListingMock()
+    erracc = ErrorAccumulator()
+
+    with DryRunDirectory() as directory:
+        asyncio.run(validate_options(options, erracc, directory))
+
+        assert not directory.virtual
+        assert os.path.isdir(directory.dirpath)
+        assert len(erracc.exceptions) == 2
+
+    assert not os.path.exists(directory.dirpath)
+
+
+def test_validate_options_makedirs_directory():
+    options = next(_iter_options([-1.0]))
+    options.program = ProgramMakedirsMock()
+    erracc = ErrorAccumulator()
+
+    with DryRunDirectory() as directory:
+        asyncio.run(validate_options(options, erracc, directory))
+
+        assert directory.virtual
+        assert os.path.isdir(directory.dirpath)
+
+    assert not os.path.exists(directory.dirpath)
+    assert not os.path.exists(os.path.dirname(directory.dirpath))
@@ -0,0 +1,234 @@
+""""""
+
+# Standard library modules.
+import os
+import asyncio
+import tempfile
+import collections
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.util.error import ErrorAccumulator
+
+from pymontecarlo_gui.util.fingerprint import OptionsDigester
+
+# Globals and constants variables.
+
+MAX_CONCURRENT_VALIDATIONS = 16
+MAX_CACHED_VALIDATIONS = 10000
+
+
+class ValidationCache:
+    """
+    Errors and warnings of validated options, by the keys of the options,
+    see :class:`OptionsDigester`.
+
+    Equal options are only validated once, even if they are built from
+    other component objects, e.g. when a field is edited.
+    At most *max_size* options are kept, the least recently used being
+    discarded first.
+    """
+
+    def __init__(self, max_size=MAX_CACHED_VALIDATIONS):
+        self.max_size = max_size
+        self._digester = OptionsDigester()
+        self._entries = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, options):
+        """
+        Returns the exceptions and warnings of the options, or ``None`` if
+        the options were not validated.
+        """
+        key = self._digester.key(options)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        self._entries.move_to_end(key)
+        return entry
+
+    def add(self, options, erracc):
+        key = self._digester.key(options)
+        self._entries[key] = (erracc.exceptions, erracc.warnings)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self._digester.clear()
+
+
+class DryRunDirectory:
+    """
+    Output directory of dry-run exports.
+
+    Exporters do not write any file in dry-run mode, so the directory is
+    only a path, which is not created, inside an empty temporary directory.
+    For an exporter that still accesses its output directory,
+    :meth:`fallback` returns the temporary directory itself.
+    Anything an exporter creates is removed with the temporary directory
+    by :meth:`close`.
+    """
+
+    def __init__(self):
+        self._tmpdir = tempfile.TemporaryDirectory(prefix="pymontecarlo-dryrun-")
+        self.dirpath = os.path.join(self._tmpdir.name, "output")
+        self._virtual = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def fallback(self):
+        """
+        Returns the path of the temporary directory, used as output directory
+        from now on.
+        """
+        self._virtual = False
+        self.dirpath = self._tmpdir.name
+        return self.dirpath
+
+    def close(self):
+        self._tmpdir.cleanup()
+
+    @property
+    def virtual(self):
+        return self._virtual
+
+
+def _merge(erracc, exceptions, warnings):
+    for exception in exceptions:
+        erracc.add_exception(exception)
+    for warning in warnings:
+        erracc.add_warning(warning)
+
+
+async def validate_options(options, erracc, directory=None):
+    """
+    Validates the options by exporting them in dry-run mode.
+    Errors and warnings are added to the error accumulator *erracc*.
+    The same :class:`DryRunDirectory` can be used to validate several options.
+    """
+    if directory is None:
+        with DryRunDirectory() as directory:
+            await validate_options(options, erracc, directory)
+        return
+
+    exporter = options.program.exporter
+
+    if not directory.virtual:
+        await exporter._export(options, directory.dirpath, erracc, dry_run=True)
+        return
+
+    options_erracc = ErrorAccumulator()
+    try:
+        await exporter._export(options, directory.dirpath, options_erracc, dry_run=True)
+    except OSError:
+        await exporter._export(options, directory.fallback(), erracc, dry_run=True)
+    else:
+        _merge(erracc, options_erracc.exceptions, options_erracc.warnings)
+
+
+async def validate_options_list(
+    iterable_options,
+    erraccs=None,
+    callback=None,
+    max_concurrency=MAX_CONCURRENT_VALIDATIONS,
+    cache=None,
+    stop_event=None,
+    max_errors=None,
+):
+    """
+    Validates each options of the iterable, at most *max_concurrency* at a time.
+    Returns a :class:`dict` of :class:`ErrorAccumulator` by program name.
+    The *callback*, if specified, is called with the number of validated options
+    after each options.
+    If a :class:`ValidationCache` is specified, options already validated are
+    skipped and their cached errors and warnings are reported instead.
+
+    The validation stops, without raising an exception, when the
+    :class:`threading.Event` *stop_event* is set or, if *max_errors* is
+    specified, once this number of errors is found. The options being
+    validated are then cancelled.
+    """
+    if erraccs is None:
+        erraccs = {}
+
+    count = 0
+    pending = set()
+
+    def report():
+        nonlocal count
+        count += 1
+        if callback is not None:
+            callback(count)
+
+    async def validate(options, erracc, directory):
+        if cache is None:
+            await validate_options(options, erracc, directory)
+            return
+
+        options_erracc = ErrorAccumulator()
+        await validate_options(options, options_erracc, directory)
+        cache.add(options, options_erracc)
+        _merge(erracc, options_erracc.exceptions, options_erracc.warnings)
+
+    def should_stop():
+        if stop_event is not None and stop_event.is_set():
+            return True
+
+        if max_errors is not None:
+            error_count = sum(len(erracc.exceptions) for erracc in erraccs.values())
+            if error_count >= max_errors:
+                return True
+
+        return False
+
+    async def wait(return_when):
+        nonlocal pending
+        done, pending = await asyncio.wait(pending, return_when=return_when)
+
+        for task in done:
+            task.result()  # Raise exception, if any
+            report()
+
+    # NOTE: The iterable is consumed progressively since it may be a generator
+    # of a large number of options
+    with DryRunDirectory() as directory:
+        try:
+            for options in iterable_options:
+                if should_stop():
+                    break
+
+                erracc = erraccs.setdefault(options.program.name, ErrorAccumulator())
+
+                cached = cache.get(options) if cache is not None else None
+                if cached is not None:
+                    _merge(erracc, *cached)
+                    report()
+                    continue
+
+                task = asyncio.ensure_future(validate(options, erracc, directory))
+                pending.add(task)
+
+                if len(pending) >= max_concurrency:
+                    await wait(asyncio.FIRST_COMPLETED)
+
+            if pending and not should_stop():
+                await wait(asyncio.ALL_COMPLETED)
+
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    return erraccs
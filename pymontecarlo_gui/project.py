@@ -9,10 +9,6 @@ from qtpy import QtCore, QtGui
 # Local modules.
 from pymontecarlo_gui.widgets.field import FieldBase
 from pymontecarlo_gui.widgets.icon import load_icon
-from pymontecarlo_gui.results.summary import (
-    ResultSummaryTableWidget,
-    ResultSummaryFigureWidget,
-)
 from pymontecarlo_gui.settings import SettingsBasedField
 
 # Globals and constants variables.
@@ -59,6 +55,8 @@ class ProjectSummaryTableField(ProjectDerivedField):
         return load_icon("table.svg")
 
     def _create_widget(self):
+        from pymontecarlo_gui.results.summary import ResultSummaryTableWidget
+
         widget = ResultSummaryTableWidget(self.settings())
         widget.setProject(self.project())
         return widget
@@ -86,6 +84,8 @@ class ProjectSummaryFigureField(ProjectDerivedField):
         return load_icon("figure.svg")
 
     def _create_widget(self):
+        from pymontecarlo_gui.results.summary import ResultSummaryFigureWidget
+
         widget = ResultSummaryFigureWidget(self.settings())
         widget.setProject(self.project())
         return widget
@@ -6,8 +6,7 @@ import io
 import functools
 
 # Third party modules.
-from qtpy import QtCore, QtGui, QtWidgets, QtWebEngineWidgets
-import xlsxwriter
+from qtpy import QtCore, QtGui, QtWidgets
 
 # Local modules.
 from pymontecarlo_gui.settings import SettingsBasedField
@@ -35,6 +34,9 @@ class ResultWidgetBase(QtWidgets.QWidget):
 
 class ResultTableWidgetBase(ResultWidgetBase):
     def __init__(self, result, settings, parent=None):
+        # NOTE: Imported here since the web engine is slow to load
+        from qtpy import QtWebEngineWidgets
+
         super().__init__(result, settings, parent)
 
         # Actions
@@ -134,6 +136,8 @@ class ResultTableWidgetBase(ResultWidgetBase):
             writer.writerows(data)
 
     def _save_xlsx(self, filepath):
+        import xlsxwriter
+
         data = self._get_data()
         workbook = xlsxwriter.Workbook(filepath)
 
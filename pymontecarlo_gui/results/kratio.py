@@ -21,9 +21,9 @@ class KRatioResultWidget(ResultTableWidgetBase):
 class KRatioResultField(ResultFieldBase):
     def __init__(self, result, settings):
         super().__init__(result, settings)
-
-        # Widgets
-        self._widget = KRatioResultWidget(result, settings)
+        self._widget = None
 
     def widget(self):
+        if self._widget is None:
+            self._widget = KRatioResultWidget(self.result(), self.settings())
         return self._widget
@@ -19,9 +19,9 @@ class PhotonIntensityResultWidget(ResultTableWidgetBase):
 class PhotonIntensityResultField(ResultFieldBase):
     def __init__(self, result, settings):
         super().__init__(result, settings)
-
-        # Widgets
-        self._widget = PhotonIntensityResultWidget(result, settings)
+        self._widget = None
 
     def widget(self):
+        if self._widget is None:
+            self._widget = PhotonIntensityResultWidget(self.result(), self.settings())
         return self._widget
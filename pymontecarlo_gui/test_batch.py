@@ -0,0 +1,97 @@
+""""""
+
+# Standard library modules.
+import io
+import json
+import asyncio
+
+# Third party modules.
+import pytest
+
+# Local modules.
+from pymontecarlo.settings import Settings
+from pymontecarlo.project import Project
+import pymontecarlo.mock  # Register ProgramMock
+
+from pymontecarlo_gui.batch import load_sweep, run_batch, main
+
+# Globals and constants variables.
+
+SWEEP = {
+    "materials": {"alumina": {"formula": "Al2O3", "density_g_per_cm3": 3.95}},
+    "samples": [
+        {"type": "substrate", "material": ["Cu", "alumina"]},
+        {
+            "type": "horizontal_layers",
+            "substrate_material": "Cu",
+            "layers": [{"material": "alumina", "thickness_m": [10e-9, 20e-9]}],
+        },
+    ],
+    "beams": [{"type": "pencil", "energy_keV": [10.0, 15.0]}],
+    "analyses": [
+        {"type": "photon_intensity", "photon_detector": {"elevation_deg": 40.0}}
+    ],
+    "programs": [{"type": "ProgramMock", "number_trajectories": 50}],
+}
+
+
+@pytest.fixture
+def sweepfilepath(tmp_path):
+    filepath = tmp_path.joinpath("sweep.json")
+    filepath.write_text(json.dumps(SWEEP))
+    return filepath
+
+
+def test_load_sweep():
+    model = load_sweep(SWEEP, Settings())
+
+    assert len(model.builder.samples) == 4
+    assert len(model.builder.beams) == 2
+    assert len(model.builder.analyses) == 1
+    assert len(model.builder.programs) == 1
+    assert model.optionsCount() == 8
+
+    materials = model.builder.samples[1].materials
+    assert materials[0].name == "alumina"
+    assert materials[0].density_kg_per_m3 == pytest.approx(3950.0)
+
+
+def test_load_sweep_unknown_parameter():
+    sweep = {"beams": [{"type": "pencil", "energy_GeV": 1.0}]}
+    with pytest.raises(ValueError):
+        load_sweep(sweep, Settings())
+
+
+def test_load_sweep_unknown_program():
+    sweep = {"programs": [{"type": "FooProgram"}]}
+    with pytest.raises(ValueError):
+        load_sweep(sweep, Settings())
+
+
+def test_run_batch(tmp_path):
+    sweep = dict(SWEEP, samples=SWEEP["samples"][:1], beams=[SWEEP["beams"][0]])
+    model = load_sweep(sweep, Settings())
+    filepath = tmp_path.joinpath("project.mcsim")
+    stream = io.StringIO()
+
+    returncode = asyncio.run(run_batch(model, filepath, max_workers=2, stream=stream))
+    assert returncode == 0
+
+    project = Project.read(filepath)
+    assert len(project.simulations) == 4
+
+    output = stream.getvalue()
+    assert "Validating 4 simulation(s)" in output
+    assert "Submitted 4 simulation(s)" in output
+    assert "Project saved" in output
+
+
+def test_main_dry_run(sweepfilepath, tmp_path, capsys):
+    filepath = tmp_path.joinpath("project.mcsim")
+
+    returncode = main(["--dry-run", str(sweepfilepath), str(filepath)])
+    assert returncode == 0
+    assert not filepath.exists()
+
+    captured = capsys.readouterr()
+    assert "Validating 8 simulation(s)" in captured.out
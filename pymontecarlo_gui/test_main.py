@@ -0,0 +1,187 @@
+""""""
+
+# Standard library modules.
+import os
+import sys
+import json
+import asyncio
+import subprocess
+import textwrap
+
+# Third party modules.
+import pytest
+from qtpy import QtWidgets
+import qasync
+
+# Local modules.
+from pymontecarlo.options import Options, Material
+from pymontecarlo.options.beam import PencilBeam
+from pymontecarlo.options.sample import SubstrateSample
+from pymontecarlo.project import Project
+from pymontecarlo.simulation import Simulation
+from pymontecarlo.mock import ProgramMock
+
+import pymontecarlo_gui.main
+from pymontecarlo_gui.main import MainWindow
+from pymontecarlo_gui.util.checkpoint import (
+    MARKER_FILENAME,
+    find_checkpoint,
+    UNTITLED_CHECKPOINT_FILENAME,
+)
+
+# Globals and constants variables.
+
+IMPORT_TIME_BUDGET_s = 5.0
+
+HEAVY_MODULES = [
+    "matplotlib.figure",
+    "matplotlib.pyplot",
+    "matplotlib.backends.backend_qt5agg",
+    "matplotlib_scalebar",
+    "xlsxwriter",
+    "qtpy.QtWebEngineWidgets",
+    "pymontecarlo_gui.newsimulation",
+    "pymontecarlo_gui.results.summary",
+]
+
+
+def _import_in_subprocess(module):
+    code = textwrap.dedent("""
+        import sys
+        import json
+        import time
+
+        start = time.perf_counter()
+        import {module}
+        duration_s = time.perf_counter() - start
+
+        json.dump({{"duration_s": duration_s, "modules": list(sys.modules)}}, sys.stdout)
+        """.format(module=module))
+
+    process = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return json.loads(process.stdout)
+
+
+@pytest.mark.parametrize(
+    "module", ["pymontecarlo_gui.__main__", "pymontecarlo_gui.main"]
+)
+def test_import_heavy_modules_deferred(module):
+    outcome = _import_in_subprocess(module)
+
+    loaded = set(outcome["modules"]).intersection(HEAVY_MODULES)
+    assert not loaded
+
+
+def test_import_time_budget():
+    outcome = _import_in_subprocess("pymontecarlo_gui.__main__")
+    assert outcome["duration_s"] < IMPORT_TIME_BUDGET_s
+
+
+@pytest.fixture
+def loop(qapp):
+    loop = qasync.QEventLoop(qapp)
+    asyncio.set_event_loop(loop)
+    yield loop
+    asyncio.set_event_loop(None)
+    loop.close()
+
+
+@pytest.fixture
+def checkpoint(tmp_path, monkeypatch):
+    monkeypatch.setattr(pymontecarlo_gui.main, "get_config_dir", lambda: str(tmp_path))
+
+    options = Options(
+        ProgramMock(), PencilBeam(10e3), SubstrateSample(Material.pure(29)), []
+    )
+    project = Project()
+    project.simulations.append(Simulation(options, [], "sim1"))
+
+    checkpoint_filepath = str(tmp_path.joinpath(UNTITLED_CHECKPOINT_FILENAME))
+    project.write(checkpoint_filepath)
+
+    marker_filepath = str(tmp_path.joinpath(MARKER_FILENAME))
+    with open(marker_filepath, "w") as fp:
+        json.dump({"checkpoint": checkpoint_filepath, "project": None}, fp)
+
+    return checkpoint_filepath, marker_filepath
+
+
+def _run_startup(qtbot, loop, monkeypatch, checkpoint, answer):
+    prompted = []
+
+    def question(*args):
+        # Nothing discarded before the user answers
+        prompted.append(all(os.path.exists(filepath) for filepath in checkpoint))
+        return answer
+
+    monkeypatch.setattr(QtWidgets.QMessageBox, "question", question)
+
+    window = MainWindow()
+    qtbot.addWidget(window)
+    qtbot.waitUntil(lambda: bool(prompted))
+    assert prompted == [True]
+
+    return window
+
+
+def _shutdown(loop, window):
+    loop.run_until_complete(window._runner.cancel())
+    loop.run_until_complete(window._runner.shutdown())
+    window.checkpointer.discard()
+    window.checkpointer.wait()
+
+
+def test_startup_restore_checkpoint(qtbot, loop, monkeypatch, checkpoint):
+    window = _run_startup(
+        qtbot, loop, monkeypatch, checkpoint, QtWidgets.QMessageBox.Yes
+    )
+
+    qtbot.waitUntil(lambda: len(window.project().simulations) == 1)
+    qtbot.waitUntil(lambda: not window.checkpointer.isRunning())
+
+    # Restored simulations checkpointed again
+    checkpoint_filepath, marker_filepath = checkpoint
+    assert os.path.exists(marker_filepath)
+    assert len(Project.read(checkpoint_filepath).simulations) == 1
+
+    _shutdown(loop, window)
+
+
+def test_startup_decline_checkpoint(qtbot, loop, monkeypatch, checkpoint):
+    window = _run_startup(
+        qtbot, loop, monkeypatch, checkpoint, QtWidgets.QMessageBox.No
+    )
+
+    assert not any(os.path.exists(filepath) for filepath in checkpoint)
+    assert not window.project().simulations
+
+    _shutdown(loop, window)
+
+
+def test_startup_restore_checkpoint_failed(qtbot, loop, monkeypatch, checkpoint):
+    checkpoint_filepath, marker_filepath = checkpoint
+    with open(checkpoint_filepath, "w") as fp:
+        fp.write("invalid")
+
+    errors = []
+    monkeypatch.setattr(
+        pymontecarlo_gui.main.messagebox,
+        "exception",
+        lambda parent, ex: errors.append(ex),
+    )
+
+    window = _run_startup(
+        qtbot, loop, monkeypatch, checkpoint, QtWidgets.QMessageBox.Yes
+    )
+    qtbot.waitUntil(lambda: bool(errors))
+    qtbot.wait(100)
+
+    # Proposed again at the next start
+    assert find_checkpoint(os.path.dirname(marker_filepath)) == (
+        checkpoint_filepath,
+        None,
+    )
+
+    _shutdown(loop, window)
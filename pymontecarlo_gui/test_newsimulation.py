@@ -0,0 +1,41 @@
+""""""
+
+# Standard library modules.
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.settings import Settings
+from pymontecarlo.options import Material
+from pymontecarlo.options.beam import PencilBeam
+from pymontecarlo.options.sample import SubstrateSample
+from pymontecarlo.mock import ProgramMock
+
+from pymontecarlo_gui.options.options import OptionsModel
+from pymontecarlo_gui.newsimulation import ValidationWizardPage
+
+# Globals and constants variables.
+
+
+def test_validation_max_errors(qtbot):
+    model = OptionsModel(Settings())
+    model.setBeams([PencilBeam(-1.0 - i) for i in range(50)])
+    model.setSamples([SubstrateSample(Material.pure(29))])
+    model.setPrograms([ProgramMock()])
+
+    page = ValidationWizardPage(model)
+    qtbot.addWidget(page)
+
+    def error_count():
+        return sum(len(erracc.exceptions) for erracc in page._thread.erraccs.values())
+
+    page.spinbox_max_errors.setValue(2)
+    with qtbot.waitSignal(page._thread.finished, timeout=10000):
+        page._on_page_loaded()
+    assert error_count() < 50 * 2  # Two errors per options
+
+    # No limit
+    with qtbot.waitSignal(page._thread.finished, timeout=10000):
+        page.spinbox_max_errors.setValue(0)
+    assert error_count() == 50 * 2
+    assert not page.isComplete()
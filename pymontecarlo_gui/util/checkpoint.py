@@ -0,0 +1,316 @@
+""""""
+
+# Standard library modules.
+import os
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Third party modules.
+from qtpy import QtCore
+
+# Local modules.
+from pymontecarlo.project import Project
+from pymontecarlo.simulation import Simulation
+
+from pymontecarlo_gui.util.writer import write_project
+from pymontecarlo_gui.widgets.dialog import ExecutionThread
+
+# Globals and constants variables.
+
+CHECKPOINT_EXTENSION = ".checkpoint"
+UNTITLED_CHECKPOINT_FILENAME = "untitled.mcsim" + CHECKPOINT_EXTENSION
+MARKER_FILENAME = "checkpoint.json"
+
+
+def find_checkpoint(dirpath):
+    """
+    Returns the path of the checkpoint file left by a previous session and
+    the path of its project file (``None`` for an unsaved project),
+    or ``None`` if there is no checkpoint.
+    """
+    marker_filepath = os.path.join(dirpath, MARKER_FILENAME)
+    if not os.path.exists(marker_filepath):
+        return None
+
+    try:
+        with open(marker_filepath, "r") as fp:
+            marker = json.load(fp)
+        checkpoint_filepath = marker["checkpoint"]
+        project_filepath = marker["project"]
+    except (OSError, ValueError, KeyError):
+        logger.exception("Invalid checkpoint marker")
+        return None
+
+    if not os.path.exists(checkpoint_filepath):
+        return None
+
+    return checkpoint_filepath, project_filepath
+
+
+def _remove_files(filepaths):
+    for filepath in filepaths:
+        if filepath and os.path.exists(filepath):
+            os.remove(filepath)
+
+
+class CheckpointCancelled(Exception):
+    pass
+
+
+def remove_checkpoint(dirpath, checkpoint_filepath):
+    """
+    Removes the checkpoint file left by a previous session and its marker,
+    e.g. when the user declines to restore it.
+    """
+    _remove_files([checkpoint_filepath, os.path.join(dirpath, MARKER_FILENAME)])
+
+
+class Checkpointer(QtCore.QObject):
+    """
+    Writes the simulations not saved yet in a checkpoint file, after
+    *simulation_count* new simulations or *interval_s* seconds after the first
+    one. The checkpoint is written next to the project file or, for an unsaved
+    project, in *dirpath*, where a marker file also records
+    the checkpoint location for :func:`find_checkpoint`.
+    Writing is done in a thread and each checkpoint only appends the simulations
+    added since the previous one.
+    The marker of a previous session is only replaced once a checkpoint is
+    written, so that it remains available until its simulations are restored.
+    A checkpoint being written when it is discarded is cancelled and
+    its file removed once the thread finishes, without blocking.
+    """
+
+    checkpointed = QtCore.Signal(str)
+
+    def __init__(self, dirpath, simulation_count=10, interval_s=300, parent=None):
+        super().__init__(parent)
+
+        # Variables
+        self._dirpath = dirpath
+        self._simulation_count = simulation_count
+        self._project = None
+        self._pending = {}  # Simulations not in checkpoint by identifier
+        self._filepath = None  # Current checkpoint file
+        self._thread = None
+        self._cancel_event = None
+        self._discarded_thread = None  # Thread of a discarded checkpoint
+        self._discarded_filepaths = []  # Removed once it finishes
+        self._writing = {}  # Simulations being written by identifier
+        self._marker_written = False
+        self._restored_filepath = None  # Checkpoint of a previous session
+
+        # Timers
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(int(interval_s * 1000))
+
+        # Signals
+        self.timer.timeout.connect(self.checkpoint)
+
+    def _checkpoint_filepath(self):
+        if self._project is not None and self._project.filepath:
+            return self._project.filepath + CHECKPOINT_EXTENSION
+        return os.path.join(self._dirpath, UNTITLED_CHECKPOINT_FILENAME)
+
+    def _marker_filepath(self):
+        return os.path.join(self._dirpath, MARKER_FILENAME)
+
+    def _write_marker(self):
+        marker = {"checkpoint": self._filepath, "project": self._project.filepath}
+        with open(self._marker_filepath(), "w") as fp:
+            json.dump(marker, fp)
+        self._marker_written = True
+
+    def _take_restored(self):
+        """
+        Returns the files of the checkpoint of a previous session to remove.
+        """
+        filepath = self._restored_filepath
+        self._restored_filepath = None
+
+        if not filepath:
+            return []
+
+        filepaths = []
+        if filepath != self._filepath:
+            filepaths.append(filepath)
+
+        # Marker of the previous session
+        if not self._marker_written:
+            filepaths.append(self._marker_filepath())
+
+        return filepaths
+
+    def _remove_restored(self):
+        _remove_files(self._take_restored())
+
+    def _schedule(self):
+        if len(self._pending) >= self._simulation_count:
+            self.checkpoint()
+        elif self._pending and not self.timer.isActive():
+            self.timer.start()
+
+    def _is_stale(self, thread):
+        # NOTE: Signal of a thread already handled by wait()
+        sender = self.sender()
+        return sender is not None and sender is not thread
+
+    def _on_discarded_thread_finished(self):
+        if self._is_stale(self._discarded_thread):
+            return
+
+        self._discarded_thread = None
+        _remove_files(self._discarded_filepaths)
+        self._discarded_filepaths = []
+
+        # Simulations added since the checkpoint was discarded
+        self._schedule()
+
+    def _on_thread_finished(self):
+        if self._is_stale(self._thread):
+            return
+
+        thread = self._thread
+        self._thread = None
+
+        writing = self._writing
+        self._writing = {}
+
+        if thread.result is None:  # Failed, written again at next checkpoint
+            logger.error("Checkpoint of %s failed", self._filepath)
+            for identifier, simulation in writing.items():
+                self._pending.setdefault(identifier, simulation)
+            self.timer.start()
+            return
+
+        self._write_marker()
+        if not self._pending:
+            self._remove_restored()
+        logger.debug("Checkpoint written in %s", self._filepath)
+        self.checkpointed.emit(self._filepath)
+
+        # Simulations added while writing
+        self._schedule()
+
+    def setProject(self, project):
+        """
+        Follows a new project. The checkpoint of the previous project is discarded.
+        """
+        self.discard()
+        self._project = project
+
+    def setRestoredCheckpoint(self, filepath):
+        """
+        Records the checkpoint file of a previous session, whose simulations
+        are about to be added to this checkpointer. It is removed once they
+        are all checkpointed again or discarded.
+        """
+        self._restored_filepath = filepath
+
+    def addSimulation(self, simulation):
+        self._pending[simulation.identifier] = simulation
+        self._schedule()
+
+    def checkpoint(self):
+        """
+        Writes the pending simulations in the checkpoint file.
+        Does nothing if a checkpoint is already being written or
+        the files of a discarded one are not removed yet.
+        """
+        self.timer.stop()
+
+        # Nothing to write, so the restored checkpoint is no longer needed
+        if self._thread is None and not self._pending:
+            self._remove_restored()
+
+        if self._thread is not None or not self._pending or self._project is None:
+            return
+        if self._discarded_thread is not None:
+            return
+
+        # NOTE: The restored checkpoint contains the pending simulations,
+        # so it is updated rather than overwritten
+        filepath = self._checkpoint_filepath()
+        identifiers = None
+        if filepath in (self._filepath, self._restored_filepath):
+            identifiers = set(self._pending)
+        self._filepath = filepath
+
+        self._writing = self._pending
+        self._pending = {}
+
+        # NOTE: Snapshot since the simulations may be modified while writing
+        snapshot = Project()
+        snapshot.simulations = [
+            Simulation(simulation.options, list(simulation.results), identifier)
+            for identifier, simulation in self._writing.items()
+        ]
+
+        cancel_event = threading.Event()
+        self._cancel_event = cancel_event
+
+        def callback(i, count):
+            if cancel_event.is_set():
+                raise CheckpointCancelled()
+
+        def function():
+            write_project(snapshot, filepath, identifiers, callback)
+            return filepath
+
+        self._thread = ExecutionThread(function, self)
+        self._thread.finished.connect(self._on_thread_finished)
+        self._thread.start()
+
+    def discard(self):
+        """
+        Removes the checkpoint file, e.g. once the project is saved.
+        """
+        self.timer.stop()
+        self._pending.clear()
+
+        thread = self._thread
+        if thread is not None:
+            thread.finished.disconnect(self._on_thread_finished)
+            self._cancel_event.set()
+            self._thread = None
+            self._writing = {}
+
+        # NOTE: The marker of a previous session is kept until restored
+        filepaths = [self._filepath]
+        if self._marker_written:
+            filepaths.append(self._marker_filepath())
+
+        self._filepath = None
+        self._marker_written = False
+        filepaths.extend(self._take_restored())
+
+        if thread is None:
+            _remove_files(filepaths)
+            return
+
+        self._discarded_thread = thread
+        self._discarded_filepaths = filepaths
+        thread.finished.connect(self._on_discarded_thread_finished)
+
+    def wait(self):
+        """
+        Waits until the checkpoint being written, or discarded, is done,
+        e.g. before quitting.
+        """
+        thread = self._discarded_thread
+        if thread is not None:
+            thread.wait()
+            thread.finished.disconnect(self._on_discarded_thread_finished)
+            self._on_discarded_thread_finished()
+
+        thread = self._thread
+        if thread is not None:
+            thread.wait()
+            thread.finished.disconnect(self._on_thread_finished)
+            self._on_thread_finished()
+
+    def isRunning(self):
+        return self._thread is not None
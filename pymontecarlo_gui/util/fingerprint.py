@@ -0,0 +1,165 @@
+""""""
+
+# Standard library modules.
+import enum
+import hashlib
+import math
+import types
+import weakref
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+from pymontecarlo.formats.series import SeriesBuilder
+from pymontecarlo.settings import Settings
+
+# Globals and constants variables.
+
+DIGEST_SIZE = 16
+
+CALLABLE_TYPES = (
+    types.FunctionType,
+    types.MethodType,
+    types.BuiltinFunctionType,
+    types.BuiltinMethodType,
+)
+
+
+def fingerprint(obj, _path=None):
+    """
+    Returns a hashable value made of the type and attributes of the object,
+    recursively. Objects with the same attribute values have the same
+    fingerprint.
+    Classes and functions are only represented by their qualified name.
+    """
+    if obj is None or isinstance(obj, (str, bytes, int, float, enum.Enum)):
+        return obj
+
+    if isinstance(obj, type) or isinstance(obj, CALLABLE_TYPES):
+        return "{}.{}".format(obj.__module__, obj.__qualname__)
+
+    if isinstance(obj, np.ndarray):
+        return (obj.dtype.str, obj.shape, obj.tobytes())
+
+    if _path is None:
+        _path = set()
+
+    if isinstance(obj, (list, tuple)):
+        return tuple(fingerprint(item, _path) for item in obj)
+
+    if isinstance(obj, dict):
+        items = [
+            (fingerprint(key, _path), fingerprint(value, _path))
+            for key, value in obj.items()
+        ]
+        return tuple(sorted(items, key=repr))
+
+    if hasattr(obj, "__dict__"):
+        # NOTE: Objects referring back to one of their parents are cut short
+        if id(obj) in _path:
+            return (type(obj).__name__,)
+
+        _path.add(id(obj))
+        try:
+            return (type(obj).__name__, fingerprint(vars(obj), _path))
+        finally:
+            _path.discard(id(obj))
+
+    try:
+        hash(obj)
+    except TypeError:
+        return repr(obj)
+    return obj
+
+
+def _datum_key(datum):
+    value = datum["value"]
+    tolerance = datum["tolerance"]
+
+    # NOTE: Values equal within their tolerance mostly fall in the same bin
+    if isinstance(value, float) and tolerance and math.isfinite(value):
+        value = round(value / tolerance)
+
+    return (
+        datum["prefix_name"],
+        fingerprint(datum["name"]),
+        datum["unit"],
+        datum["error"],
+        fingerprint(value),
+    )
+
+
+def digest(entity, settings=None):
+    """
+    Returns a digest of the type and parameters of an entity, as
+    :class:`bytes`, from the data of its series, i.e. the parameters compared
+    by its equality. Float values are rounded to their tolerance.
+    """
+    if settings is None:
+        settings = Settings()
+
+    builder = SeriesBuilder(settings)
+    entity.convert_series(builder)
+
+    data = (type(entity).__name__, tuple(map(_datum_key, builder.data)))
+    data = repr(data).encode("utf8")
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).digest()
+
+
+class OptionsDigester:
+    """
+    Creates keys of options, which can be hashed, unlike options.
+    Equal options have the same key, except in the rare case where two values
+    within their tolerance are rounded apart.
+
+    The digest of each component of the options (program, beam, sample and
+    analyses) is cached until the component is garbage collected, so the
+    components shared by many options are only digested once.
+    """
+
+    def __init__(self):
+        self._settings = Settings()
+        self._digests = {}  # Weak reference and digest by component id
+
+    def _forget(self, key, ref):
+        entry = self._digests.get(key)
+        if entry is not None and entry[0] is ref:
+            del self._digests[key]
+
+    def digest(self, component):
+        """
+        Returns the digest of a component of options.
+        """
+        key = id(component)
+        entry = self._digests.get(key)
+        if entry is not None and entry[0]() is component:
+            return entry[1]
+
+        value = digest(component, self._settings)
+
+        try:
+            ref = weakref.ref(component, lambda ref: self._forget(key, ref))
+        except TypeError:
+            return value
+
+        self._digests[key] = (ref, value)
+        return value
+
+    def key(self, options):
+        """
+        Returns the key of the options. As analyses may add other analyses to
+        the options they are applied to, the key should be created once
+        the analyses are applied.
+        """
+        return (
+            self.digest(options.program),
+            self.digest(options.beam),
+            self.digest(options.sample),
+            tuple(sorted(map(self.digest, options.analyses))),
+            tuple(sorted(map(self.digest, options.detectors))),
+            tuple(sorted(options.tags)),
+        )
+
+    def clear(self):
+        self._digests.clear()
@@ -0,0 +1,72 @@
+""""""
+
+# Standard library modules.
+import os
+import json
+import time
+import threading
+import contextlib
+
+# Third party modules.
+
+# Local modules.
+
+# Globals and constants variables.
+
+
+class StartupProfiler:
+    """
+    Records the wall-clock and CPU time of the start-up phases and writes
+    them as a Chrome trace (``chrome://tracing`` or https://ui.perfetto.dev).
+    """
+
+    def __init__(self, origin_s=None):
+        if origin_s is None:
+            origin_s = time.perf_counter()
+        self._origin_s = origin_s
+        self._events = []
+        self._running = {}
+
+    def _to_us(self, time_s):
+        return int((time_s - self._origin_s) * 1e6)
+
+    def record(self, name, start_s, end_s, cpu_s):
+        event = {
+            "name": name,
+            "cat": "startup",
+            "ph": "X",
+            "ts": self._to_us(start_s),
+            "dur": int((end_s - start_s) * 1e6),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": {"cpu_ms": cpu_s * 1e3},
+        }
+        self._events.append(event)
+
+    def begin(self, name):
+        self._running[name] = (time.perf_counter(), time.process_time())
+
+    def end(self, name):
+        if name not in self._running:
+            return
+        start_s, start_cpu_s = self._running.pop(name)
+        self.record(
+            name, start_s, time.perf_counter(), time.process_time() - start_cpu_s
+        )
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def events(self):
+        return sorted(self._events, key=lambda event: event["ts"])
+
+    def write(self, filepath):
+        data = {"traceEvents": self.events(), "displayTimeUnit": "ms"}
+
+        with open(filepath, "w") as fp:
+            json.dump(data, fp, indent=2)
@@ -0,0 +1,79 @@
+""""""
+
+# Standard library modules.
+
+# Third party modules.
+import h5py
+
+# Local modules.
+from pymontecarlo.project import Project
+from pymontecarlo.simulation import Simulation
+
+# Globals and constants variables.
+
+
+class ProjectReader:
+    """
+    Reads a project file one simulation at a time.
+
+    The list of simulations is read when the reader is created, but neither
+    their options nor their results. :meth:`iter_simulations` decodes the
+    options of each simulation, without results, and :meth:`read_results`
+    the results of one simulation. The file stays open until :meth:`close`.
+    """
+
+    def __init__(self, filepath):
+        self._file = h5py.File(filepath, "r")
+
+        if not Project.can_parse_hdf5(self._file):
+            self._file.close()
+            raise IOError("Cannot open file")
+
+        self._group_simulations = self._file[Project.GROUP_SIMULATIONS]
+        self._names = list(self._group_simulations.keys())
+        self._names_by_identifier = {}
+
+        self.project = Project(self._file.filename)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def iter_simulations(self):
+        """
+        Yields the simulations of the project, with their options but no results.
+        """
+        for name in self._names:
+            group = self._group_simulations[name]
+
+            options = Simulation._parse_hdf5_object(group[Simulation.GROUP_OPTIONS])
+            identifier = Simulation._parse_hdf5(group, Simulation.ATTR_IDENTIFIER, str)
+            self._names_by_identifier[identifier] = name
+
+            yield Simulation(options, [], identifier)
+
+    def read_results(self, simulation):
+        """
+        Returns the results of a simulation yielded by :meth:`iter_simulations`.
+        """
+        name = self._names_by_identifier[simulation.identifier]
+        group_results = self._group_simulations[name][Simulation.GROUP_RESULTS]
+
+        return [
+            Simulation._parse_hdf5_object(group_result)
+            for group_result in group_results.values()
+        ]
+
+    def close(self):
+        if self._file.id.valid:
+            self._file.close()
+
+    @property
+    def closed(self):
+        return not self._file.id.valid
@@ -0,0 +1,288 @@
+""""""
+
+# Standard library modules.
+import asyncio
+import itertools
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Third party modules.
+import numpy as np
+import pandas as pd
+
+# Local modules.
+from pymontecarlo.runner.local import LocalSimulationRunner
+from pymontecarlo.formats.dataframe import ensure_distinct_columns
+from pymontecarlo.formats.series import SeriesBuilder
+from pymontecarlo.settings import Settings
+from pymontecarlo.util.cbook import get_valid_filename
+
+from pymontecarlo_gui.util.fingerprint import OptionsDigester
+
+# Globals and constants variables.
+
+SUBMIT_CHUNK_SIZE = 200
+MAX_QUEUED_SIMULATIONS = 1000
+POLL_INTERVAL_s = 0.1
+
+
+class SweepIdentifiers:
+    """
+    Creates the identifiers of the options of a sweep from the parameters
+    varied across the *sweep_options*, see
+    :meth:`OptionsModel.sweepOptions() <pymontecarlo_gui.options.options.OptionsModel.sweepOptions>`,
+    the same way as :func:`create_identifiers` would for all the options of
+    the sweep at once.
+    """
+
+    def __init__(self, sweep_options):
+        self._settings = Settings()
+        self._settings.set_preferred_unit("nm")
+        self._settings.set_preferred_unit("deg")
+        self._settings.set_preferred_unit("keV")
+        self._settings.set_preferred_unit("g/cm^3")
+
+        self.labels = []
+        if len(sweep_options) > 1:
+            dataframe = pd.DataFrame(map(self._create_series, sweep_options))
+            self.labels = list(ensure_distinct_columns(dataframe).columns)
+
+    def _create_series(self, options):
+        builder = SeriesBuilder(
+            self._settings, abbreviate_name=True, format_number=True
+        )
+        options.convert_series(builder)
+        return builder.build()
+
+    def __call__(self, options):
+        if not self.labels:
+            return "simulation1"
+
+        s = self._create_series(options)
+        items = ["{}={}".format(label, s.get(label, np.nan)) for label in self.labels]
+        return get_valid_filename("_".join(items))
+
+
+class _SimulationQueue(asyncio.Queue):
+    """
+    Queue calling *finished* with each simulation taken from the queue,
+    once it is marked as done, whether it succeeded, failed or was cancelled.
+    """
+
+    def __init__(self, finished):
+        super().__init__()
+        self._finished_callback = finished
+        self._simulations = {}  # Simulation taken by each task
+
+    async def get(self):
+        simulation = await super().get()
+        self._simulations[asyncio.current_task()] = simulation
+        return simulation
+
+    def task_done(self):
+        super().task_done()
+
+        simulation = self._simulations.pop(asyncio.current_task(), None)
+        if simulation is not None:
+            self._finished_callback(simulation)
+
+
+class StreamingSimulationRunner(LocalSimulationRunner):
+    """
+    Local runner which can also submit the options of an iterable, see
+    :meth:`submit_iter`, so that large sweeps are never built all at once.
+
+    Submitted options, and the options of the simulations in the project,
+    are only remembered by their keys, see :class:`OptionsDigester`.
+    """
+
+    def __init__(self, project=None, token=None, max_workers=1):
+        super().__init__(project, token, max_workers)
+        self._identifiers = {}  # Options of queued simulations by identifier
+        self._cancel_count = 0
+
+        self._digester = OptionsDigester()
+        self._submitted_keys = set()
+        self._project_simulations = {}  # Simulations of the project by key
+        self._project_identifiers = set()
+        self._project_count = 0  # Number of simulations of the project indexed
+
+        self._queue = _SimulationQueue(self._on_simulation_finished)
+        for dispatcher in self._dispatchers:
+            dispatcher.queue = self._queue
+
+    def _on_simulation_finished(self, simulation):
+        self._identifiers.pop(simulation.identifier, None)
+
+    def _index_project(self):
+        simulations = self.project.simulations
+        for simulation in simulations[self._project_count :]:
+            key = self._digester.key(simulation.options)
+            self._project_simulations.setdefault(key, simulation)
+            self._project_identifiers.add(simulation.identifier)
+        self._project_count = len(simulations)
+
+    def _expand_options(self, list_options):
+        final_list_options = []
+        keys = set()
+
+        for options in list_options:
+            expanded_options = [options]
+            for analysis in list(options.analyses):
+                expanded_options.extend(analysis.apply(options))
+
+            for options in expanded_options:
+                key = self._digester.key(options)
+                if key in keys:
+                    continue
+                keys.add(key)
+                final_list_options.append(options)
+
+        return final_list_options
+
+    def _exclude_simulated_options(self, list_options):
+        self._index_project()
+        final_list_options = []
+
+        for options in list_options:
+            key = self._digester.key(options)
+
+            # Exclude already submitted options
+            if key in self._submitted_keys:
+                continue
+
+            # Exclude if simulation with same options already exists in project
+            # and has results
+            simulation = self._project_simulations.get(key)
+            if simulation is not None and simulation.results:
+                continue
+
+            final_list_options.append(options)
+
+        return final_list_options
+
+    def _create_identifiers(self, list_options, sweep_identifiers=None):
+        if sweep_identifiers is None:
+            # NOTE: Identifiers are then only created from the parameters
+            # varied within this call
+            identifiers = super()._create_identifiers(list_options)
+        else:
+            identifiers = map(sweep_identifiers, list_options)
+
+        final_identifiers = []
+
+        for options, identifier in zip(list_options, identifiers):
+            base = identifier
+            index = 0
+            while (
+                identifier in self._identifiers
+                or identifier in self._project_identifiers
+            ):
+                index += 1
+                identifier = "{}-{:d}".format(base, index)
+
+            self._identifiers[identifier] = options
+            final_identifiers.append(identifier)
+
+        return final_identifiers
+
+    async def _submit_simulations(self, simulations):
+        for simulation in simulations:
+            self._submitted_keys.add(self._digester.key(simulation.options))
+            await self._submit(simulation)
+            logger.debug('Simulation "{}" submitted'.format(simulation.identifier))
+
+    async def submit(self, *list_options):
+        simulations = self.prepare_simulations(*list_options)
+        logger.debug("Prepared {} simulations".format(len(simulations)))
+
+        await self._submit_simulations(simulations)
+
+        return simulations
+
+    async def cancel(self):
+        self._cancel_count += 1
+        await super().cancel()
+
+    async def set_project(self, project):
+        await super().set_project(project)
+        self._identifiers.clear()
+        self._digester.clear()
+        self._submitted_keys.clear()
+        self._project_simulations.clear()
+        self._project_identifiers.clear()
+        self._project_count = 0
+
+    def find_options(self, identifier):
+        """
+        Returns the options of the queued or running simulation with this
+        identifier, or ``None``.
+        """
+        return self._identifiers.get(identifier)
+
+    def queued_count(self):
+        """
+        Returns the number of simulations waiting in the queue.
+        """
+        return self._queue.qsize()
+
+    async def submit_iter(
+        self,
+        iterable_options,
+        sweep_options=None,
+        chunk_size=SUBMIT_CHUNK_SIZE,
+        max_queued=MAX_QUEUED_SIMULATIONS,
+        callback=None,
+    ):
+        """
+        Submits the options of the iterable in chunks of *chunk_size* options.
+        Before each chunk, waits until at most *max_queued* simulations
+        are waiting in the queue, so that the options are consumed as the
+        simulations run. Control is given back to the event loop between
+        chunks.
+
+        The identifiers of the simulations are created from the parameters
+        varied across the *sweep_options*, if specified, so that they do not
+        depend on the chunks, see :class:`SweepIdentifiers`.
+
+        Stops when the runner is cancelled. The *callback*, if specified,
+        is called with the simulations of each chunk.
+        Returns the number of submitted simulations.
+        """
+        sweep_identifiers = None
+        if sweep_options is not None:
+            sweep_identifiers = SweepIdentifiers(sweep_options)
+
+        cancel_count = self._cancel_count
+        iterator = iter(iterable_options)
+        count = 0
+
+        while True:
+            while (
+                self.queued_count() >= max_queued and self._cancel_count == cancel_count
+            ):
+                await asyncio.sleep(POLL_INTERVAL_s)
+
+            if self._cancel_count != cancel_count:
+                logger.debug("Submission cancelled")
+                break
+
+            chunk = list(itertools.islice(iterator, chunk_size))
+            if not chunk:
+                break
+
+            list_options = self._expand_options(chunk)
+            list_options = self._exclude_simulated_options(list_options)
+            identifiers = self._create_identifiers(list_options, sweep_identifiers)
+            simulations = self._create_simulations(list_options, identifiers)
+            await self._submit_simulations(simulations)
+            count += len(simulations)
+            logger.debug("Submitted chunk of {} simulation(s)".format(len(simulations)))
+
+            if callback is not None:
+                callback(simulations)
+
+            await asyncio.sleep(0)
+
+        return count
@@ -0,0 +1,191 @@
+""""""
+
+# Standard library modules.
+import os
+import json
+import logging
+import collections
+
+logger = logging.getLogger(__name__)
+
+# Third party modules.
+
+# Local modules.
+
+# Globals and constants variables.
+
+HISTORY_FILENAME = "runtimes.json"
+ENERGY_BIN_eV = 1e3
+
+RuntimeEstimate = collections.namedtuple(
+    "RuntimeEstimate", ("cpu_s", "longest_s", "known_count", "unknown_count")
+)
+
+
+def _energy_bin(energy_eV):
+    return int(round(energy_eV / ENERGY_BIN_eV))
+
+
+def _sample_type(sample):
+    return sample.__class__.__name__
+
+
+class RuntimeHistory:
+    """
+    Durations of past simulations, by program, beam energy (to the nearest
+    keV) and sample type, stored in a JSON file.
+    """
+
+    def __init__(self, filepath=None):
+        self.filepath = filepath
+        self._entries = {}  # (program, energy bin, sample type): [count, total_s]
+
+    def __len__(self):
+        return len(self._entries)
+
+    @classmethod
+    def read(cls, filepath):
+        """
+        Reads the history from *filepath*. An empty history is returned if
+        the file does not exist or is invalid.
+        """
+        history = cls(filepath)
+        if not os.path.exists(filepath):
+            return history
+
+        try:
+            with open(filepath, "r") as fp:
+                for program, energy_bin, sample_type, count, total_s in json.load(fp):
+                    key = (program, int(energy_bin), sample_type)
+                    history._entries[key] = [int(count), float(total_s)]
+        except (OSError, ValueError, TypeError):
+            logger.exception("Invalid runtime history")
+            history._entries.clear()
+
+        return history
+
+    def write(self, filepath=None):
+        if filepath is None:
+            filepath = self.filepath
+
+        rows = [list(key) + value for key, value in self._entries.items()]
+        with open(filepath, "w") as fp:
+            json.dump(rows, fp)
+
+    def add(self, options, duration_s):
+        """
+        Records the duration (in seconds) of a simulation of the *options*.
+        """
+        key = (
+            options.program.name,
+            _energy_bin(options.beam.energy_eV),
+            _sample_type(options.sample),
+        )
+        entry = self._entries.setdefault(key, [0, 0.0])
+        entry[0] += 1
+        entry[1] += duration_s
+
+    def estimate(self, program, energy_eV, sample):
+        """
+        Returns the expected duration (in seconds) of a simulation, or ``None``
+        if this program was never run.
+        Without simulations at this energy, the simulations of the same
+        sample type at the nearest energy are used, then all the simulations
+        of the program.
+        """
+        program_name = program.name
+        energy_bin = _energy_bin(energy_eV)
+        sample_type = _sample_type(sample)
+
+        entry = self._entries.get((program_name, energy_bin, sample_type))
+        if entry is not None:
+            return entry[1] / entry[0]
+
+        nearest = None
+        count = 0
+        total_s = 0.0
+
+        for (other_program, other_bin, other_type), entry in self._entries.items():
+            if other_program != program_name:
+                continue
+
+            count += entry[0]
+            total_s += entry[1]
+
+            if other_type != sample_type:
+                continue
+
+            distance = abs(other_bin - energy_bin)
+            if nearest is None or distance < nearest[0]:
+                nearest = (distance, entry)
+
+        if nearest is not None:
+            _distance, entry = nearest
+            return entry[1] / entry[0]
+
+        if count:
+            return total_s / count
+
+        return None
+
+
+def estimate_runtime(model, history):
+    """
+    Returns the :class:`RuntimeEstimate` of the options of an
+    :class:`OptionsModel`: total CPU time, longest simulation (both in seconds)
+    and number of options with and without an estimate.
+    Like :meth:`OptionsModel.optionsCount`, it does not build the options.
+    """
+    # NOTE: The estimate only depends on the energy and type of sample
+    beams = collections.Counter()
+    for beam in model.builder.beams:
+        beams[beam.energy_eV] += 1
+
+    samples = {}
+    for sample in model.builder.samples:
+        samples.setdefault(_sample_type(sample), [sample, 0])[1] += 1
+
+    cpu_s = 0.0
+    longest_s = 0.0
+    known_count = 0
+    unknown_count = 0
+
+    def add(program, energy_eV, sample, count):
+        nonlocal cpu_s, longest_s, known_count, unknown_count
+
+        duration_s = history.estimate(program, energy_eV, sample)
+        if duration_s is None:
+            unknown_count += count
+            return
+
+        cpu_s += duration_s * count
+        longest_s = max(longest_s, duration_s)
+        known_count += count
+
+    for program, combinations in zip(
+        model.builder.programs, model.analysisCombinations()
+    ):
+        for energy_eV, beam_count in beams.items():
+            for sample, sample_count in samples.values():
+                count = beam_count * sample_count * len(combinations)
+                add(program, energy_eV, sample, count)
+
+    for options in model.excludedOptions():
+        duration_s = history.estimate(
+            options.program, options.beam.energy_eV, options.sample
+        )
+        if duration_s is None:
+            unknown_count -= 1
+        else:
+            cpu_s -= duration_s
+            known_count -= 1
+
+    return RuntimeEstimate(cpu_s, longest_s, known_count, unknown_count)
+
+
+def estimate_wall_time(estimate, max_workers):
+    """
+    Returns the expected wall-clock time (in seconds) to run the simulations
+    of a :class:`RuntimeEstimate` on *max_workers* workers.
+    """
+    return max(estimate.cpu_s / max(max_workers, 1), estimate.longest_s)
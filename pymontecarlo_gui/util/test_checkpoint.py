@@ -0,0 +1,140 @@
+""""""
+
+# Standard library modules.
+import os
+import threading
+
+# Third party modules.
+import pytest
+
+# Local modules.
+from pymontecarlo.options import Options, Material
+from pymontecarlo.options.beam import PencilBeam
+from pymontecarlo.options.sample import SubstrateSample
+from pymontecarlo.project import Project
+from pymontecarlo.simulation import Simulation
+from pymontecarlo.mock import ProgramMock
+
+from pymontecarlo_gui.util import checkpoint
+from pymontecarlo_gui.util.checkpoint import (
+    Checkpointer,
+    find_checkpoint,
+    UNTITLED_CHECKPOINT_FILENAME,
+)
+
+# Globals and constants variables.
+
+
+def _create_simulation(energy_eV):
+    options = Options(
+        ProgramMock(), PencilBeam(energy_eV), SubstrateSample(Material.pure(29)), []
+    )
+    return Simulation(options, [], "sim{:g}".format(energy_eV))
+
+
+@pytest.fixture
+def checkpointer(qtbot, tmp_path):
+    checkpointer = Checkpointer(str(tmp_path), simulation_count=2)
+    checkpointer.setProject(Project())
+    yield checkpointer
+    checkpointer.discard()
+    checkpointer.wait()
+
+
+def test_checkpointer(qtbot, tmp_path, checkpointer):
+    assert find_checkpoint(str(tmp_path)) is None
+
+    checkpointer.addSimulation(_create_simulation(10e3))
+    assert not checkpointer.isRunning()
+    assert checkpointer.timer.isActive()
+
+    with qtbot.waitSignal(checkpointer.checkpointed) as blocker:
+        checkpointer.addSimulation(_create_simulation(15e3))
+
+    filepath = str(tmp_path.joinpath(UNTITLED_CHECKPOINT_FILENAME))
+    assert blocker.args == [filepath]
+    assert find_checkpoint(str(tmp_path)) == (filepath, None)
+    assert len(Project.read(filepath).simulations) == 2
+
+    # Appended to the existing checkpoint
+    with qtbot.waitSignal(checkpointer.checkpointed):
+        checkpointer.addSimulation(_create_simulation(20e3))
+        checkpointer.checkpoint()
+
+    assert len(Project.read(filepath).simulations) == 3
+
+    checkpointer.discard()
+    assert not os.path.exists(filepath)
+    assert find_checkpoint(str(tmp_path)) is None
+
+
+def test_checkpointer_project_filepath(qtbot, tmp_path, checkpointer):
+    project_filepath = str(tmp_path.joinpath("project.mcsim"))
+    checkpointer.setProject(Project(project_filepath))
+
+    with qtbot.waitSignal(checkpointer.checkpointed):
+        checkpointer.addSimulation(_create_simulation(10e3))
+        checkpointer.checkpoint()
+
+    filepath = project_filepath + ".checkpoint"
+    assert find_checkpoint(str(tmp_path)) == (filepath, project_filepath)
+
+
+def test_checkpointer_restored(qtbot, tmp_path, checkpointer):
+    # Checkpoint of a previous session
+    with qtbot.waitSignal(checkpointer.checkpointed) as blocker:
+        checkpointer.addSimulation(_create_simulation(10e3))
+        checkpointer.checkpoint()
+    restored_filepath = blocker.args[0]
+
+    other = Checkpointer(str(tmp_path), simulation_count=1)
+    other.setProject(Project(str(tmp_path.joinpath("project.mcsim"))))
+    assert find_checkpoint(str(tmp_path)) == (restored_filepath, None)
+
+    other.setRestoredCheckpoint(restored_filepath)
+    with qtbot.waitSignal(other.checkpointed) as blocker:
+        other.addSimulation(_create_simulation(10e3))
+
+    assert not os.path.exists(restored_filepath)
+    assert find_checkpoint(str(tmp_path))[0] == blocker.args[0]
+
+    other.discard()
+    assert find_checkpoint(str(tmp_path)) is None
+
+
+def test_checkpointer_discard_running(qtbot, tmp_path, checkpointer, monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+
+    def write_project(project, filepath, identifiers=None, callback=None):
+        with open(filepath, "w"):
+            pass
+        started.set()
+        release.wait(10)
+        callback(1, 1)
+
+    monkeypatch.setattr(checkpoint, "write_project", write_project)
+
+    checkpointer.addSimulation(_create_simulation(10e3))
+    checkpointer.checkpoint()
+    assert started.wait(10)
+
+    # Not blocked by the thread writing the checkpoint
+    checkpointer.discard()
+    assert not checkpointer.isRunning()
+
+    filepath = str(tmp_path.joinpath(UNTITLED_CHECKPOINT_FILENAME))
+    assert os.path.exists(filepath)
+
+    # No new checkpoint until the discarded one is removed
+    checkpointer.addSimulation(_create_simulation(15e3))
+    checkpointer.checkpoint()
+    assert not checkpointer.isRunning()
+
+    monkeypatch.undo()
+    release.set()
+    qtbot.waitUntil(lambda: checkpointer.isRunning() or not os.path.exists(filepath))
+
+    with qtbot.waitSignal(checkpointer.checkpointed, timeout=10000):
+        checkpointer.checkpoint()
+    assert len(Project.read(filepath).simulations) == 1
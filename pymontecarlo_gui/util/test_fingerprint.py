@@ -0,0 +1,57 @@
+""""""
+
+# Standard library modules.
+
+# Third party modules.
+import numpy as np
+
+# Local modules.
+from pymontecarlo.options import Options, Material
+from pymontecarlo.options.beam import PencilBeam
+from pymontecarlo.options.sample import SubstrateSample
+from pymontecarlo.mock import ProgramMock
+
+from pymontecarlo_gui.util.fingerprint import fingerprint, OptionsDigester
+
+# Globals and constants variables.
+
+
+class Node:
+    def __init__(self, value):
+        self.value = value
+        self.children = []
+        self.parent = None
+
+
+def _create_tree(value):
+    root = Node(value)
+    child = Node(value)
+    child.parent = root
+    root.children.append(child)
+    return root
+
+
+def test_fingerprint_cycle():
+    assert fingerprint(_create_tree(1)) == fingerprint(_create_tree(1))
+    assert fingerprint(_create_tree(1)) != fingerprint(_create_tree(2))
+
+
+def test_fingerprint_ndarray():
+    values = np.zeros(10000)
+    other = values.copy()
+    other[5000] = 1.0
+
+    assert fingerprint(values) == fingerprint(values.copy())
+    assert fingerprint(values) != fingerprint(other)
+
+
+def test_options_digester():
+    digester = OptionsDigester()
+    sample = SubstrateSample(Material.pure(29))
+
+    options = Options(ProgramMock(), PencilBeam(10e3), sample, [])
+    other = Options(ProgramMock(), PencilBeam(10e3), sample, [])
+    assert digester.key(options) == digester.key(other)
+
+    other = Options(ProgramMock(), PencilBeam(15e3), sample, [])
+    assert digester.key(options) != digester.key(other)
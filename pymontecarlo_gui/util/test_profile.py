@@ -0,0 +1,55 @@
+""""""
+
+# Standard library modules.
+import os
+import json
+import time
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo_gui.util.profile import StartupProfiler
+
+# Globals and constants variables.
+
+
+def test_startup_profiler(tmp_path):
+    profiler = StartupProfiler()
+
+    profiler.begin("imports")
+    profiler.end("imports")
+    time.sleep(0.001)
+
+    with profiler.phase("window"):
+        time.sleep(0.001)
+        with profiler.phase("settings"):
+            pass
+
+    profiler.end("unknown")  # Ignored
+
+    filepath = tmp_path.joinpath("startup.json")
+    profiler.write(filepath)
+
+    with open(filepath, "r") as fp:
+        data = json.load(fp)
+
+    assert data["displayTimeUnit"] == "ms"
+
+    events = data["traceEvents"]
+    assert [event["name"] for event in events] == ["imports", "window", "settings"]
+
+    for event in events:
+        assert event["ph"] == "X"
+        assert event["cat"] == "startup"
+        assert event["pid"] == os.getpid()
+        assert event["ts"] >= 0
+        assert event["dur"] >= 0
+        assert event["args"]["cpu_ms"] >= 0
+
+    timestamps = [event["ts"] for event in events]
+    assert timestamps == sorted(timestamps)
+
+    # Nested phase within its parent, up to the truncation to microseconds
+    window, settings = events[1], events[2]
+    assert settings["ts"] > window["ts"]
+    assert settings["ts"] + settings["dur"] <= window["ts"] + window["dur"] + 1
@@ -0,0 +1,78 @@
+""""""
+
+# Standard library modules.
+import asyncio
+
+# Third party modules.
+import pytest
+
+# Local modules.
+from pymontecarlo.options import Options, Material
+from pymontecarlo.options.beam import PencilBeam
+from pymontecarlo.options.sample import SubstrateSample
+from pymontecarlo.options.analysis import PhotonIntensityAnalysis
+from pymontecarlo.options.detector import PhotonDetector
+from pymontecarlo.project import Project
+from pymontecarlo.runner.local import LocalSimulationRunner
+from pymontecarlo.mock import ProgramMock
+
+from pymontecarlo_gui.util.reader import ProjectReader
+
+# Globals and constants variables.
+
+
+@pytest.fixture
+def project_filepath(tmp_path):
+    detector = PhotonDetector("xray", 0.61)
+    list_options = [
+        Options(
+            ProgramMock(),
+            PencilBeam(energy_eV),
+            SubstrateSample(Material.pure(29)),
+            [PhotonIntensityAnalysis(detector)],
+        )
+        for energy_eV in [10e3, 15e3]
+    ]
+
+    async def run():
+        project = Project()
+        async with LocalSimulationRunner(project) as runner:
+            await runner.submit(*list_options)
+        return project
+
+    project = asyncio.run(run())
+
+    filepath = tmp_path.joinpath("project.mcsim")
+    project.write(filepath)
+    return filepath
+
+
+def test_reader(project_filepath):
+    expected = Project.read(project_filepath)
+
+    with ProjectReader(project_filepath) as reader:
+        assert len(reader) == 2
+        assert reader.project.filepath == str(project_filepath)
+
+        simulations = list(reader.iter_simulations())
+
+        for simulation, expected_simulation in zip(simulations, expected.simulations):
+            assert simulation.identifier == expected_simulation.identifier
+            assert simulation.options == expected_simulation.options
+            assert not simulation.results
+
+            results = reader.read_results(simulation)
+            assert len(results) == len(expected_simulation.results) > 0
+
+    assert reader.closed
+
+
+def test_reader_invalid(tmp_path):
+    filepath = tmp_path.joinpath("project.mcsim")
+    Project().write(filepath)
+
+    with open(filepath, "w") as fp:
+        fp.write("foo")
+
+    with pytest.raises(OSError):
+        ProjectReader(filepath)
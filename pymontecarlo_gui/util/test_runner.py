@@ -0,0 +1,128 @@
+""""""
+
+# Standard library modules.
+import asyncio
+
+# Third party modules.
+
+# Local modules.
+from pymontecarlo.options import Options, Material
+from pymontecarlo.options.beam import PencilBeam
+from pymontecarlo.options.sample import SubstrateSample
+from pymontecarlo.project import Project
+from pymontecarlo.formats.identifier import create_identifiers
+from pymontecarlo.mock import ProgramMock
+
+from pymontecarlo_gui.util.runner import StreamingSimulationRunner, SweepIdentifiers
+
+# Globals and constants variables.
+
+
+def _iter_options(count):
+    program = ProgramMock()
+    sample = SubstrateSample(Material.pure(29))
+    for i in range(count):
+        yield Options(program, PencilBeam(10e3 + i * 100), sample, [])
+
+
+def test_submit_iter():
+    chunks = []
+
+    async def run():
+        project = Project()
+        async with StreamingSimulationRunner(project, max_workers=2) as runner:
+            count = await runner.submit_iter(
+                _iter_options(10), chunk_size=3, max_queued=2, callback=chunks.append
+            )
+        return project, count
+
+    project, count = asyncio.run(run())
+
+    assert count == 10
+    assert [len(simulations) for simulations in chunks] == [3, 3, 3, 1]
+    assert len(project.simulations) == 10
+
+    identifiers = [simulation.identifier for simulation in project.simulations]
+    assert len(set(identifiers)) == 10
+
+
+def test_submit_iter_cancel():
+    consumed = []
+
+    def iter_options():
+        for options in _iter_options(100):
+            consumed.append(options)
+            yield options
+
+    async def run():
+        runner = StreamingSimulationRunner(Project())
+        task = asyncio.ensure_future(
+            runner.submit_iter(iter_options(), chunk_size=5, max_queued=5)
+        )
+        await asyncio.sleep(0.2)  # Not started, so the queue is never consumed
+        await runner.cancel()
+        return await task
+
+    count = asyncio.run(run())
+
+    assert count == 5
+    assert len(consumed) < 100
+
+
+def test_submit_iter_sweep_identifiers():
+    list_options = list(_iter_options(10))
+
+    async def run():
+        project = Project()
+        async with StreamingSimulationRunner(project) as runner:
+            await runner.submit_iter(
+                list_options, sweep_options=list_options[:2], chunk_size=3
+            )
+        return project
+
+    project = asyncio.run(run())
+
+    identifiers = [simulation.identifier for simulation in project.simulations]
+    assert sorted(identifiers) == sorted(create_identifiers(_iter_options(10)))
+
+
+def test_sweep_identifiers_single():
+    list_options = list(_iter_options(1))
+    assert SweepIdentifiers(list_options)(list_options[0]) == "simulation1"
+
+
+def test_submit_iter_skip_simulated():
+    async def run():
+        project = Project()
+        async with StreamingSimulationRunner(project) as runner:
+            count1 = await runner.submit_iter(_iter_options(3))
+            await runner._queue.join()
+            count2 = await runner.submit_iter(_iter_options(5))
+        return project, count1, count2
+
+    project, count1, count2 = asyncio.run(run())
+
+    assert count1 == 3
+    assert count2 == 2
+    assert len(project.simulations) == 5
+
+
+def test_find_options_released():
+    found = []
+
+    async def run():
+        project = Project()
+        async with StreamingSimulationRunner(project) as runner:
+
+            def callback(simulations):
+                found.extend(runner.find_options(s.identifier) for s in simulations)
+
+            await runner.submit_iter(_iter_options(4), callback=callback)
+        return runner, project
+
+    runner, project = asyncio.run(run())
+
+    assert len(found) == 4
+    assert all(options is not None for options in found)
+    for simulation in project.simulations:
+        assert runner.find_options(simulation.identifier) is None
@@ -0,0 +1,77 @@
+""""""
+
+# Standard library modules.
+
+# Third party modules.
+import pytest
+
+# Local modules.
+from pymontecarlo.settings import Settings
+from pymontecarlo.options import Options, Material
+from pymontecarlo.options.beam import PencilBeam
+from pymontecarlo.options.sample import SubstrateSample, InclusionSample
+from pymontecarlo.mock import ProgramMock
+
+from pymontecarlo_gui.options.options import OptionsModel
+from pymontecarlo_gui.util.runtime import (
+    RuntimeHistory,
+    estimate_runtime,
+    estimate_wall_time,
+)
+
+# Globals and constants variables.
+
+COPPER = Material.pure(29)
+
+
+@pytest.fixture
+def history():
+    history = RuntimeHistory()
+    program = ProgramMock()
+    sample = SubstrateSample(COPPER)
+    history.add(Options(program, PencilBeam(10e3), sample, []), 10.0)
+    history.add(Options(program, PencilBeam(10.2e3), sample, []), 20.0)
+    history.add(Options(program, PencilBeam(20e3), sample, []), 60.0)
+    return history
+
+
+def test_estimate(history):
+    program = ProgramMock()
+    substrate = SubstrateSample(COPPER)
+    inclusion = InclusionSample(COPPER, COPPER, 1e-6)
+
+    assert history.estimate(program, 10e3, substrate) == pytest.approx(15.0)
+    assert history.estimate(program, 18e3, substrate) == pytest.approx(60.0)
+    assert history.estimate(program, 10e3, inclusion) == pytest.approx(30.0)
+
+
+def test_read_write(history, tmp_path):
+    filepath = str(tmp_path.joinpath("runtimes.json"))
+    history.write(filepath)
+
+    other = RuntimeHistory.read(filepath)
+    assert len(other) == len(history)
+    assert other.estimate(ProgramMock(), 10e3, SubstrateSample(COPPER)) == 15.0
+
+    assert len(RuntimeHistory.read(str(tmp_path.joinpath("missing.json")))) == 0
+
+
+def test_estimate_runtime(history):
+    model = OptionsModel(Settings())
+    model.setBeams([PencilBeam(10e3), PencilBeam(20e3)])
+    model.setSamples([SubstrateSample(COPPER), SubstrateSample(Material.pure(13))])
+    model.setPrograms([ProgramMock()])
+
+    estimate = estimate_runtime(model, history)
+    assert estimate.cpu_s == pytest.approx(2 * 15.0 + 2 * 60.0)
+    assert estimate.longest_s == pytest.approx(60.0)
+    assert estimate.known_count == 4
+    assert estimate.unknown_count == 0
+
+    assert estimate_wall_time(estimate, 1) == pytest.approx(150.0)
+    assert estimate_wall_time(estimate, 8) == pytest.approx(60.0)
+
+    model.setOptionsExcluded(next(model.iterOptions()))
+    estimate = estimate_runtime(model, history)
+    assert estimate.cpu_s == pytest.approx(15.0 + 2 * 60.0)
+    assert estimate.known_count == 3
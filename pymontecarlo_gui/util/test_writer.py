@@ -0,0 +1,199 @@
+""""""
+
+# Standard library modules.
+
+# Third party modules.
+import pytest
+import h5py
+
+# Local modules.
+from pymontecarlo.options import Options, Material
+from pymontecarlo.options.beam import PencilBeam
+from pymontecarlo.options.sample import SubstrateSample
+from pymontecarlo.options.analysis import PhotonIntensityAnalysis
+from pymontecarlo.options.detector import PhotonDetector
+from pymontecarlo.project import Project
+from pymontecarlo.simulation import Simulation
+from pymontecarlo.results.photonintensity import EmittedPhotonIntensityResultBuilder
+from pymontecarlo.mock import ProgramMock
+
+from pymontecarlo_gui.util.writer import (
+    write_project,
+    _separate_option_group,
+    GROUP_OPTION,
+    ATTR_REWRITTEN_BYTES,
+    ATTR_WRITING,
+)
+
+# Globals and constants variables.
+
+
+def _create_simulation(energy_eV, z):
+    analysis = PhotonIntensityAnalysis(PhotonDetector("xray", 0.61))
+    options = Options(
+        ProgramMock(),
+        PencilBeam(energy_eV),
+        SubstrateSample(Material.pure(z)),
+        [analysis],
+    )
+
+    builder = EmittedPhotonIntensityResultBuilder(analysis)
+    builder.add_intensity((z, "Ka1"), energy_eV, 1.0)
+
+    return Simulation(options, [builder.build()], "sim{:g}".format(energy_eV))
+
+
+@pytest.fixture
+def project(tmp_path):
+    project = Project(str(tmp_path.joinpath("project.mcsim")))
+    project.simulations.append(_create_simulation(10e3, 29))
+    project.simulations.append(_create_simulation(15e3, 29))
+    return project
+
+
+def _assert_project_equal(filepath, project):
+    other = Project.read(filepath)
+
+    assert len(other.simulations) == len(project.simulations)
+    simulations = {
+        simulation.identifier: simulation for simulation in project.simulations
+    }
+    for other_simulation in other.simulations:
+        simulation = simulations[other_simulation.identifier]
+        assert other_simulation.options == simulation.options
+        assert len(other_simulation.results) == len(simulation.results)
+
+
+def test_write_project(project):
+    counts = []
+    write_project(project, project.filepath, callback=lambda i, n: counts.append(i))
+
+    _assert_project_equal(project.filepath, project)
+    assert counts == [1, 2]
+
+
+def test_write_project_dirty(project):
+    write_project(project, project.filepath)
+
+    # Append
+    simulation = _create_simulation(20e3, 13)
+    project.simulations.append(simulation)
+
+    counts = []
+    write_project(
+        project,
+        project.filepath,
+        [simulation.identifier],
+        lambda i, n: counts.append((i, n)),
+    )
+
+    _assert_project_equal(project.filepath, project)
+    assert counts == [(1, 1)]
+
+    # Replace results
+    simulation = project.simulations[0]
+    simulation.results.extend(_create_simulation(30e3, 29).results)
+
+    write_project(project, project.filepath, [simulation.identifier])
+
+    _assert_project_equal(project.filepath, project)
+
+
+def test_write_project_dirty_new_file(project):
+    write_project(project, project.filepath, [])
+    _assert_project_equal(project.filepath, project)
+
+
+def test_write_project_dirty_rewrite(project, tmp_path):
+    write_project(project, project.filepath)
+    filepath = str(tmp_path.joinpath("other.mcsim"))
+
+    rewritten_sizes = []
+    simulation = project.simulations[0]
+    for i in range(6):
+        simulation.results[:] = _create_simulation(10e3 + i, 29).results
+        write_project(project, project.filepath, [simulation.identifier])
+
+        with h5py.File(project.filepath, "r") as f:
+            option_count = len(f[GROUP_OPTION])
+            rewritten_sizes.append(f.attrs.get(ATTR_REWRITTEN_BYTES, 0))
+
+        # Unreferenced objects only removed when the whole file is rewritten
+        if rewritten_sizes[-1] == 0:
+            write_project(project, filepath)
+            with h5py.File(filepath, "r") as f:
+                assert len(f[GROUP_OPTION]) == option_count
+
+    # Whole file rewritten once the replaced results exceed the threshold
+    assert 0 in rewritten_sizes
+    assert rewritten_sizes[0] > 0
+
+    _assert_project_equal(project.filepath, project)
+
+
+def test_write_project_failure(project, monkeypatch):
+    write_project(project, project.filepath)
+
+    def convert_hdf5(self, group):
+        raise OSError("Disk full")
+
+    monkeypatch.setattr(Simulation, "convert_hdf5", convert_hdf5)
+
+    with pytest.raises(OSError):
+        write_project(project, project.filepath)
+
+    monkeypatch.undo()
+    _assert_project_equal(project.filepath, project)
+
+
+def test_write_project_dirty_failure(project, monkeypatch):
+    write_project(project, project.filepath)
+
+    simulation = _create_simulation(20e3, 13)
+    project.simulations.append(simulation)
+    project.simulations[0].results.extend(_create_simulation(30e3, 29).results)
+    identifiers = [project.simulations[0].identifier, simulation.identifier]
+
+    def convert_hdf5(self, group):
+        group.create_group("partial")
+        raise OSError("Disk full")
+
+    monkeypatch.setattr(type(simulation.results[0]), "convert_hdf5", convert_hdf5)
+
+    # Full write also fails
+    with pytest.raises(OSError):
+        write_project(project, project.filepath, identifiers)
+
+    monkeypatch.undo()
+
+    # Previous simulations and results kept
+    other = Project.read(project.filepath)
+    assert len(other.simulations) == 2
+    assert all(len(simulation.results) == 1 for simulation in other.simulations)
+
+    with h5py.File(project.filepath, "r") as f:
+        assert f.attrs[ATTR_WRITING]
+
+    # Whole file rewritten after a failed write
+    write_project(project, project.filepath, [])
+    _assert_project_equal(project.filepath, project)
+
+    with h5py.File(project.filepath, "r") as f:
+        assert ATTR_WRITING not in f.attrs
+
+
+def test_separate_option_group(tmp_path):
+    filepath = tmp_path.joinpath("test.h5")
+
+    with h5py.File(filepath, "w") as f:
+        f.create_group("_option/Material [1]")
+
+        with _separate_option_group(f):
+            f.create_group("_option/Material [1]")
+            f.create_group("_option/Material [2]")
+
+        assert set(f["_option"].keys()) == {
+            "Material [1]",
+            "Material [1] ~1",
+            "Material [2]",
+        }
@@ -0,0 +1,202 @@
+""""""
+
+# Standard library modules.
+import os
+import contextlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Third party modules.
+import h5py
+
+# Local modules.
+from pymontecarlo.entity import EntityHDF5Mixin
+from pymontecarlo.project import Project
+from pymontecarlo.simulation import Simulation
+
+# Globals and constants variables.
+
+# NOTE: Group where pymontecarlo stores the objects referenced by the options
+# and results, see EntityHDF5Mixin._convert_hdf5_reference()
+GROUP_OPTION = "_option"
+GROUP_OPTION_PREVIOUS = "_option~"
+
+# NOTE: HDF5 does not reclaim the space of deleted objects, nor of the
+# referenced objects of replaced results. The number of bytes written to
+# replace results is accumulated in this attribute, and the whole file is
+# rewritten once it exceeds this fraction of the file size.
+ATTR_REWRITTEN_BYTES = "_rewritten_bytes"
+MAX_REWRITTEN_FRACTION = 0.5
+
+# NOTE: Set while simulations are written in the file. If it is still set,
+# a previous write failed and the whole file is rewritten.
+ATTR_WRITING = "_writing"
+
+# NOTE: New simulations and replaced results are written under these names,
+# and only moved to their final names once complete
+GROUP_SIMULATIONS_PENDING = "_simulations~"
+GROUP_RESULTS_PENDING = Simulation.GROUP_RESULTS + "~"
+
+
+def _write_results(group_simulation, simulation):
+    # NOTE: Written aside and moved once complete, so that the previous
+    # results are kept if the writing fails
+    if GROUP_RESULTS_PENDING in group_simulation:
+        del group_simulation[GROUP_RESULTS_PENDING]
+
+    group_results = group_simulation.create_group(GROUP_RESULTS_PENDING)
+    for result in simulation.results:
+        name = "{} [{:d}]".format(result.__class__.__name__, id(result))
+        group_result = group_results.create_group(name)
+        result.convert_hdf5(group_result)
+
+    if Simulation.GROUP_RESULTS in group_simulation:
+        del group_simulation[Simulation.GROUP_RESULTS]
+    group_simulation.move(GROUP_RESULTS_PENDING, Simulation.GROUP_RESULTS)
+
+
+@contextlib.contextmanager
+def _separate_option_group(f):
+    """
+    The groups of referenced objects are named after the :func:`id` of
+    the objects, which may already be used by an object written during
+    a previous save. The existing groups are moved aside while writing and
+    merged back afterwards. References are not affected since they point
+    to the objects, not to their names.
+    """
+    if GROUP_OPTION not in f:
+        yield
+        return
+
+    f.move(GROUP_OPTION, GROUP_OPTION_PREVIOUS)
+    try:
+        yield
+    finally:
+        group_previous = f[GROUP_OPTION_PREVIOUS]
+
+        if GROUP_OPTION in f:
+            for name in list(f[GROUP_OPTION].keys()):
+                newname = name
+                index = 1
+                while newname in group_previous:
+                    newname = "{} ~{:d}".format(name, index)
+                    index += 1
+
+                f.move(GROUP_OPTION + "/" + name, GROUP_OPTION_PREVIOUS + "/" + newname)
+
+            del f[GROUP_OPTION]
+
+        f.move(GROUP_OPTION_PREVIOUS, GROUP_OPTION)
+
+
+def _write_all(project, filepath, callback):
+    # NOTE: Written in a temporary file, so that the previous file is kept
+    # if the writing fails
+    tmpfilepath = filepath + "~"
+
+    try:
+        with h5py.File(tmpfilepath, "w") as f:
+            EntityHDF5Mixin.convert_hdf5(project, f)
+            group_simulations = f.create_group(Project.GROUP_SIMULATIONS)
+
+            with project.lock:
+                count = len(project.simulations)
+                for i, simulation in enumerate(project.simulations, 1):
+                    group_simulation = group_simulations.create_group(
+                        simulation.identifier
+                    )
+                    simulation.convert_hdf5(group_simulation)
+                    callback(i, count)
+    except:
+        if os.path.exists(tmpfilepath):
+            os.remove(tmpfilepath)
+        raise
+
+    os.replace(tmpfilepath, filepath)
+
+
+def _write_dirty(project, filepath, identifiers, callback):
+    with h5py.File(filepath, "a") as f:
+        f.attrs[ATTR_WRITING] = True
+        f.flush()
+
+        if GROUP_SIMULATIONS_PENDING in f:
+            del f[GROUP_SIMULATIONS_PENDING]
+
+        group_simulations = f[Project.GROUP_SIMULATIONS]
+        group_pending = f.create_group(GROUP_SIMULATIONS_PENDING)
+
+        with project.lock, _separate_option_group(f):
+            simulations = [
+                simulation
+                for simulation in project.simulations
+                if simulation.identifier in identifiers
+            ]
+
+            rewritten_bytes = 0
+            count = len(simulations)
+            for i, simulation in enumerate(simulations, 1):
+                name = simulation.identifier
+
+                # Options of a simulation never change, only its results
+                if name in group_simulations:
+                    size = f.id.get_filesize()
+                    _write_results(group_simulations[name], simulation)
+                    rewritten_bytes += f.id.get_filesize() - size
+                else:
+                    group_simulation = group_pending.create_group(name)
+                    simulation.convert_hdf5(group_simulation)
+                    f.move(group_simulation.name, group_simulations.name + "/" + name)
+
+                callback(i, count)
+
+        del f[GROUP_SIMULATIONS_PENDING]
+
+        rewritten_bytes += f.attrs.get(ATTR_REWRITTEN_BYTES, 0)
+        f.attrs[ATTR_REWRITTEN_BYTES] = rewritten_bytes
+        del f.attrs[ATTR_WRITING]
+
+
+def _can_update(filepath):
+    if not os.path.exists(filepath):
+        return False
+
+    try:
+        with h5py.File(filepath, "r") as f:
+            if not Project.can_parse_hdf5(f) or Project.GROUP_SIMULATIONS not in f:
+                return False
+            if f.attrs.get(ATTR_WRITING, False):
+                return False
+            rewritten_bytes = f.attrs.get(ATTR_REWRITTEN_BYTES, 0)
+    except OSError:
+        return False
+
+    return rewritten_bytes <= MAX_REWRITTEN_FRACTION * os.path.getsize(filepath)
+
+
+def write_project(project, filepath, identifiers=None, callback=None):
+    """
+    Writes the project in the file, as :meth:`Project.write`.
+
+    If *identifiers* is specified and the file already contains the project,
+    only the simulations with these identifiers are written: new simulations
+    are appended and the results of existing ones are replaced.
+    The whole file is rewritten instead once the results replaced since the
+    last full write exceed :data:`MAX_REWRITTEN_FRACTION` of the file, since
+    their space is not reclaimed, or if a previous write of the file failed.
+    If updating the file fails, the whole file is rewritten.
+    The *callback*, if specified, is called with the number of written
+    simulations and the number of simulations to write.
+    """
+    if callback is None:
+        callback = lambda i, count: None
+
+    if identifiers is not None and _can_update(filepath):
+        try:
+            _write_dirty(project, filepath, set(identifiers), callback)
+            return
+        except Exception:
+            logger.exception("Could not update {}, rewriting it".format(filepath))
+
+    _write_all(project, filepath, callback)
@@ -1,6 +1,9 @@
 """"""
 
 # Standard library modules.
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Third party modules.
 from qtpy import QtCore, QtWidgets
@@ -11,18 +14,37 @@ from qtpy import QtCore, QtWidgets
 
 
 class ExecutionThread(QtCore.QThread):
-    def __init__(self, function, parent=None):
+
+    progressChanged = QtCore.Signal(int, int)
+
+    def __init__(self, function, parent=None, report_progress=False):
         super().__init__(parent)
         self.function = function
+        self.report_progress = report_progress
         self.result = None
+        self.exception = None
 
     def run(self):
-        self.result = self.function()
+        try:
+            if self.report_progress:
+                self.result = self.function(self.progressChanged.emit)
+            else:
+                self.result = self.function()
+        except Exception as ex:
+            logger.exception("Execution failed")
+            self.exception = ex
 
 
 class ExecutionProgressDialog(QtWidgets.QDialog):
     def __init__(
-        self, title, running_message, success_message, function, timeout=1, parent=None
+        self,
+        title,
+        running_message,
+        success_message,
+        function,
+        timeout=1,
+        parent=None,
+        report_progress=False,
     ):
         super().__init__(
             parent, QtCore.Qt.WindowTitleHint | QtCore.Qt.CustomizeWindowHint
@@ -32,13 +54,16 @@ class ExecutionProgressDialog(QtWidgets.QDialog):
         # Variables
         self.success_message = success_message
 
-        self.thread = ExecutionThread(function)
+        # NOTE: If report_progress, the function is called with a callback
+        # taking the current step and the number of steps
+        self.thread = ExecutionThread(function, report_progress=report_progress)
 
         self.timer = QtCore.QTimer()
         self.timer.setInterval(timeout * 1000)
         self.timer.setSingleShot(True)
 
         self._function_result = None
+        self._function_exception = None
 
         # Widgets
         self.progress = QtWidgets.QProgressBar()
@@ -55,12 +80,22 @@ class ExecutionProgressDialog(QtWidgets.QDialog):
         self.setLayout(layout)
 
         # Signals
+        self.thread.progressChanged.connect(self._on_progress_changed)
         self.thread.finished.connect(self._on_finished)
         self.timer.timeout.connect(self.accept)
 
+    def _on_progress_changed(self, value, maximum):
+        self.progress.setRange(0, maximum)
+        self.progress.setValue(value)
+
     def _on_finished(self):
         self._function_result = self.thread.result
-        self.label.setText(self.success_message)
+        self._function_exception = self.thread.exception
+
+        if self._function_exception is None:
+            self.label.setText(self.success_message)
+        else:
+            self.label.setText("Error: {}".format(self._function_exception))
         self.timer.start()
 
     def exec_(self):
@@ -69,3 +104,57 @@ class ExecutionProgressDialog(QtWidgets.QDialog):
 
     def functionResult(self):
         return self._function_result
+
+    def functionException(self):
+        """
+        Returns the exception raised by the function, or ``None``.
+        """
+        return self._function_exception
+
+
+class StepProgressDialog(QtWidgets.QDialog):
+    """
+    Determinate progress dialog updated by the caller.
+    Contrary to :class:`QtWidgets.QProgressDialog`, :meth:`setValue` does not
+    process events, so the dialog can be updated from a coroutine.
+    """
+
+    def __init__(self, title, message, maximum, parent=None):
+        super().__init__(
+            parent, QtCore.Qt.WindowTitleHint | QtCore.Qt.CustomizeWindowHint
+        )
+        self.setWindowTitle(title)
+        self.setWindowModality(QtCore.Qt.WindowModal)
+
+        # Variables
+        self._canceled = False
+
+        # Widgets
+        self.progress = QtWidgets.QProgressBar()
+        self.progress.setRange(0, maximum)
+        self.progress.setValue(0)
+
+        self.label = QtWidgets.QLabel()
+        self.label.setText(message)
+
+        buttons = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Cancel)
+
+        # Layout
+        layout = QtWidgets.QVBoxLayout()
+        layout.addWidget(self.progress)
+        layout.addWidget(self.label)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+        # Signals
+        buttons.rejected.connect(self.reject)
+
+    def reject(self):
+        self._canceled = True
+        super().reject()
+
+    def setValue(self, value):
+        self.progress.setValue(value)
+
+    def wasCanceled(self):
+        return self._canceled
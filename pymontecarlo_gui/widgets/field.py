@@ -551,7 +551,7 @@ class FieldTree(QtWidgets.QWidget):
 
         self.tree.reset()
 
-    def resetField(self, field):
+    def resetField(self, field, recursive=False):
         if field not in self._field_items:
             raise ValueError("FieldBase {} is not part of the tree".format(field))
         item = self._field_items[field]
@@ -559,6 +559,10 @@ class FieldTree(QtWidgets.QWidget):
         item.setToolTip(0, field.description())
         item.setIcon(0, field.icon())
 
+        if recursive:
+            for childfield in self.childrenField(field):
+                self.resetField(childfield, recursive)
+
 
 class FieldMdiArea(QtWidgets.QWidget):
 
@@ -3,6 +3,7 @@
 # Standard library modules.
 import re
 import math
+import functools
 
 # Third party modules.
 from qtpy import QtWidgets, QtGui, QtCore
@@ -183,12 +184,19 @@ class ColoredFloatLineEdit(
 
 MULTIFLOAT_SEPARATOR = ";"
 MULTIFLOAT_PATTERN = r"(?P<start>inf|[\de\.+\-\,]*)(?:\:(?P<stop>[\de\.+\-\,]*))?(?:\:(?P<step>[\de\.+\-\,]*))?"
+MULTIFLOAT_MAX_VALUES = 10000
+MULTIFLOAT_CACHE_SIZE = 256
 
+EMPTY_VALUES = np.empty(0)
+EMPTY_VALUES.setflags(write=False)
 
-def parse_multifloat_text(text):
-    locale = QtCore.QLocale.system()
 
-    values = []
+@functools.lru_cache(maxsize=MULTIFLOAT_CACHE_SIZE)
+def _parse_multifloat_text(text, locale_name):
+    locale = QtCore.QLocale(locale_name)
+
+    arrays = []
+    count = 0
 
     for part in text.split(MULTIFLOAT_SEPARATOR):
         part = part.strip()
@@ -214,11 +222,86 @@ def parse_multifloat_text(text):
             step, _ok = locale.toDouble(step)
 
         if math.isinf(start):
-            values.append(start)
-        else:
-            values.extend(np.arange(start, stop, step))
+            arrays.append(np.array([start]))
+            count += 1
+            continue
+
+        if step == 0:
+            raise ValueError("Invalid step: %s" % part)
+
+        # NOTE: Size of the range checked before it is expanded
+        size = (stop - start) / step
+        if math.isfinite(size):
+            count += max(math.ceil(size), 0)
+        if not math.isfinite(size) or count > MULTIFLOAT_MAX_VALUES:
+            raise ValueError("More than {:d} values".format(MULTIFLOAT_MAX_VALUES))
 
-    return tuple(sorted(set(values)))
+        arrays.append(np.arange(start, stop, step))
+
+    if not arrays:
+        return EMPTY_VALUES
+
+    values = np.unique(np.concatenate(arrays))
+    values.setflags(write=False)
+    return values
+
+
+def parse_multifloat_text(text, locale=None):
+    """
+    Returns the sorted and distinct values of a text, where values and
+    ranges (``start:stop:step``) are separated by semicolons, as a read-only
+    :class:`numpy.ndarray`.
+    Raises :exc:`ValueError` if the text is invalid or defines more than
+    :data:`MULTIFLOAT_MAX_VALUES` values.
+    Results are cached by text and locale.
+    """
+    if locale is None:
+        locale = QtCore.QLocale.system()
+    return _parse_multifloat_text(text, locale.name())
+
+
+def check_multifloat_values(values, bottom, top, decimals):
+    """
+    Checks all the values at once against the range and number of decimals
+    of a :class:`QtGui.QDoubleValidator`.
+    Values are rounded to *decimals* decimals (truncated if *decimals* is
+    zero), as they are displayed. As for the validator, non-finite values,
+    negative values if *bottom* is positive, positive values if *top* is
+    negative, and values with more integer digits than the largest bound
+    are invalid; other values outside [*bottom*, *top*] are intermediate.
+    Returns the state and the first offending value (``None`` if all values
+    are acceptable), where an invalid value takes precedence over an
+    intermediate one.
+    """
+    values = np.asarray(values, dtype=float)
+
+    if decimals == 0:
+        rounded = np.trunc(values)
+    else:
+        rounded = np.round(values, decimals)
+
+    invalid = ~np.isfinite(rounded)
+    if bottom >= 0:
+        invalid |= rounded < 0
+    if top < 0:
+        invalid |= rounded > 0
+
+    # NOTE: Same limit as QDoubleValidator, from the number of digits of the
+    # integer part of the largest bound, e.g. 999.99 for a top of 360.
+    maximum = max(abs(bottom), abs(top))
+    if math.isfinite(maximum) and maximum < 2**63:
+        limit = 10 ** len(str(int(maximum))) - 10**-decimals
+        with np.errstate(invalid="ignore"):
+            invalid |= np.abs(rounded) > limit
+
+    if invalid.any():
+        return QtGui.QValidator.Invalid, values[int(np.argmax(invalid))]
+
+    offending = (rounded < bottom) | (rounded > top)
+    if offending.any():
+        return QtGui.QValidator.Intermediate, values[int(np.argmax(offending))]
+
+    return QtGui.QValidator.Acceptable, None
 
 
 class MultiFloatValidator(QtGui.QValidator, DoubleValidatorAdapterMixin):
@@ -229,12 +312,15 @@ class MultiFloatValidator(QtGui.QValidator, DoubleValidatorAdapterMixin):
         expr = QtCore.QRegularExpression(r"^[\de\-.,+:;]+$")
         self.validator_text = QtGui.QRegularExpressionValidator(expr)
         self.validator_value = QtGui.QDoubleValidator()
+        self._offending_value = None
 
         # Signals
         self.validator_text.changed.connect(self.changed)
         self.validator_value.changed.connect(self.changed)
 
     def validate(self, input, pos):
+        self._offending_value = None
+
         if not input:
             return QtGui.QValidator.Intermediate, input, pos
 
@@ -247,17 +333,17 @@ class MultiFloatValidator(QtGui.QValidator, DoubleValidatorAdapterMixin):
         except:
             return QtGui.QValidator.Intermediate, input, pos
 
-        for value in values:
-            if self.decimals() == 0:
-                text = str(int(value))
-            else:
-                locale = QtCore.QLocale.system()
-                text = locale.toString(value, "g", self.decimals())
-            state, _, _ = self.validator_value.validate(text, pos)
-            if state != QtGui.QValidator.Acceptable:
-                return state, input, pos
+        state, self._offending_value = check_multifloat_values(
+            values, self.bottom(), self.top(), self.decimals()
+        )
+        return state, input, pos
 
-        return QtGui.QValidator.Acceptable, input, pos
+    def offendingValue(self):
+        """
+        Returns the first value out of range in the last validated text,
+        or ``None``.
+        """
+        return self._offending_value
 
     def _get_double_validator(self):
         return self.validator_value
@@ -267,7 +353,7 @@ class ColoredMultiFloatLineEdit(
     QtWidgets.QWidget, LineEditAdapterMixin, DoubleValidatorAdapterMixin, ValidableBase
 ):
 
-    valuesChanged = QtCore.Signal(tuple)
+    valuesChanged = QtCore.Signal(object)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -294,10 +380,16 @@ class ColoredMultiFloatLineEdit(
             locale.toString(self.bottom(), "f", precision),
             locale.toString(self.top(), "f", precision),
         )
+
+        value = self.lineedit.validator().offendingValue()
+        if value is not None:
+            tooltip += "\n{} is out of range".format(locale.toString(float(value)))
+
         self.lineedit.setToolTip(tooltip)
         self.setToolTip(tooltip)
 
     def _on_text_changed(self, *args):
+        self._update_tooltip()
         self.valuesChanged.emit(self.values())
 
     def _on_validator_changed(self, *args):
@@ -328,7 +420,7 @@ class ColoredMultiFloatLineEdit(
         try:
             return parse_multifloat_text(self.lineedit.text())
         except:
-            return ()
+            return EMPTY_VALUES
 
     def setValues(self, values):
         locale = QtCore.QLocale.system()
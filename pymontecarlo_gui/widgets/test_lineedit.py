@@ -4,13 +4,16 @@
 
 # Third party modules.
 import pytest
-from qtpy import QtGui
+from qtpy import QtGui, QtCore
 
 # Local modules.
 from pymontecarlo_gui.widgets.lineedit import (
     ColoredLineEdit,
     ColoredFloatLineEdit,
     ColoredMultiFloatLineEdit,
+    parse_multifloat_text,
+    check_multifloat_values,
+    MULTIFLOAT_MAX_VALUES,
 )
 from pymontecarlo_gui.util.validate import (
     VALID_BACKGROUND_STYLESHEET,
@@ -234,3 +237,74 @@ def test_coloredmultifloatlineedit_toolTip(qtbot, coloredmultifloatlineedit):
     assert (
         coloredmultifloatlineedit.toolTip() == "Value(s) must be between [0.00, 50.00]"
     )
+
+
+def test_parse_multifloat_text():
+    values = parse_multifloat_text("3;1:3;inf;2")
+    assert values == pytest.approx([1.0, 2.0, 3.0, float("inf")])
+    assert not values.flags.writeable
+    assert parse_multifloat_text("3;1:3;inf;2") is values
+
+    assert len(parse_multifloat_text("")) == 0
+
+
+def test_parse_multifloat_text_max_values():
+    with pytest.raises(ValueError):
+        parse_multifloat_text("0:1e6:1")
+
+    with pytest.raises(ValueError):
+        parse_multifloat_text("0:1:0")
+
+    assert len(parse_multifloat_text("0:1e4:1")) == MULTIFLOAT_MAX_VALUES
+
+
+@pytest.mark.parametrize(
+    "values,expected_state,expected_value",
+    [
+        ([12.0, 45.0], QtGui.QValidator.Acceptable, None),
+        ([12.0, 50.004], QtGui.QValidator.Acceptable, None),
+        ([5.0, 12.0, 60.0], QtGui.QValidator.Intermediate, 5.0),
+        ([12.0, 50.4], QtGui.QValidator.Intermediate, 50.4),
+        ([-1.0, 12.0], QtGui.QValidator.Invalid, -1.0),
+        ([12.0, 99.99], QtGui.QValidator.Intermediate, 99.99),
+        ([12.0, 100.0], QtGui.QValidator.Invalid, 100.0),
+        ([5.0, 12.0, 100.0], QtGui.QValidator.Invalid, 100.0),
+        ([12.0, float("inf")], QtGui.QValidator.Invalid, float("inf")),
+    ],
+)
+def test_check_multifloat_values(values, expected_state, expected_value):
+    state, value = check_multifloat_values(values, 10.0, 50.0, 2)
+    assert state == expected_state
+    assert value == expected_value
+
+
+@pytest.mark.parametrize(
+    "values,bottom,top,expected_state,expected_value",
+    [
+        ([10.0, 5000.0], 0.0, 360.0, QtGui.QValidator.Invalid, 5000.0),
+        ([10.0, 999.0], 0.0, 360.0, QtGui.QValidator.Intermediate, 999.0),
+        ([-20.0, 5.0], -50.0, -10.0, QtGui.QValidator.Invalid, 5.0),
+        ([-20.0, -5.0], -50.0, -10.0, QtGui.QValidator.Intermediate, -5.0),
+        ([-20.0, -15.0], -50.0, -10.0, QtGui.QValidator.Acceptable, None),
+    ],
+)
+def test_check_multifloat_values_range(
+    values, bottom, top, expected_state, expected_value
+):
+    state, value = check_multifloat_values(values, bottom, top, 2)
+    assert state == expected_state
+    assert value == expected_value
+
+    # Same state as the validator for the offending value, typed with its sign
+    if expected_value is not None:
+        validator = QtGui.QDoubleValidator(bottom, top, 2)
+        validator.setNotation(QtGui.QDoubleValidator.StandardNotation)
+        validator.setLocale(QtCore.QLocale.c())
+        text = "{:+g}".format(expected_value)
+        assert validator.validate(text, 0)[0] == expected_state
+
+
+def test_coloredmultifloatlineedit_offending_value(qtbot, coloredmultifloatlineedit):
+    coloredmultifloatlineedit.setValues([12.0, 60.0])
+    assert not coloredmultifloatlineedit.hasAcceptableInput()
+    assert coloredmultifloatlineedit.toolTip().endswith("60 is out of range")
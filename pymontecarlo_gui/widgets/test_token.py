@@ -0,0 +1,145 @@
+""" """
+
+# Standard library modules.
+
+# Third party modules.
+import pytest
+from qtpy import QtCore
+
+# Local modules.
+from pymontecarlo_gui.widgets.token import TokenNotifier, NotifyingToken, TokenModel
+
+# Globals and constants variables.
+
+
+@pytest.fixture
+def notifier(qtbot):
+    return TokenNotifier()
+
+
+@pytest.fixture
+def token(notifier):
+    return NotifyingToken("runner", notifier)
+
+
+def test_notifier_counts(qtbot, notifier, token):
+    with qtbot.waitSignal(notifier.changed):
+        subtoken1 = token.create_subtoken("sim1", category="simulation")
+        subtoken2 = token.create_subtoken("sim2", category="simulation")
+        token.create_subtoken("recalculate")
+
+    assert notifier.submittedCount() == 2
+    assert notifier.doneCount() == 0
+    assert not notifier.isRunning()
+
+    with qtbot.waitSignal(notifier.changed):
+        subtoken1.start()
+        subtoken2.start()
+        subtoken2.done()
+
+    assert notifier.doneCount() == 1
+    assert notifier.isRunning()
+    assert notifier.latestStatus() == "Done"
+
+    with qtbot.waitSignal(notifier.changed):
+        subtoken1.done()
+
+    assert notifier.doneCount() == 2
+    assert not notifier.isRunning()
+
+
+def test_notifier_coalesce(qtbot, notifier, token):
+    subtoken = token.create_subtoken("sim1", category="simulation")
+
+    with qtbot.waitSignal(notifier.tokensChanged) as blocker:
+        for i in range(100):
+            subtoken.update(i / 100, "Running")
+
+    assert blocker.args[0] == [subtoken]
+
+
+def test_notifier_reset(qtbot, notifier, token):
+    subtoken = token.create_subtoken("sim1", category="simulation")
+    subtoken.done()
+
+    with qtbot.waitSignal(notifier.changed):
+        token.reset()
+
+    assert notifier.submittedCount() == 0
+    assert notifier.doneCount() == 0
+
+
+def test_model_insert_rows(qtbot, notifier, token):
+    model = TokenModel(token)
+    assert model.rowCount() == 0
+
+    with qtbot.waitSignal(model.rowsInserted) as blocker:
+        token.create_subtoken("sim1", category="simulation")
+        token.create_subtoken("sim2", category="simulation")
+
+    assert blocker.args[1:] == [0, 1]
+    assert model.rowCount() == 2
+
+
+def test_model_data_changed(qtbot, notifier, token):
+    subtoken1 = token.create_subtoken("sim1", category="simulation")
+    subtoken2 = token.create_subtoken("sim2", category="simulation")
+    model = TokenModel(token)
+
+    with qtbot.waitSignal(model.dataChanged) as blocker:
+        subtoken2.start()
+
+    assert blocker.args[0].row() == 1
+    assert model.data(model.index(1, 0), QtCore.Qt.UserRole) is subtoken2
+
+    with qtbot.waitSignal(model.dataChanged) as blocker:
+        subsubtoken = subtoken1.create_subtoken("worker")
+        subsubtoken.start()
+
+    assert blocker.args[0].row() == 0
+    assert model.rowCount() == 2
+
+
+def test_model_reset(qtbot, notifier, token):
+    token.create_subtoken("sim1", category="simulation")
+    model = TokenModel(token)
+
+    with qtbot.waitSignal(model.modelReset):
+        token.reset()
+
+    assert model.rowCount() == 0
+
+
+def test_notifier_simulation_done(qtbot, notifier, token):
+    subtoken = token.create_subtoken("sim1", category="simulation")
+    subtoken.start()
+
+    with qtbot.waitSignal(notifier.simulationDone) as blocker:
+        subtoken.done()
+
+    name, duration_s = blocker.args
+    assert name == "sim1"
+    assert duration_s >= 0.0
+
+
+def test_notifier_progress(qtbot, notifier, token):
+    subtoken1 = token.create_subtoken("sim1", category="simulation")
+    subtoken2 = token.create_subtoken("sim2", category="simulation")
+    subsubtoken = subtoken2.create_subtoken("worker")
+
+    subtoken1.update(0.5, "Running")
+    assert notifier.progress() == pytest.approx(0.5)
+
+    subtoken2.start()
+    subsubtoken.update(0.6, "Running")
+    assert subtoken2.progress == pytest.approx((0.01 + 0.6) / 2)
+    assert notifier.progress() == pytest.approx((0.5 + (0.01 + 0.6) / 2) / 2)
+
+    subtoken1.done()
+    subtoken2.done()
+    subsubtoken.done()
+    assert notifier.progress() == pytest.approx(1.0)
+
+    token.reset()
+    assert notifier.progress() == 0.0
+    assert token.progress == 0.0
@@ -1,24 +1,356 @@
 """"""
 
 # Standard library modules.
+import time
+import threading
 
 # Third party modules.
 from qtpy import QtCore, QtGui, QtWidgets
 
 # Local modules.
-from pymontecarlo.util.token import TokenState
+from pymontecarlo.util.token import Token, TokenState
 from pymontecarlo_gui.widgets.color import check_color
 
 # Globals and constants variables.
 
+_PROGRESS_LOCK = threading.Lock()
+
+
+class TokenNotifier(QtCore.QObject):
+    """
+    Forwards the changes of a tree of :class:`NotifyingToken` as Qt signals.
+    Changes are coalesced so that :attr:`tokensChanged` and :attr:`changed`
+    are emitted at most once per frame.
+    :attr:`simulationDone` is emitted with the name of each simulation token
+    and its running duration (in seconds), when it is done.
+    The counts and the overall progress are updated incrementally, so that
+    they do not require to walk the tree of tokens.
+    The tokens may be updated from any thread.
+    """
+
+    FRAME_INTERVAL_ms = 16
+
+    changed = QtCore.Signal()
+    tokensChanged = QtCore.Signal(list)
+    simulationDone = QtCore.Signal(str, float)
+
+    _notified = QtCore.Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        # Variables
+        self._lock = threading.Lock()
+        self._changed_tokens = {}
+        self._submitted_count = 0
+        self._done_count = 0
+        self._running_count = 0
+        self._latest_status = ""
+        self._progress = 0.0
+        self._start_times = {}  # Start of running simulation tokens
+
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(self.FRAME_INTERVAL_ms)
+        self.timer.setSingleShot(True)
+
+        # Signals
+        self._notified.connect(self._on_notified)
+        self.timer.timeout.connect(self._on_timer_timeout)
+
+    def _on_notified(self):
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def _on_timer_timeout(self):
+        with self._lock:
+            tokens = list(self._changed_tokens)
+            self._changed_tokens.clear()
+
+        self.tokensChanged.emit(tokens)
+        self.changed.emit()
+
+    def _token_created(self, token):
+        with self._lock:
+            if token._category == "simulation":
+                self._submitted_count += 1
+            self._changed_tokens[token] = None
+
+        self._notified.emit()
+
+    def _token_updated(self, token, previous_state):
+        state = token._state
+        duration_s = None
+
+        with self._lock:
+            if token._category == "simulation":
+                self._done_count += int(state == TokenState.DONE) - int(
+                    previous_state == TokenState.DONE
+                )
+
+                if state == TokenState.RUNNING:
+                    self._start_times.setdefault(token, time.monotonic())
+                elif token in self._start_times:
+                    start_time = self._start_times.pop(token)
+                    if state == TokenState.DONE:
+                        duration_s = time.monotonic() - start_time
+            self._running_count += int(state == TokenState.RUNNING) - int(
+                previous_state == TokenState.RUNNING
+            )
+            self._latest_status = token._status
+            self._changed_tokens[token] = None
+
+        self._notified.emit()
+
+        if duration_s is not None:
+            self.simulationDone.emit(token._name, duration_s)
+
+    def _root_progress_changed(self, progress):
+        with self._lock:
+            self._progress = progress
+
+    def _token_reset(self, token):
+        with self._lock:
+            self._submitted_count = 0
+            self._done_count = 0
+            self._running_count = 0
+            self._latest_status = token._status
+            self._start_times.clear()
+            self._changed_tokens.clear()
+            self._changed_tokens[token] = None
+
+        self._notified.emit()
+
+    def submittedCount(self):
+        """
+        Returns the number of simulations submitted.
+        """
+        return self._submitted_count
+
+    def doneCount(self):
+        """
+        Returns the number of simulations done.
+        """
+        return self._done_count
+
+    def progress(self):
+        """
+        Returns the overall progress of the root token, between 0.0 and 1.0.
+        """
+        return self._progress
+
+    def isRunning(self):
+        return self._running_count > 0
+
+    def latestStatus(self):
+        return self._latest_status
+
+
+class NotifyingToken(Token):
+    """
+    Token reporting its changes and the ones of its sub-tokens to a
+    :class:`TokenNotifier`.
+    The progress of the updated sub-tokens is summed as they are updated,
+    so :attr:`progress` does not walk the sub-tokens.
+    """
+
+    def __init__(self, name, notifier=None):
+        super().__init__(name)
+        self._notifier = notifier
+        self._parent = None
+        self._progress_total = 0.0  # Progress of the updated sub-tokens
+        self._progress_count = 0
+        self._reported_progress = None  # Progress counted by the parent
+
+    def _propagate_progress(self):
+        token = self
+
+        with _PROGRESS_LOCK:
+            while True:
+                progress = token.progress
+                parent = token._parent
+
+                if parent is None:
+                    if token._notifier is not None:
+                        token._notifier._root_progress_changed(progress)
+                    break
+
+                # NOTE: Like Token.progress, only updated sub-tokens count
+                if token._latest_update is None:
+                    break
+
+                previous = token._reported_progress
+                if previous is None:
+                    parent._progress_count += 1
+                    previous = 0.0
+                parent._progress_total += progress - previous
+                token._reported_progress = progress
+
+                token = parent
+
+    def _create_subtoken(self, name, category):
+        subtoken = self.__class__(name, self._notifier)
+        subtoken._category = category
+        subtoken._parent = self
+        return subtoken
+
+    def create_subtoken(self, name, category=None):
+        subtoken = super().create_subtoken(name, category)
+        if self._notifier is not None:
+            self._notifier._token_created(subtoken)
+        return subtoken
+
+    def update(self, progress, status, state=None):
+        previous_state = self._state
+        super().update(progress, status, state)
+        self._propagate_progress()
+        if self._notifier is not None:
+            self._notifier._token_updated(self, previous_state)
+
+    def reset(self):
+        super().reset()
+
+        with _PROGRESS_LOCK:
+            self._progress_total = 0.0
+            self._progress_count = 0
+
+            parent = self._parent
+            if parent is not None and self._reported_progress is not None:
+                parent._progress_count -= 1
+                parent._progress_total -= self._reported_progress
+            self._reported_progress = None
+
+        (parent or self)._propagate_progress()
+
+        if self._notifier is not None:
+            self._notifier._token_reset(self)
+
+    @property
+    def progress(self):
+        total = self._progress_total
+        count = self._progress_count
+
+        if self._latest_update is not None:
+            total += self._progress
+            count += 1
+
+        if not count:
+            return 0.0
+        return max(0.0, min(1.0, total / count))
+
+    @property
+    def notifier(self):
+        return self._notifier
+
+    @property
+    def parent(self):
+        return self._parent
+
 
 class TokenModel(QtCore.QAbstractTableModel):
+    """
+    Model of the sub-tokens of a token.
+    The model keeps a snapshot of the sub-tokens and of their progress, state
+    and status. With a :class:`NotifyingToken`, only the changed rows are
+    updated; otherwise :meth:`refresh` must be called.
+    """
+
     def __init__(self, token):
         super().__init__()
         self.token = token
 
+        # Variables
+        self._subtokens = []
+        self._rows = {}
+        self._snapshots = []
+
+        # Signals
+        notifier = getattr(token, "notifier", None)
+        if notifier is not None:
+            notifier.tokensChanged.connect(self._on_tokens_changed)
+
+        # Defaults
+        self._reset_subtokens()
+
+    def _create_snapshot(self, subtoken):
+        return (subtoken.progress, subtoken.state, subtoken.status)
+
+    def _reset_subtokens(self):
+        self.beginResetModel()
+
+        self._subtokens = list(self.token.get_subtokens())
+        self._rows = {subtoken: row for row, subtoken in enumerate(self._subtokens)}
+        self._snapshots = [
+            self._create_snapshot(subtoken) for subtoken in self._subtokens
+        ]
+
+        self.endResetModel()
+
+    def _append_subtokens(self, subtokens):
+        if not subtokens:
+            return
+
+        first = len(self._subtokens)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(subtokens) - 1)
+
+        for subtoken in subtokens:
+            self._rows[subtoken] = len(self._subtokens)
+            self._subtokens.append(subtoken)
+            self._snapshots.append(self._create_snapshot(subtoken))
+
+        self.endInsertRows()
+
+    def _update_row(self, row):
+        snapshot = self._create_snapshot(self._subtokens[row])
+        if snapshot == self._snapshots[row]:
+            return
+
+        self._snapshots[row] = snapshot
+
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index)
+
+    def _on_tokens_changed(self, tokens):
+        # Changes of the token itself (e.g. reset) are rare, so refresh all
+        if self.token in tokens:
+            self.refresh()
+            return
+
+        new_subtokens = []
+        rows = set()
+
+        for token in tokens:
+            # Find the direct sub-token affected by the change
+            while token is not None and token.parent is not self.token:
+                token = token.parent
+
+            if token is None:
+                continue
+
+            row = self._rows.get(token)
+            if row is None:
+                if token not in new_subtokens:
+                    new_subtokens.append(token)
+            else:
+                rows.add(row)
+
+        self._append_subtokens(new_subtokens)
+
+        for row in sorted(rows):
+            self._update_row(row)
+
+    def refresh(self):
+        subtokens = self.token.get_subtokens()
+        if subtokens[: len(self._subtokens)] != tuple(self._subtokens):
+            self._reset_subtokens()
+            return
+
+        self._append_subtokens(subtokens[len(self._subtokens) :])
+
+        for row in range(len(self._subtokens)):
+            self._update_row(row)
+
     def rowCount(self, parent=None):
-        return len(self.token.get_subtokens())
+        return len(self._subtokens)
 
     def columnCount(self, parent=None):
         return 1
@@ -28,7 +360,10 @@ class TokenModel(QtCore.QAbstractTableModel):
             return None
 
         row = index.row()
-        subtoken = self.token.get_subtokens()[row]
+        if row < 0 or row >= len(self._subtokens):
+            return None
+
+        subtoken = self._subtokens[row]
 
         if role == QtCore.Qt.UserRole:
             return subtoken
@@ -90,6 +425,8 @@ class TokenTableWidget(QtWidgets.QWidget):
         self.timer.setInterval(1000)
         self.timer.setSingleShot(False)
 
+        has_notifier = getattr(token, "notifier", None) is not None
+
         # Widgets
         self.tableview = QtWidgets.QTableView()
         self.tableview.setModel(TokenModel(token))
@@ -110,11 +447,12 @@ class TokenTableWidget(QtWidgets.QWidget):
         self.timer.timeout.connect(self._on_timer_timeout)
 
         # Defaults
-        self.timer.start()
+        if not has_notifier:
+            self.timer.start()
 
     def _on_timer_timeout(self):
         model = self.tableview.model()
-        model.modelReset.emit()
+        model.refresh()
 
     def _on_tablewview_double_clicked(self, index):
         model = self.tableview.model()
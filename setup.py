@@ -27,6 +27,7 @@ CMDCLASS = versioneer.get_cmdclass()
 
 ENTRY_POINTS = {
     "gui_scripts": ["pymontecarlo = pymontecarlo_gui.__main__:main"],
+    "console_scripts": ["pymontecarlo-batch = pymontecarlo_gui.batch:main"],
 }
 
 setup(